@@ -0,0 +1,228 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Sunucu tarafı geçici hataları; bu durumlarda geri çekilerek yeniden denenir
+GECICI_DURUMLAR = (408, 425, 429, 500, 502, 503, 504)
+
+
+class _GeciciHata(Exception):
+    def __init__(self, mesaj, bekle=None):
+        super().__init__(mesaj)
+        self.bekle = bekle
+
+
+class _HostSiniri:
+    """Bir host'a aynı anda açık istek sayısı ve saniyedeki istek başlatma sınırı"""
+
+    def __init__(self, eszamanli, hiz=None):
+        self.semafor = asyncio.Semaphore(eszamanli)
+        self.aralik = 1.0 / hiz if hiz else 0.0
+        self._sonraki = 0.0
+
+    async def sira_bekle(self):
+        if not self.aralik:
+            return
+        # Tek event loop thread'i olduğundan okuma-yazma arasında yarış yok
+        simdi = time.monotonic()
+        bekle = self._sonraki - simdi
+        self._sonraki = max(simdi, self._sonraki) + self.aralik
+        if bekle > 0:
+            await asyncio.sleep(bekle)
+
+
+class AsenkronIndirici:
+    """
+    Tüm arama terimleri ve sınıflar için ortak, asyncio + aiohttp tabanlı
+    indirici. Kendi event loop'unu arka planda bir thread'de çalıştırır;
+    diğer thread'ler indir() ile iş gönderir.
+
+    - Keep-alive bağlantı havuzu tüm indirmelerde paylaşılır.
+    - eszamanli: toplam eşzamanlı indirme sınırı, host_basina / host_hizi:
+      host başına eşzamanlı istek ve saniyedeki istek sınırı.
+    - Geçici hatalar (bağlantı, zaman aşımı, 429/5xx) üstel geri çekilme ile
+      yeniden denenir; 429/503'teki Retry-After dikkate alınır.
+    - Content-Type resim değilse veya Content-Length sınırların dışındaysa
+      gövde okunmadan reddedilir; gövde parça parça diske yazılır (hedef
+      yol verilmezse bellekte toplanır). Dosya işlemleri event loop'u
+      bloklamasın diye ayrı bir thread havuzunda yapılır.
+    - Genel eşzamanlılık yuvası her denemede alınır; geri çekilme ve
+      Retry-After beklemesinde tutulmaz.
+    - İndirilen dosya teslim(yol veya baytlar) ile, reddedilen URL red(url)
+      ile ayrı bir thread'de bildirilir;
+      teslim bloklarsa (hat doluysa) eşzamanlılık yuvası serbest kalmaz,
+      böylece geri basınç indirmeye de yansır.
+    """
+
+    def __init__(self, eszamanli=64, host_basina=4, host_hizi=None, deneme=3, geri_cekilme=0.5,
+                 min_bayt=1024, max_bayt=20 * 2**20, zaman_asimi=15, kabul_edilen_turler=('image/',),
+                 parca_boyutu=64 * 1024, teslim_thread_sayisi=8, disk_thread_sayisi=4):
+        self.eszamanli = eszamanli
+        self.host_basina = host_basina
+        self.host_hizi = host_hizi
+        self.deneme = deneme
+        self.geri_cekilme = geri_cekilme
+        self.min_bayt = min_bayt
+        self.max_bayt = max_bayt
+        self.zaman_asimi = zaman_asimi
+        self.kabul_edilen_turler = tuple(kabul_edilen_turler)
+        self.parca_boyutu = parca_boyutu
+
+        self.sayaclar = {'indirildi': 0, 'reddedildi': 0, 'hata': 0, 'yeniden_deneme': 0, 'bayt': 0}
+        self._teslim_havuzu = ThreadPoolExecutor(teslim_thread_sayisi, thread_name_prefix='teslim')
+        # Teslim havuzu geri basınçla dolabilir; disk yazmaları onu beklememeli
+        self._disk_havuzu = ThreadPoolExecutor(disk_thread_sayisi, thread_name_prefix='disk')
+        self._dongu = None
+        self._thread = None
+        self._hazir = threading.Event()
+        self._hostlar = {}
+
+    def baslat(self):
+        self._dongu = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._calis, name="asenkron-indirici", daemon=True)
+        self._thread.start()
+        self._hazir.wait()
+        return self
+
+    def _calis(self):
+        asyncio.set_event_loop(self._dongu)
+        self._dongu.run_until_complete(self._oturum_ac())
+        self._hazir.set()
+        self._dongu.run_forever()
+
+    async def _oturum_ac(self):
+        baglanti = aiohttp.TCPConnector(limit=self.eszamanli, ttl_dns_cache=300, keepalive_timeout=30)
+        self._oturum = aiohttp.ClientSession(
+            connector=baglanti,
+            timeout=aiohttp.ClientTimeout(total=self.zaman_asimi, sock_connect=min(5, self.zaman_asimi)),
+            headers={'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+                                   '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'}
+        )
+        self._genel = asyncio.Semaphore(self.eszamanli)
+
+    def kapat(self):
+        if self._dongu is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._oturum.close(), self._dongu).result()
+        self._dongu.call_soon_threadsafe(self._dongu.stop)
+        self._thread.join()
+        self._dongu.close()
+        self._dongu = None
+        self._teslim_havuzu.shutdown(wait=True)
+        self._disk_havuzu.shutdown(wait=True)
+
+    def indir(self, url, hedef_yol=None, teslim=None, red=None):
+        """
+        url'yi hedef_yol'a (None ise belleğe) indir (thread güvenli).
+        concurrent.futures.Future döndürür; sonucu başarıda hedef_yol veya
+        baytlar, reddedilirse veya hata olursa None.
+        """
+        return asyncio.run_coroutine_threadsafe(self._indir(url, hedef_yol, teslim, red), self._dongu)
+
+    def _host_siniri(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._hostlar:
+            self._hostlar[host] = _HostSiniri(self.host_basina, self.host_hizi)
+        return self._hostlar[host]
+
+    async def _indir(self, url, hedef_yol, teslim, red):
+        sinir = self._host_siniri(url)
+        for deneme in range(self.deneme):
+            # Genel yuva, host semaforu gibi yalnızca istek sırasında tutulur;
+            # geri çekilen yavaş bir host diğer host'ların yuvalarını işgal etmez
+            await self._genel.acquire()
+            try:
+                async with sinir.semafor:
+                    await sinir.sira_bekle()
+                    sonuc = await self._tek_istek(url, hedef_yol)
+                break
+            except (_GeciciHata, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._genel.release()
+                if deneme == self.deneme - 1:
+                    self.sayaclar['hata'] += 1
+                    return None
+                self.sayaclar['yeniden_deneme'] += 1
+                bekle = getattr(e, 'bekle', None)
+                if bekle is None:
+                    # Aynı anda düşen isteklerin birlikte geri gelmemesi için rastgelelik
+                    bekle = self.geri_cekilme * 2 ** deneme * (0.5 + random.random())
+                await asyncio.sleep(bekle)
+            except BaseException:
+                self._genel.release()
+                raise
+        # Başarılı denemenin yuvası teslim bitene kadar tutulur (geri basınç)
+        try:
+            if sonuc is None:
+                self.sayaclar['reddedildi'] += 1
+                if red is not None:
+                    await asyncio.get_running_loop().run_in_executor(self._teslim_havuzu, red, url)
+                return None
+            self.sayaclar['indirildi'] += 1
+            if teslim is not None:
+                await asyncio.get_running_loop().run_in_executor(self._teslim_havuzu, teslim, sonuc)
+            return sonuc
+        finally:
+            self._genel.release()
+
+    def _diskte(self, fonksiyon, *args):
+        """Bloklayan dosya işlemini disk havuzunda çalıştır (await edilebilir)"""
+        return asyncio.get_running_loop().run_in_executor(self._disk_havuzu, fonksiyon, *args)
+
+    def _kabul_edilir_mi(self, yanit):
+        tur = yanit.headers.get('Content-Type', '').lower()
+        if not tur.startswith(self.kabul_edilen_turler):
+            return False
+        uzunluk = yanit.content_length
+        return uzunluk is None or self.min_bayt <= uzunluk <= self.max_bayt
+
+    async def _tek_istek(self, url, hedef_yol):
+        """Tek deneme; kabul edilirse hedef_yol'u (veya baytları), reddedilirse None döndürür"""
+        async with self._oturum.get(url) as yanit:
+            if yanit.status in GECICI_DURUMLAR:
+                bekle = yanit.headers.get('Retry-After')
+                raise _GeciciHata(f"HTTP {yanit.status}",
+                                  float(bekle) if bekle and bekle.isdigit() else None)
+            if yanit.status != 200 or not self._kabul_edilir_mi(yanit):
+                return None
+            if hedef_yol is None:
+                return await self._bellege_oku(yanit)
+
+            gecici_yol = hedef_yol + '.part'
+            toplam = 0
+            f = await self._diskte(open, gecici_yol, 'wb')
+            try:
+                async for parca in yanit.content.iter_chunked(self.parca_boyutu):
+                    toplam += len(parca)
+                    # Content-Length yoksa veya yanlışsa sınır akış sırasında uygulanır
+                    if toplam > self.max_bayt:
+                        break
+                    await self._diskte(f.write, parca)
+                await self._diskte(f.close)
+            except BaseException:
+                # Hata veya iptal (nadir): beklemeden kapat ve sil
+                f.close()
+                os.remove(gecici_yol)
+                raise
+            if not self.min_bayt <= toplam <= self.max_bayt:
+                await self._diskte(os.remove, gecici_yol)
+                return None
+            await self._diskte(os.replace, gecici_yol, hedef_yol)
+            self.sayaclar['bayt'] += toplam
+            return hedef_yol
+
+    async def _bellege_oku(self, yanit):
+        veri = bytearray()
+        async for parca in yanit.content.iter_chunked(self.parca_boyutu):
+            veri += parca
+            if len(veri) > self.max_bayt:
+                return None
+        if len(veri) < self.min_bayt:
+            return None
+        self.sayaclar['bayt'] += len(veri)
+        return bytes(veri)
@@ -0,0 +1,84 @@
+"""
+veri_isleme.py alt komutlarının soğuk başlangıç maliyetini ölçer. Her alt
+komut sentetik küçük bir çalışma klasöründe ayrı bir süreçte `-X importtime`
+ile çalıştırılır; toplam süre, içe aktarmalara giden süre ve yüklenen ağır
+bağımlılıklar (tensorflow, sklearn, icrawler) raporlanır. Ağ gerekmez:
+toplama hedefi 0'dır, eğitim rastgele ağırlıklarla 0 epoch çalışır.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.baslangic
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.sentetik import sentetik_resimler
+from veri_isleme import SINIFLAR
+
+AGIR_MODULLER = ('tensorflow', 'sklearn', 'icrawler')
+DEPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KOMUTLAR = [
+    ('--help', ['--help']),
+    ('topla', ['topla', '--hedef-sayi', '0']),
+    ('ayir', ['ayir']),
+    ('onbellek', ['onbellek']),
+    ('egit', ['egit', '--agirliksiz', '--epochs', '0', '--ince-ayar-epochs', '0']),
+    ('degerlendir', ['degerlendir']),
+]
+
+
+def calisma_klasoru_hazirla(kok, resim_sayisi):
+    for i, sinif in enumerate(SINIFLAR):
+        sentetik_resimler(os.path.join(kok, 'dataset', sinif), resim_sayisi, boyut=(320, 240), tohum=i)
+        sentetik_resimler(os.path.join(kok, 'veri_seti', sinif), resim_sayisi, boyut=(320, 240), tohum=10 + i)
+
+
+def importtime_ozeti(stderr):
+    """(üst düzey içe aktarmaların toplam süresi s, yüklenen ağır modüller)"""
+    toplam = 0
+    agir = set()
+    for satir in stderr.splitlines():
+        if not satir.startswith('import time:') or 'cumulative' in satir:
+            continue
+        _, kumulatif, paket = satir[len('import time:'):].split('|')
+        if not paket.startswith('  '):
+            toplam += int(kumulatif)
+        if paket.strip() in AGIR_MODULLER:
+            agir.add(paket.strip())
+    return toplam / 1e6, sorted(agir)
+
+
+def olc(komut, cwd):
+    ortam = dict(os.environ, PYTHONPATH=DEPO, TF_CPP_MIN_LOG_LEVEL='3')
+    baslangic = time.perf_counter()
+    sonuc = subprocess.run(komut, cwd=cwd, env=ortam, capture_output=True, text=True)
+    sure = time.perf_counter() - baslangic
+    ice_aktarma, agir = importtime_ozeti(sonuc.stderr)
+    return sure, ice_aktarma, agir, sonuc.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resim', type=int, default=8, help="sınıf başına sentetik resim sayısı")
+    args = parser.parse_args()
+
+    kok = tempfile.mkdtemp(prefix='baslangic_bench_')
+    calisma_klasoru_hazirla(kok, args.resim)
+    betik = os.path.join(DEPO, 'veri_isleme.py')
+
+    print(f"{'komut':<28}{'toplam s':>10}{'içe aktarma s':>15}  ağır modüller")
+    # Eski davranış: her giriş noktası bunların hepsini modül düzeyinde yüklüyordu
+    eski = [sys.executable, '-X', 'importtime', '-c', 'import tensorflow, sklearn.model_selection, icrawler']
+    sure, ice_aktarma, agir, _ = olc(eski, kok)
+    print(f"{'(tümü modül düzeyinde)':<28}{sure:>10.2f}{ice_aktarma:>15.2f}  {', '.join(agir)}")
+    for ad, arguman in KOMUTLAR:
+        sure, ice_aktarma, agir, kod = olc([sys.executable, '-X', 'importtime', betik] + arguman, kok)
+        durum = '' if kod == 0 else f"  (çıkış kodu {kod})"
+        print(f"{ad:<28}{sure:>10.2f}{ice_aktarma:>15.2f}  {', '.join(agir) or '-'}{durum}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+ImageCollector'ın disk (temp_images) ve bellek (--bellekte) modlarını yerel
+HTTP sunucusu üzerinde karşılaştırır. Her mod ayrı bir süreçte, boş bir
+çalışma klasöründe bir sınıf için hedef sayıda resim toplar. Sınıflandırıcı
+her resmi kabul eden sabit bir fonksiyondur (ağ ve model gerekmez); ölçülen
+indirme → çözme → kaydetme yoludur.
+
+Sunucu resim_sayisi farklı resmi döngüyle sunar, yani URL'lerin bir kısmı
+aynı baytları döndürür (farklı sitelerdeki aynı dosya gibi).
+
+Raporlanan: süre, CPU süresi (çözme süreçleri dahil), kabul edilen resim
+başına CPU, yazılan/okunan bayt (/proc/self/io wchar/rchar) ve dataset boyutu.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.bellek --hedef 150
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+DEPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def io_sayaclari():
+    with open('/proc/self/io') as f:
+        return {ad: int(deger) for ad, deger in (satir.split(':') for satir in f)}
+
+
+def klasor_boyutu(klasor):
+    return sum(os.path.getsize(os.path.join(kok, d)) for kok, _, dosyalar in os.walk(klasor) for d in dosyalar)
+
+
+def topla(bellekte, hedef, resim_sayisi, gecikme_ms):
+    """Çalışma klasöründe tek sınıf topla, ölçümleri döndür (alt süreçte çalışır)"""
+    import numpy as np
+
+    import scraper
+    from benchmarks.yerel_sunucu import YerelResimSunucusu, yerel_motor
+    from label_filter import EtiketFiltresi
+
+    logging.disable(logging.INFO)
+    sunucu = YerelResimSunucusu(resim_sayisi=resim_sayisi, gecikme_ms=gecikme_ms).baslat()
+    for motor in scraper.MOTORLAR:
+        scraper.MOTORLAR[motor] = yerel_motor(sunucu)
+
+    collector = scraper.ImageCollector(save_folder='dataset', bellekte=bellekte)
+    # Her resmi 'kedi' olarak kabul eden sabit sınıflandırıcı
+    collector.filtre = lambda x: np.tile(np.eye(1000, dtype=np.float32)[0], (len(x), 1))
+    collector.etiket_filtresi = EtiketFiltresi(list(collector.siniflar),
+                                               etiketler=['tabby cat'] + [f"etiket_{i}" for i in range(999)])
+
+    io_once = io_sayaclari()
+    cpu_once = time.process_time()
+    baslangic = time.perf_counter()
+    try:
+        collector.sinif_resimleri_topla('kedi', hedef)
+    finally:
+        collector.kapat()
+        sunucu.kapat()
+    sure = time.perf_counter() - baslangic
+    cpu = time.process_time() - cpu_once + resource.getrusage(resource.RUSAGE_CHILDREN).ru_utime \
+        + resource.getrusage(resource.RUSAGE_CHILDREN).ru_stime
+    io_sonra = io_sayaclari()
+    return {
+        'sure': sure,
+        'cpu': cpu,
+        'kabul': collector.collected_counts['kedi'],
+        'yazilan': io_sonra['wchar'] - io_once['wchar'],
+        'okunan': io_sonra['rchar'] - io_once['rchar'],
+        'dataset': klasor_boyutu('dataset/kedi'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hedef', type=int, default=150, help="toplanacak resim sayısı")
+    parser.add_argument('--resim-sayisi', type=int, default=400, help="sunucudaki farklı resim sayısı")
+    parser.add_argument('--gecikme-ms', type=float, default=20)
+    parser.add_argument('--mod', choices=['disk', 'bellek'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mod:
+        sonuc = topla(args.mod == 'bellek', args.hedef, args.resim_sayisi, args.gecikme_ms)
+        print(json.dumps(sonuc))
+        return
+
+    print(f"hedef {args.hedef} resim, sunucuda {args.resim_sayisi} farklı resim")
+    print(f"{'mod':<8}{'süre s':>8}{'CPU s':>8}{'CPU ms/resim':>14}{'yazılan MB':>12}{'okunan MB':>11}"
+          f"{'dataset MB':>12}")
+    ortam = dict(os.environ, PYTHONPATH=DEPO, TF_CPP_MIN_LOG_LEVEL='3')
+    for mod in ('disk', 'bellek'):
+        kok = tempfile.mkdtemp(prefix=f'bellek_bench_{mod}_')
+        komut = [sys.executable, '-m', 'benchmarks.bellek', '--mod', mod, '--hedef', str(args.hedef),
+                 '--resim-sayisi', str(args.resim_sayisi), '--gecikme-ms', str(args.gecikme_ms)]
+        cikti = subprocess.run(komut, cwd=kok, env=ortam, capture_output=True, text=True, check=True).stdout
+        s = json.loads(cikti.strip().splitlines()[-1])
+        print(f"{mod:<8}{s['sure']:>8.1f}{s['cpu']:>8.1f}{1000 * s['cpu'] / max(s['kabul'], 1):>14.1f}"
+              f"{s['yazilan'] / 2**20:>12.1f}{s['okunan'] / 2**20:>11.1f}{s['dataset'] / 2**20:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
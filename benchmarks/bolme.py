@@ -0,0 +1,96 @@
+"""
+Bölme manifestosunun (split_manifest.BolmeManifestosu) maliyetini ve yakın
+kopya sızıntısını ölçer. Sentetik bir veri_seti/ oluşturulur; resimlerin
+bir kısmının yeniden boyutlandırılıp sıkıştırılmış kopyaları başka adlarla
+eklenir (web'den aynı resmin farklı sitelerden inmesi gibi).
+
+Raporlanan:
+  - ilk atama, değişiklik yokken ve %5 yeni resim eklendikten sonra
+    guncelle() süresi ve hash'lenen dosya sayısı,
+  - eski veriyi_ayir (rastgele %15 test) ile manifestte test bölümüyle
+    eğitim/doğrulama arasında kalan yakın kopya çiftleri.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.bolme --sinif-basina 500
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+import hash_index
+from benchmarks.sentetik import sentetik_resimler
+from split_manifest import BolmeManifestosu
+
+SINIFLAR = ['kedi', 'kopek', 'araba', 'ev']
+
+
+def olc(kok, hashlenen):
+    hashlenen[0] = 0
+    baslangic = time.perf_counter()
+    manifesto = BolmeManifestosu(kok)
+    yeni = manifesto.guncelle(SINIFLAR)
+    return time.perf_counter() - baslangic, yeni, hashlenen[0], manifesto
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sinif-basina', type=int, default=500)
+    parser.add_argument('--kopya-orani', type=float, default=0.1, help="yakın kopyası eklenen resim oranı")
+    args = parser.parse_args()
+
+    # Hash'lenen dosyaları say
+    hashlenen = [0]
+    resim_hashle = hash_index.resim_hashle
+
+    def sayarak_hashle(yol):
+        hashlenen[0] += 1
+        return resim_hashle(yol)
+
+    hash_index.resim_hashle = sayarak_hashle
+
+    kok = tempfile.mkdtemp(prefix='bolme_bench_')
+    try:
+        rnd = np.random.default_rng(0)
+        kopyalar = []
+        for i, sinif in enumerate(SINIFLAR):
+            yollar = sentetik_resimler(os.path.join(kok, sinif), args.sinif_basina, boyut=(320, 240), tohum=i)
+            for yol in rnd.choice(yollar, int(args.kopya_orani * len(yollar)), replace=False):
+                kopya = yol.replace('resim_', 'kopya_')
+                with Image.open(yol) as img:
+                    img.resize((288, 216)).save(kopya, 'JPEG', quality=70)
+                kopyalar.append((os.path.relpath(yol, kok), os.path.relpath(kopya, kok)))
+        toplam = sum(len(os.listdir(os.path.join(kok, sinif))) for sinif in SINIFLAR)
+        print(f"{len(SINIFLAR)} sınıf, {toplam} resim ({len(kopyalar)} yakın kopya çifti)")
+
+        print(f"{'durum':<18}{'süre s':>8}{'atanan':>8}{'hash':>7}")
+        for durum in ('ilk', 'degisiklik_yok', 'yeni_%5'):
+            if durum == 'yeni_%5':
+                for i, sinif in enumerate(SINIFLAR):
+                    sentetik_resimler(os.path.join(kok, sinif), args.sinif_basina // 20, boyut=(320, 240),
+                                      tohum=100 + i, onek='yeni')
+            sure, yeni, hash_sayisi, manifesto = olc(kok, hashlenen)
+            print(f"{durum:<18}{sure:>8.2f}{yeni:>8}{hash_sayisi:>7}")
+        print(f"bölümler: {manifesto.sayilar()}")
+
+        # Eski veriyi_ayir: her sınıftan rastgele %15 test
+        eski_test = set()
+        for sinif in SINIFLAR:
+            dosyalar = os.listdir(os.path.join(kok, sinif))
+            dosyalar = [d for d in dosyalar if not d.startswith('.')]
+            eski_test.update(f"{sinif}/{d}" for d in np.random.choice(dosyalar, int(len(dosyalar) * 0.15),
+                                                                       replace=False))
+        eski = sum((a in eski_test) != (b in eski_test) for a, b in kopyalar)
+        bolum = {yol: kayit['bolum'] for yol, kayit in manifesto.kayitlar.items()}
+        yeni = sum((bolum[a] == 'test') != (bolum[b] == 'test') for a, b in kopyalar)
+        print(f"test ile diğer bölümler arasında kalan yakın kopya çifti: eski {eski}, manifest {yeni}")
+    finally:
+        shutil.rmtree(kok)
+
+
+if __name__ == '__main__':
+    main()
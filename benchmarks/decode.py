@@ -0,0 +1,97 @@
+"""
+Resim çözme + ön işleme verimini süreç sayısına göre ölçer.
+
+Tek thread'li eski yol (tam çözünürlüklü çözme + convert + phash + resize)
+ile aynı işin draft modlu halini (hash_index.taslak_coz) ve
+ParalelCozucu'nun (draft modu + süreç havuzu + paylaşımlı bellek) farklı
+süreç sayılarındaki resim/sn değerlerini karşılaştırır.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.decode --sayi 400 --boyut 1600x1200
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+import imagehash
+
+from decode import ParalelCozucu, GIRDI_BOYUTU
+from hash_index import phash_hesapla, taslak_coz
+from benchmarks.sentetik import sentetik_resimler
+
+
+def tek_thread_coz(yol):
+    img = Image.open(yol)
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    phash = imagehash.phash(img)
+    dizi = np.asarray(img.resize(GIRDI_BOYUTU), dtype=np.float32)
+    img.close()
+    return phash, dizi
+
+
+def tek_thread_taslak_coz(yol):
+    with Image.open(yol) as img:
+        img = taslak_coz(img)
+        phash = phash_hesapla(img)
+        dizi = np.asarray(img.resize(GIRDI_BOYUTU), dtype=np.float32)
+    return phash, dizi
+
+
+def tek_thread_olc(fonksiyon, yollar):
+    baslangic = time.perf_counter()
+    for yol in yollar:
+        fonksiyon(yol)
+    return len(yollar) / (time.perf_counter() - baslangic)
+
+
+def paralel_olc(yollar, islem_sayisi):
+    cozucu = ParalelCozucu(islem_sayisi=islem_sayisi, slot_sayisi=4 * islem_sayisi)
+    try:
+        # Havuzun ısınması (süreç başlatma) ölçüme dahil edilmesin
+        list(ThreadPoolExecutor(2 * islem_sayisi).map(lambda _: cozucu.slot_birak(cozucu.coz(yollar[0])[0]),
+                                                      range(islem_sayisi)))
+
+        def coz_ve_birak(yol):
+            slot, _, _ = cozucu.coz(yol)
+            cozucu.slotlar[slot].astype(np.float32)
+            cozucu.slot_birak(slot)
+
+        baslangic = time.perf_counter()
+        with ThreadPoolExecutor(2 * islem_sayisi) as executor:
+            list(executor.map(coz_ve_birak, yollar))
+        return len(yollar) / (time.perf_counter() - baslangic)
+    finally:
+        cozucu.kapat()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sayi', type=int, default=400)
+    parser.add_argument('--boyut', default='1600x1200', help='sentetik resim boyutu (GxY)')
+    parser.add_argument('--klasor', default=None, help='varsayılan: geçici klasör')
+    args = parser.parse_args()
+
+    boyut = tuple(int(v) for v in args.boyut.split('x'))
+    klasor = args.klasor or os.path.join(tempfile.gettempdir(), f"decode_bench_{args.boyut}")
+    yollar = sentetik_resimler(klasor, args.sayi, boyut=boyut)
+
+    taban = tek_thread_olc(tek_thread_coz, yollar)
+    taslak = tek_thread_olc(tek_thread_taslak_coz, yollar)
+    print(f"{len(yollar)} resim, {args.boyut}")
+    print(f"Tek thread (eski yol)      : {taban:8.1f} resim/sn")
+    print(f"Tek thread (draft)         : {taslak:8.1f} resim/sn  (x{taslak / taban:.1f})")
+
+    islem_sayisi = 1
+    while islem_sayisi <= os.cpu_count():
+        verim = paralel_olc(yollar, islem_sayisi)
+        print(f"ParalelCozucu {islem_sayisi:3d} süreç    : {verim:8.1f} resim/sn  (x{verim / taban:.1f})")
+        islem_sayisi *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+ImageCollector filtre arka uçlarını sabit bir yerel resim klasöründe
+karşılaştırır: resim/sn, ilk arka uca (referans) göre kabul kararı uyumu
+(her resim x her hedef sınıf) ve ImageNet top-1 uyumu.
+
+Klasör verilmezse sentetik resimler üretilir. --agirliksiz ile ağ
+gerektirmeden rastgele ağırlıklarla çalışır (yalnızca hız anlamlıdır).
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.filtre --klasor dataset/kedi --tflite mobilenetv3 resnet50
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from benchmarks.sentetik import sentetik_resimler
+from decode import GIRDI_BOYUTU
+from filter_backends import ARKA_UCLAR, KerasFiltresi, TFLiteFiltresi, tflite_filtresi_olustur
+from label_filter import EtiketFiltresi, SINIF_ETIKETLERI, imagenet_etiketleri
+
+
+def resimleri_yukle(klasor, sayi):
+    dosyalar = sorted(f for f in os.listdir(klasor) if f.lower().endswith(('.jpg', '.jpeg', '.png')))[:sayi]
+    resimler = []
+    for dosya in dosyalar:
+        with Image.open(os.path.join(klasor, dosya)) as img:
+            img.draft('RGB', GIRDI_BOYUTU)
+            resimler.append(np.asarray(img.convert('RGB').resize(GIRDI_BOYUTU), dtype=np.uint8))
+    return np.stack(resimler)
+
+
+def olc(filtre, resimler, batch):
+    filtre(resimler[:batch])  # ısınma
+    baslangic = time.perf_counter()
+    tahminler = np.concatenate([filtre(resimler[i:i + batch]) for i in range(0, len(resimler), batch)])
+    return tahminler, len(resimler) / (time.perf_counter() - baslangic)
+
+
+def kararlar(etiket_filtresi, tahminler):
+    """(resim, hedef sınıf) kabul matrisi"""
+    return np.stack([etiket_filtresi.kabul_et(tahminler, [sinif] * len(tahminler))
+                     for sinif in SINIF_ETIKETLERI], axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--klasor')
+    parser.add_argument('--sayi', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=50)
+    parser.add_argument('--arka-uclar', nargs='+', default=list(ARKA_UCLAR), choices=list(ARKA_UCLAR))
+    parser.add_argument('--tflite', nargs='*', default=['mobilenetv3'], choices=list(ARKA_UCLAR),
+                        help="dinamik nicemlenmiş TFLite hali de ölçülecek arka uçlar")
+    parser.add_argument('--int8', nargs='*', default=[], choices=list(ARKA_UCLAR),
+                        help="tam int8 TFLite hali de ölçülecek arka uçlar (klasörden kalibre edilir)")
+    parser.add_argument('--agirliksiz', action='store_true', help="weights=None (ağ gerekmez)")
+    args = parser.parse_args()
+
+    klasor = args.klasor
+    if klasor is None:
+        klasor = os.path.join(tempfile.gettempdir(), f"filtre_bench_{args.sayi}")
+        sentetik_resimler(klasor, args.sayi)
+    resimler = resimleri_yukle(klasor, args.sayi)
+    weights = None if args.agirliksiz else 'imagenet'
+
+    try:
+        etiketler = imagenet_etiketleri()
+    except Exception as e:
+        print(f"ImageNet etiketleri yüklenemedi ({e}); kabul uyumu anlamsız olacak.")
+        etiketler = [f"sinif_{i}" for i in range(1000)]
+    etiket_filtresi = EtiketFiltresi(list(SINIF_ETIKETLERI), etiketler=etiketler)
+
+    gecici = tempfile.mkdtemp(prefix='filtre_tflite_')
+    filtreler = [(ad, lambda ad=ad: KerasFiltresi(ad, weights=weights)) for ad in args.arka_uclar]
+    for temel in args.tflite:
+        yol = os.path.join(gecici, f"{temel}_dinamik.tflite")
+        filtreler.append((f"{temel}_tflite", lambda temel=temel, yol=yol: TFLiteFiltresi(
+            tflite_filtresi_olustur(temel, yol, 'dinamik', weights=weights), temel)))
+    for temel in args.int8:
+        yol = os.path.join(gecici, f"{temel}_int8.tflite")
+        filtreler.append((f"{temel}_int8", lambda temel=temel, yol=yol: TFLiteFiltresi(
+            tflite_filtresi_olustur(temel, yol, 'int8', resimler[:100], weights=weights), temel)))
+
+    print(f"{len(resimler)} resim, batch {args.batch}")
+    print(f"{'arka uç':<22}{'yükleme s':>10}{'resim/sn':>10}{'kabul uyumu':>13}{'top-1 uyumu':>13}{'kabul %':>9}")
+    referans = None
+    for ad, olustur in filtreler:
+        baslangic = time.perf_counter()
+        filtre = olustur()
+        yukleme = time.perf_counter() - baslangic
+        tahminler, hiz = olc(filtre, resimler, args.batch)
+        karar = kararlar(etiket_filtresi, tahminler)
+        top1 = tahminler.argmax(axis=1)
+        if referans is None:
+            referans = (karar, top1)
+        print(f"{ad:<22}{yukleme:>10.1f}{hiz:>10.1f}{np.mean(karar == referans[0]):>13.3f}"
+              f"{np.mean(top1 == referans[1]):>13.3f}{karar.any(axis=1).mean():>9.1%}")
+
+
+if __name__ == '__main__':
+    main()
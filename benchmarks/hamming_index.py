@@ -0,0 +1,88 @@
+"""
+HammingIndex (multi-index hashing) ile doğrusal taramayı karşılaştırır.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.hamming_index --sayi 100000 --esik 4
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from hash_index import HammingIndex, HASH_BITLERI
+
+
+def bit_cevir(h, bit_sayisi, rnd):
+    for bit in rnd.sample(range(HASH_BITLERI), bit_sayisi):
+        h ^= 1 << bit
+    return h
+
+
+def sorgular_olustur(hashler, sorgu_sayisi, esik, rnd):
+    """Yarısı eşik içinde yakın kopya, yarısı rastgele olan sorgular"""
+    sorgular = []
+    for i in range(sorgu_sayisi):
+        if i % 2 == 0:
+            sorgular.append(bit_cevir(rnd.choice(hashler), rnd.randint(0, esik), rnd))
+        else:
+            sorgular.append(rnd.getrandbits(HASH_BITLERI))
+    return sorgular
+
+
+def dogrusal_python(hashler, h, esik):
+    for aday in hashler:
+        if bin(aday ^ h).count('1') <= esik:
+            return True
+    return False
+
+
+def dogrusal_numpy(dizi, h, esik):
+    xor = np.bitwise_xor(dizi, np.uint64(h))
+    mesafeler = np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+    return bool((mesafeler <= esik).any())
+
+
+def olc(fonksiyon, sorgular):
+    baslangic = time.perf_counter()
+    sonuclar = [fonksiyon(h) for h in sorgular]
+    return (time.perf_counter() - baslangic) / len(sorgular), sonuclar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sayi', type=int, default=100000, help="index'teki hash sayısı")
+    parser.add_argument('--esik', type=int, default=4, help='Hamming mesafesi eşiği')
+    parser.add_argument('--sorgu', type=int, default=2000, help='index sorgu sayısı')
+    parser.add_argument('--dogrusal-sorgu', type=int, default=200, help='doğrusal tarama sorgu sayısı')
+    parser.add_argument('--tohum', type=int, default=42)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.tohum)
+    hashler = [rnd.getrandbits(HASH_BITLERI) for _ in range(args.sayi)]
+    sorgular = sorgular_olustur(hashler, args.sorgu, args.esik, rnd)
+
+    baslangic = time.perf_counter()
+    index = HammingIndex(esik=args.esik)
+    for h in hashler:
+        index.ekle(h)
+    kurulum = time.perf_counter() - baslangic
+
+    dizi = np.array(hashler, dtype=np.uint64)
+    index_sure, index_sonuc = olc(index.yakin_var_mi, sorgular)
+    dogrusal_sorgular = sorgular[:args.dogrusal_sorgu]
+    py_sure, py_sonuc = olc(lambda h: dogrusal_python(hashler, h, args.esik), dogrusal_sorgular)
+    np_sure, np_sonuc = olc(lambda h: dogrusal_numpy(dizi, h, args.esik), sorgular)
+
+    if index_sonuc[:len(py_sonuc)] != py_sonuc or index_sonuc != np_sonuc:
+        raise SystemExit("HATA: HammingIndex sonuçları doğrusal tarama ile uyuşmuyor!")
+
+    print(f"{args.sayi} hash, eşik={args.esik}, {sum(index_sonuc)}/{len(sorgular)} sorgu eşleşti")
+    print(f"Index kurulumu        : {kurulum:.2f} sn")
+    print(f"HammingIndex          : {index_sure * 1e6:10.1f} µs/sorgu")
+    print(f"Doğrusal tarama (py)  : {py_sure * 1e6:10.1f} µs/sorgu  (x{py_sure / index_sure:.0f})")
+    print(f"Doğrusal tarama (np)  : {np_sure * 1e6:10.1f} µs/sorgu  (x{np_sure / index_sure:.0f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Eski indirme düzenini (her arama terimi için ayrı icrawler örneği, terim
+başına 4 indirme thread'i ve ayrı HTTP oturumu) ortak AsenkronIndirici ile
+yerel bir HTTP sunucusu üzerinde karşılaştırır. Yeni düzende icrawler
+yalnızca URL listesini iletir (UrlIleten), indirmeyi tek bağlantı havuzu
+yapar. "dogrudan" satırı URL'leri icrawler'sız doğrudan indiriciye verir
+(icrawler'ın terim başına sabit bekleme maliyeti olmadan indiricinin kendi
+hızı). URL'lerin bir kısmı sorunludur (HTML, çok büyük, çok küçük, 503
+sonra başarılı, 404).
+
+Raporlanan: süre, resim/sn, diske yazılan dosya, reddedilen/hatalı,
+yeniden deneme ve sunucunun gördüğü TCP bağlantısı sayısı.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.indirme --terim 10 --url 60 --gecikme-ms 40
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from icrawler.builtin import UrlListCrawler
+
+from async_downloader import AsenkronIndirici
+from benchmarks.yerel_sunucu import YerelResimSunucusu
+from scraper import UrlIleten
+
+# Her 20 URL'den biri sorunlu yanıt döndürür
+SORUNLU = ('sayfa', 'buyuk', 'kucuk', 'kararsiz', 'yok')
+
+
+def url_listeleri(sunucu, terim_sayisi, url_sayisi):
+    listeler = []
+    for t in range(terim_sayisi):
+        urller = []
+        for i in range(url_sayisi):
+            sira = t * url_sayisi + i
+            tur = SORUNLU[(sira // 20) % len(SORUNLU)] if sira % 20 == 19 else 'resim'
+            urller.append(sunucu.url(tur, sira))
+        listeler.append(urller)
+    return listeler
+
+
+def dosya_sayisi(klasor):
+    return sum(len([d for d in dosyalar if not d.endswith('.part')]) for _, _, dosyalar in os.walk(klasor))
+
+
+def eski_duzen(listeler, klasor, es_zamanli_terim):
+    """Terim başına bir UrlListCrawler (downloader_threads=4, kendi requests oturumu)"""
+    def terim_indir(i, urller):
+        crawler = UrlListCrawler(downloader_threads=4, storage={'root_dir': os.path.join(klasor, str(i))},
+                                 log_level=50)
+        crawler.crawl(urller, max_num=len(urller))
+
+    with ThreadPoolExecutor(es_zamanli_terim) as havuz:
+        wait([havuz.submit(terim_indir, i, urller) for i, urller in enumerate(listeler)])
+    return {}
+
+
+def yeni_duzen(listeler, klasor, es_zamanli_terim, eszamanli, host_basina, dogrudan=False):
+    """URL'ler UrlIleten ile (dogrudan ise icrawler'sız) toplanır, tek AsenkronIndirici indirir"""
+    indirici = AsenkronIndirici(eszamanli=eszamanli, host_basina=host_basina, geri_cekilme=0.05).baslat()
+
+    def terim_indir(i, urller):
+        alt_klasor = os.path.join(klasor, str(i))
+        os.makedirs(alt_klasor, exist_ok=True)
+        indirmeler = []
+
+        def url_geldi(url):
+            indirmeler.append(indirici.indir(url, os.path.join(alt_klasor, f"{len(indirmeler):06d}.jpg")))
+            return True
+
+        if dogrudan:
+            for url in urller:
+                url_geldi(url)
+        else:
+            crawler = UrlListCrawler(downloader_cls=UrlIleten, storage={'root_dir': alt_klasor}, log_level=50,
+                                     extra_downloader_args={'geri_cagir': url_geldi})
+            crawler.crawl(urller, max_num=len(urller))
+        wait(indirmeler)
+
+    try:
+        with ThreadPoolExecutor(es_zamanli_terim) as havuz:
+            wait([havuz.submit(terim_indir, i, urller) for i, urller in enumerate(listeler)])
+    finally:
+        indirici.kapat()
+    return indirici.sayaclar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--terim', type=int, default=10, help="arama terimi sayısı")
+    parser.add_argument('--url', type=int, default=60, help="terim başına URL sayısı")
+    parser.add_argument('--es-zamanli-terim', type=int, default=5, help="aynı anda çalışan terim (tur boyutu)")
+    parser.add_argument('--gecikme-ms', type=float, default=40, help="sunucunun yanıt gecikmesi")
+    parser.add_argument('--eszamanli', type=int, default=64)
+    parser.add_argument('--host-basina', type=int, default=16)
+    args = parser.parse_args()
+
+    sunucu = YerelResimSunucusu(gecikme_ms=args.gecikme_ms).baslat()
+    listeler = url_listeleri(sunucu, args.terim, args.url)
+    toplam_url = args.terim * args.url
+    print(f"{args.terim} terim x {args.url} URL, sunucu gecikmesi {args.gecikme_ms:.0f} ms")
+    print(f"{'düzen':<14}{'süre s':>9}{'resim/sn':>10}{'dosya':>8}{'red/hata':>10}{'yeniden':>9}{'bağlantı':>10}")
+
+    duzenler = [
+        ('icrawler', lambda klasor: eski_duzen(listeler, klasor, args.es_zamanli_terim)),
+        ('asenkron', lambda klasor: yeni_duzen(listeler, klasor, args.es_zamanli_terim,
+                                               args.eszamanli, args.host_basina)),
+        ('dogrudan', lambda klasor: yeni_duzen(listeler, klasor, args.es_zamanli_terim,
+                                               args.eszamanli, args.host_basina, dogrudan=True)),
+    ]
+    try:
+        for ad, calistir in duzenler:
+            klasor = tempfile.mkdtemp(prefix=f'indirme_{ad}_')
+            sunucu.sayaclari_sifirla()
+            baslangic = time.perf_counter()
+            sayaclar = calistir(klasor)
+            sure = time.perf_counter() - baslangic
+            dosya = dosya_sayisi(klasor)
+            red = f"{sayaclar['reddedildi']}/{sayaclar['hata']}" if sayaclar else f"{toplam_url - dosya}"
+            yeniden = sayaclar.get('yeniden_deneme', '-')
+            print(f"{ad:<14}{sure:>9.2f}{dosya / sure:>10.1f}{dosya:>8}{red:>10}{yeniden:>9}"
+                  f"{sunucu.sayaclar['baglanti']:>10}")
+            shutil.rmtree(klasor)
+    finally:
+        sunucu.kapat()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+ImageDataGenerator ile tf.data yükleyicisinin eğitim verisi verimini
+(resim/sn) karşılaştırır. Sentetik bir veri_seti/ klasörü oluşturulur.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.input_pipeline --sinif 4 --resim 100 --epoch 2
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.sentetik import sentetik_resimler
+
+
+def sentetik_veri_seti(kok, sinif_sayisi, resim_sayisi, boyut=(640, 480)):
+    for i in range(sinif_sayisi):
+        sentetik_resimler(os.path.join(kok, f"sinif_{i}"), resim_sayisi, boyut=boyut, tohum=i)
+
+
+def verim_olc(batchler, epoch_sayisi, batch_sayisi):
+    """Her epoch için resim/sn listesi"""
+    sonuclar = []
+    for _ in range(epoch_sayisi):
+        baslangic = time.perf_counter()
+        resim = 0
+        for j, (x, _) in enumerate(batchler()):
+            resim += len(x)
+            if j + 1 >= batch_sayisi:
+                break
+        sonuclar.append(resim / (time.perf_counter() - baslangic))
+    return sonuclar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sinif', type=int, default=4)
+    parser.add_argument('--resim', type=int, default=100, help='sınıf başına resim sayısı')
+    parser.add_argument('--epoch', type=int, default=2)
+    parser.add_argument('--batch', type=int, default=32)
+    parser.add_argument('--klasor', default=None, help='varsayılan: geçici klasör')
+    args = parser.parse_args()
+
+    from tensorflow.keras.preprocessing.image import ImageDataGenerator
+    from input_pipeline import veri_seti_olustur, dosya_listesi, artirma_katmanlari
+
+    kok = args.klasor or os.path.join(tempfile.gettempdir(), f"input_bench_{args.sinif}x{args.resim}")
+    sentetik_veri_seti(kok, args.sinif, args.resim)
+    toplam = args.sinif * args.resim
+    batch_sayisi = int(toplam * 0.85) // args.batch
+
+    datagen = ImageDataGenerator(rotation_range=20, width_shift_range=0.2, height_shift_range=0.2,
+                                 horizontal_flip=True, fill_mode='nearest', validation_split=0.15,
+                                 rescale=1. / 255)
+    generator = datagen.flow_from_directory(kok, target_size=(224, 224), batch_size=args.batch,
+                                            class_mode='categorical', subset='training', shuffle=True)
+    keras_sonuc = verim_olc(lambda: generator, args.epoch, batch_sayisi)
+
+    siniflar, egitim, _ = dosya_listesi(kok, 0.15)
+    ds = veri_seti_olustur(*egitim, len(siniflar), batch_size=args.batch, karistir=True,
+                           artirma=artirma_katmanlari(42))
+    tfdata_sonuc = verim_olc(lambda: ds, args.epoch, batch_sayisi)
+
+    print(f"{toplam} resim, {args.epoch} epoch, {batch_sayisi} batch/epoch")
+    for epoch, (k, t) in enumerate(zip(keras_sonuc, tfdata_sonuc), 1):
+        print(f"epoch {epoch}: ImageDataGenerator {k:8.1f} resim/sn | tf.data {t:8.1f} resim/sn (x{t / k:.1f})")
+
+
+if __name__ == '__main__':
+    main()
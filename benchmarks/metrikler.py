@@ -0,0 +1,118 @@
+"""
+Toplama metriklerinin (ToplamaMetrikleri) maliyetini yerel HTTP sunucusu
+üzerinde ölçer ve toplamanın aşama dökümünü gösterir. Aynı toplama ölçüm
+kapalı ve açık (JSON satırları + her 0,5 sn'de okunan /metrics) iki ayrı
+süreçte çalışır. Sınıflandırıcı resmin ortalama parlaklığına göre karar
+veren sabit bir fonksiyondur (ağ ve model gerekmez).
+
+Raporlanan: süre ve kabul edilen resim başına CPU (çözme süreçleri dahil);
+açık moddaki son metrik satırından aşama süreleri ve sonuç sayaçları.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.metrikler --hedef 150
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+DEPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def topla(acik, hedef, gecikme_ms):
+    """Çalışma klasöründe tek sınıf topla, ölçümleri döndür (alt süreçte çalışır)"""
+    import numpy as np
+
+    import scraper
+    from benchmarks.yerel_sunucu import YerelResimSunucusu, yerel_motor
+    from label_filter import EtiketFiltresi
+
+    logging.disable(logging.INFO)
+    sunucu = YerelResimSunucusu(resim_sayisi=800, gecikme_ms=gecikme_ms).baslat()
+    for motor in scraper.MOTORLAR:
+        scraper.MOTORLAR[motor] = yerel_motor(sunucu)
+
+    ayarlar = dict(metrik_dosyasi='metrikler.jsonl', metrik_araligi=1, metrik_portu=0) if acik else {}
+    collector = scraper.ImageCollector(save_folder='dataset', onbellek_kapasitesi=0, **ayarlar)
+
+    def filtre(x):
+        # Parlak resimler 'kedi', diğerleri başka bir etiket
+        tahminler = np.zeros((len(x), 1000), dtype=np.float32)
+        tahminler[np.arange(len(x)), np.where(x.mean(axis=(1, 2, 3)) > 120, 0, 1)] = 1
+        return tahminler
+
+    collector.filtre = filtre
+    collector.etiket_filtresi = EtiketFiltresi(list(collector.siniflar),
+                                               etiketler=['tabby cat'] + [f"etiket_{i}" for i in range(999)])
+
+    # Prometheus'un kazıması gibi uç nokta düzenli okunur
+    dur = threading.Event()
+    okunan = [0]
+
+    def kazi():
+        while not dur.wait(0.5):
+            with urllib.request.urlopen(f"{collector.metrikler.adres}/metrics") as yanit:
+                okunan[0] += len(yanit.read())
+
+    if acik:
+        threading.Thread(target=kazi, daemon=True).start()
+
+    cpu_once = time.process_time()
+    baslangic = time.perf_counter()
+    try:
+        collector.sinif_resimleri_topla('kedi', hedef)
+    finally:
+        dur.set()
+        collector.kapat()
+        sunucu.kapat()
+    sure = time.perf_counter() - baslangic
+    cpu = time.process_time() - cpu_once + resource.getrusage(resource.RUSAGE_CHILDREN).ru_utime \
+        + resource.getrusage(resource.RUSAGE_CHILDREN).ru_stime
+    sonuc = {'sure': sure, 'cpu': cpu, 'kabul': collector.collected_counts['kedi'], 'kazinan': okunan[0]}
+    if acik:
+        with open('metrikler.jsonl', encoding='utf-8') as f:
+            satirlar = f.read().splitlines()
+        sonuc['satir'] = len(satirlar)
+        sonuc['son'] = json.loads(satirlar[-1])
+    return sonuc
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hedef', type=int, default=150, help="toplanacak resim sayısı")
+    parser.add_argument('--gecikme-ms', type=float, default=20)
+    parser.add_argument('--mod', choices=['kapali', 'acik'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mod:
+        print(json.dumps(topla(args.mod == 'acik', args.hedef, args.gecikme_ms), ensure_ascii=False))
+        return
+
+    print(f"hedef {args.hedef} resim")
+    print(f"{'metrikler':<11}{'süre s':>8}{'CPU s':>8}{'CPU ms/resim':>14}")
+    ortam = dict(os.environ, PYTHONPATH=DEPO, TF_CPP_MIN_LOG_LEVEL='3')
+    for mod in ('kapali', 'acik'):
+        kok = tempfile.mkdtemp(prefix=f'metrikler_bench_{mod}_')
+        komut = [sys.executable, '-m', 'benchmarks.metrikler', '--mod', mod, '--hedef', str(args.hedef),
+                 '--gecikme-ms', str(args.gecikme_ms)]
+        cikti = subprocess.run(komut, cwd=kok, env=ortam, capture_output=True, text=True, check=True).stdout
+        s = json.loads(cikti.strip().splitlines()[-1])
+        print(f"{mod:<11}{s['sure']:>8.1f}{s['cpu']:>8.1f}{1000 * s['cpu'] / max(s['kabul'], 1):>14.1f}")
+
+    son = s['son']
+    print(f"\n{s['satir']} metrik satırı, /metrics'ten {s['kazinan'] / 1024:.0f} KB okundu")
+    print(f"{'aşama':<10}{'adet':>7}{'toplam s':>10}{'ort ms':>9}")
+    for asama, d in son['asamalar'].items():
+        print(f"{asama:<10}{d['adet']:>7}{d['saniye']:>10.2f}{d['ort_ms']:>9.2f}")
+    print("sonuçlar:", ', '.join(f"{sonuc} {adet}" for sonuc, adet in son['sonuclar']['kedi'].items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+SE-ResNet50 eğitim adımı süresini ve tepe bellek kullanımını float32,
+float32 + XLA, bfloat16 + XLA ve float16 + XLA modlarında karşılaştırır.
+Hassasiyet politikası süreç genelinde olduğundan her mod ayrı bir süreçte
+rastgele veri ve rastgele ağırlıklarla (weights=None) çalıştırılır.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.mixed_precision --batch 8 --adim 10
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+MODLAR = [
+    ('float32', 'kapali', False),
+    ('float32+XLA', 'kapali', True),
+    ('bfloat16+XLA', 'bfloat16', True),
+    ('float16+XLA', 'float16', True),
+]
+
+
+def mod_calistir(hassasiyet, xla, batch, adim, se_asamalari):
+    """Tek bir modu bu süreçte çalıştırıp sonuçları sözlük olarak döndür"""
+    import numpy as np
+    from model import create_se_resnet, hizli_egitim_ayarla, model_derle
+
+    politika = hizli_egitim_ayarla(hassasiyet)
+    model = create_se_resnet(weights=None, se_asamalari=se_asamalari)
+    model_derle(model, 1e-4, xla)
+
+    x = np.random.rand(batch, 224, 224, 3).astype(np.float32)
+    y = np.eye(10, dtype=np.float32)[np.random.randint(0, 10, batch)]
+    sureler = []
+    for _ in range(adim + 1):
+        baslangic = time.perf_counter()
+        model.train_on_batch(x, y)
+        sureler.append(time.perf_counter() - baslangic)
+    return {
+        'politika': politika,
+        'ilk_adim_s': sureler[0],
+        # İlk adım izleme/XLA derlemesini içerdiği için ortalamaya katılmaz
+        'adim_ms': 1e3 * sum(sureler[1:]) / adim,
+        # Linux'ta ru_maxrss KiB cinsindendir
+        'tepe_bellek_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch', type=int, default=8)
+    parser.add_argument('--adim', type=int, default=10)
+    parser.add_argument('--se-asamalari', type=int, nargs='*', default=[4, 5])
+    parser.add_argument('--mod', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mod is not None:
+        _, hassasiyet, xla = next(m for m in MODLAR if m[0] == args.mod)
+        print(json.dumps(mod_calistir(hassasiyet, xla, args.batch, args.adim, tuple(args.se_asamalari))))
+        return
+
+    print(f"{'mod':<15}{'politika':<16}{'ilk adım (s)':>13}{'ms/adım':>10}{'tepe MB':>10}")
+    for ad, _, _ in MODLAR:
+        komut = [sys.executable, '-m', 'benchmarks.mixed_precision', '--mod', ad,
+                 '--batch', str(args.batch), '--adim', str(args.adim),
+                 '--se-asamalari', *map(str, args.se_asamalari)]
+        cikti = subprocess.run(komut, capture_output=True, text=True)
+        if cikti.returncode != 0:
+            print(f"{ad:<15}hata: {cikti.stderr.strip().splitlines()[-1:]}")
+            continue
+        sonuc = json.loads(cikti.stdout.strip().splitlines()[-1])
+        print(f"{ad:<15}{sonuc['politika']:<16}{sonuc['ilk_adim_s']:>13.1f}"
+              f"{sonuc['adim_ms']:>10.0f}{sonuc['tepe_bellek_mb']:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Sonuç önbelleğinin (SonucOnbellegi) etkisini yerel HTTP sunucusu üzerinde
+ölçer. Aynı çalışma klasöründe art arda iki toplama yapılır (ikincisi daha
+yüksek hedefle, ertesi gün yeniden çalıştırma gibi); arama sonuçlarının bir
+kısmı aramalar arasında tekrar eden popüler URL'lerdir. Önbellek açık ve
+kapalı iki ayrı süreçte karşılaştırılır.
+
+Sınıflandırıcı, resmin ortalama parlaklığına göre karar veren sabit bir
+fonksiyondur (yaklaşık yarısını reddeder; ağ ve model gerekmez).
+
+Raporlanan: süre, sunucuya giden istek, çözülen resim ve önbellek isabetleri.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.onbellek --hedef 60 120
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+DEPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def topla(kapasite, hedef, populer, gecikme_ms):
+    """Çalışma klasöründe tek sınıf topla, ölçümleri döndür (alt süreçte çalışır)"""
+    import numpy as np
+
+    import scraper
+    from benchmarks.yerel_sunucu import YerelResimSunucusu, yerel_motor
+    from label_filter import EtiketFiltresi
+
+    logging.disable(logging.INFO)
+    sunucu = YerelResimSunucusu(resim_sayisi=400, gecikme_ms=gecikme_ms).baslat()
+    for motor in scraper.MOTORLAR:
+        scraper.MOTORLAR[motor] = yerel_motor(sunucu, populer=populer)
+
+    collector = scraper.ImageCollector(save_folder='dataset', onbellek_kapasitesi=kapasite)
+
+    def filtre(x):
+        # Parlak resimler 'kedi', diğerleri başka bir etiket
+        tahminler = np.zeros((len(x), 1000), dtype=np.float32)
+        tahminler[np.arange(len(x)), np.where(x.mean(axis=(1, 2, 3)) > 120, 0, 1)] = 1
+        return tahminler
+
+    collector.filtre = filtre
+    collector.etiket_filtresi = EtiketFiltresi(list(collector.siniflar),
+                                               etiketler=['tabby cat'] + [f"etiket_{i}" for i in range(999)])
+    cozulen = [0]
+    coz = collector._resim_coz
+
+    def sayarak_coz(oge):
+        cozulen[0] += 1
+        return coz(oge)
+
+    collector._resim_coz = sayarak_coz
+
+    baslangic = time.perf_counter()
+    try:
+        collector.sinif_resimleri_topla('kedi', hedef)
+    finally:
+        collector.kapat()
+        sunucu.kapat()
+    # Tamamlanmış bir çalıştırma gibi günlüğü kapat; önbellek kalıcıdır
+    collector.gunluk.sifirla()
+    return {
+        'sure': time.perf_counter() - baslangic,
+        'istek': sunucu.sayaclar['istek'],
+        'cozulen': cozulen[0],
+        'kabul': collector.collected_counts['kedi'],
+        'isabet': collector.onbellek.sayaclar,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hedef', type=int, nargs=2, default=[60, 120], help="iki çalıştırmanın hedefleri")
+    parser.add_argument('--populer', type=int, default=60, help="tekrar eden popüler URL sayısı")
+    parser.add_argument('--gecikme-ms', type=float, default=20)
+    parser.add_argument('--kapasite', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--tek-hedef', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.kapasite is not None:
+        print(json.dumps(topla(args.kapasite, args.tek_hedef, args.populer, args.gecikme_ms)))
+        return
+
+    print(f"hedefler {args.hedef}, {args.populer} popüler URL")
+    print(f"{'önbellek':<10}{'çalıştırma':>11}{'süre s':>8}{'istek':>7}{'çözülen':>9}{'kabul':>7}"
+          f"{'URL isabet':>12}{'özet isabet':>13}")
+    ortam = dict(os.environ, PYTHONPATH=DEPO, TF_CPP_MIN_LOG_LEVEL='3')
+    for ad, kapasite in (('kapali', 0), ('acik', 200_000)):
+        kok = tempfile.mkdtemp(prefix=f'onbellek_bench_{ad}_')
+        for i, hedef in enumerate(args.hedef, 1):
+            komut = [sys.executable, '-m', 'benchmarks.onbellek', '--kapasite', str(kapasite),
+                     '--tek-hedef', str(hedef), '--populer', str(args.populer), '--gecikme-ms', str(args.gecikme_ms)]
+            cikti = subprocess.run(komut, cwd=kok, env=ortam, capture_output=True, text=True, check=True).stdout
+            s = json.loads(cikti.strip().splitlines()[-1])
+            print(f"{ad:<10}{i:>11}{s['sure']:>8.1f}{s['istek']:>7}{s['cozulen']:>9}{s['kabul']:>7}"
+                  f"{s['isabet']['url_isabet']:>12}{s['isabet']['ozet_isabet']:>13}")
+
+
+if __name__ == '__main__':
+    main()
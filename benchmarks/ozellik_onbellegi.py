@@ -0,0 +1,77 @@
+"""
+Özellik önbelleğinin (feature_cache.OzellikOnbellegi) SE aşamalarına göre
+kazancını ölçer. Önbellek, omurgayı ilk SE aşamasından hemen önce keser
+(model.ozellik_katmani); kalan aşamalar eğitilen başta her adımda çalışır.
+
+Her yapılandırma için raporlanan:
+  - kesim katmanı ve resim/tohum başına önbellek boyutu, --resim x --tohum
+    için toplam,
+  - başın tek resim FLOP'undaki payı (model_maliyeti),
+  - ilk aşama eğitim adımı: tüm model (donuk omurga) ve önbellekten baş,
+    ms/resim ve hızlanma,
+  - özelliklerin bir kez hesaplanması (omurga ileri geçişi) ms/resim.
+
+Ağırlıklar rastgeledir (weights=None); süreler yalnızca hesaplama içindir,
+önbellekten okuma dahil değildir.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.ozellik_onbellegi --batch 8
+"""
+import argparse
+import time
+
+import numpy as np
+from tensorflow.keras import Model
+
+from model import create_se_head, create_se_resnet, model_derle, model_maliyeti, ozellik_katmani
+
+YAPILANDIRMALAR = [(), (5,), (4, 5)]
+
+
+def adim_olc(fonksiyon, tekrar):
+    # İlk iki çağrı izleme ve ısınmadır
+    for _ in range(2):
+        fonksiyon()
+    baslangic = time.perf_counter()
+    for _ in range(tekrar):
+        fonksiyon()
+    return (time.perf_counter() - baslangic) / tekrar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch', type=int, default=8)
+    parser.add_argument('--tekrar', type=int, default=3)
+    parser.add_argument('--sinif', type=int, default=10)
+    parser.add_argument('--resim', type=int, default=3600, help="toplam boyut için eğitim resmi sayısı")
+    parser.add_argument('--tohum', type=int, default=4, help="artırma tohumu sayısı (artirma_sayisi)")
+    args = parser.parse_args()
+
+    rnd = np.random.default_rng(0)
+    x = rnd.random((args.batch, 224, 224, 3), dtype=np.float32)
+    y = np.eye(args.sinif, dtype=np.float32)[rnd.integers(0, args.sinif, args.batch)]
+
+    print(f"{'SE aşamaları':<14}{'kesim':<20}{'MB/resim':>9}{'toplam GB':>10}{'baş FLOP':>9}"
+          f"{'tüm ms':>9}{'baş ms':>9}{'hız':>7}{'özellik ms':>12}")
+    for se_asamalari in YAPILANDIRMALAR:
+        model = create_se_resnet(sinif_sayisi=args.sinif, weights=None, se_asamalari=se_asamalari)
+        model_derle(model, 1e-4)
+        kesim = ozellik_katmani(se_asamalari)
+        omurga = Model(inputs=model.input, outputs=model.get_layer(kesim).output)
+        sekil = tuple(omurga.output.shape[1:])
+        bas = create_se_head(sinif_sayisi=args.sinif, ozellik_sekli=sekil, se_asamalari=se_asamalari)
+        model_derle(bas, 1e-4)
+        ozellik = rnd.random((args.batch,) + sekil, dtype=np.float32)
+
+        mb = int(np.prod(sekil)) * 2 / 2**20
+        pay = model_maliyeti(bas)[2] / model_maliyeti(model)[2]
+        tum = adim_olc(lambda: model.train_on_batch(x, y), args.tekrar) / args.batch
+        bas_sure = adim_olc(lambda: bas.train_on_batch(ozellik, y), args.tekrar) / args.batch
+        cikarma = adim_olc(lambda: omurga.predict_on_batch(x), args.tekrar) / args.batch
+        ad = ','.join(map(str, se_asamalari)) or 'yok'
+        print(f"{ad:<14}{kesim:<20}{mb:>9.2f}{mb * args.resim * args.tohum / 1024:>10.1f}{pay:>9.0%}"
+              f"{1000 * tum:>9.1f}{1000 * bas_sure:>9.1f}{tum / bas_sure:>6.1f}x{1000 * cikarma:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+SE-ResNet50 yapılandırmalarının parametre sayısı, FLOP'u ve CPU çıkarım
+süresini raporlar (ağırlıklar rastgele, ağ gerekmez).
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.se_resnet --ratio 16 8 --batch 8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from model import create_se_resnet, model_maliyeti
+
+YAPILANDIRMALAR = [(), (5,), (4, 5), (3, 4, 5), (2, 3, 4, 5)]
+
+
+def gecikme_olc(model, batch, tekrar):
+    x = np.random.rand(batch, 224, 224, 3).astype(np.float32)
+    model(x, training=False)  # ısınma
+    baslangic = time.perf_counter()
+    for _ in range(tekrar):
+        model(x, training=False)
+    return (time.perf_counter() - baslangic) / tekrar / batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ratio', type=int, nargs='+', default=[16])
+    parser.add_argument('--batch', type=int, default=8)
+    parser.add_argument('--tekrar', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'SE aşamaları':<14}{'ratio':>6}{'parametre':>13}{'eğitilebilir':>14}{'GFLOP':>9}{'ms/resim':>10}")
+    for ratio in args.ratio:
+        for se_asamalari in YAPILANDIRMALAR:
+            model = create_se_resnet(weights=None, se_asamalari=se_asamalari, ratio=ratio)
+            toplam, egitilebilir, flops = model_maliyeti(model)
+            sure = gecikme_olc(model, args.batch, args.tekrar)
+            ad = ','.join(map(str, se_asamalari)) or 'yok'
+            print(f"{ad:<14}{ratio:>6}{toplam:>13,}{egitilebilir:>14,}{flops / 1e9:>9.3f}{sure * 1e3:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""Benchmark'lar için ağ gerektirmeyen sentetik resim üretimi"""
+import os
+
+import numpy as np
+from PIL import Image
+
+
+def sentetik_resim(rnd, boyut=(640, 480)):
+    """Düz gürültü yerine yumuşak gradyan + birkaç dikdörtgen içeren gerçekçi bir RGB resim"""
+    genislik, yukseklik = boyut
+    y, x = np.mgrid[0:yukseklik, 0:genislik].astype(np.float32)
+    renk = rnd.uniform(0, 255, size=(2, 3)).astype(np.float32)
+    oran = (x / genislik)[..., None]
+    dizi = renk[0] * (1 - oran) + renk[1] * oran
+    for _ in range(rnd.integers(2, 6)):
+        x0, y0 = rnd.integers(0, genislik // 2), rnd.integers(0, yukseklik // 2)
+        x1, y1 = x0 + rnd.integers(20, genislik // 2), y0 + rnd.integers(20, yukseklik // 2)
+        dizi[y0:y1, x0:x1] = rnd.uniform(0, 255, size=3)
+    dizi += rnd.normal(0, 8, size=dizi.shape)
+    return Image.fromarray(np.clip(dizi, 0, 255).astype(np.uint8))
+
+
+def sentetik_resimler(klasor, sayi, boyut=(640, 480), tohum=0, onek='resim'):
+    """klasor altına sayi adet JPEG yaz (zaten varsa yeniden üretme), yolları döndür"""
+    os.makedirs(klasor, exist_ok=True)
+    rnd = np.random.default_rng(tohum)
+    yollar = []
+    for i in range(sayi):
+        yol = os.path.join(klasor, f"{onek}_{i:05d}.jpg")
+        img = sentetik_resim(rnd, boyut)
+        if not os.path.exists(yol):
+            img.save(yol, 'JPEG', quality=90)
+        yollar.append(yol)
+    return yollar
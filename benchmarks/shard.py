@@ -0,0 +1,105 @@
+"""
+Küçük dosyalardan okuma (input_pipeline.veri_seti_olustur, önbelleksiz) ile
+TFRecord shard'larından okumayı (tfrecord_shards.shard_veri_seti)
+karşılaştırır. Sentetik bir veri_seti/ oluşturulur ve shard'lara aktarılır.
+
+Raporlanan:
+  - dışa aktarma süresi, shard sayısı ve shard boyutlarının dengesi,
+  - bir epoch eğitim okuması (karıştırma açık, artırma kapalı) için resim/sn
+    ve açılan dosya sayısı,
+  - çalışan başına paylaştırma: her çalışanın okuduğu resimler ayrık mı ve
+    birleşimi bölümün tamamı mı.
+
+Yerel diskte dosyalar sayfa önbelleğinde olduğundan fark ağ dosya
+sistemindekinden küçük çıkar; orada dosya açma başına gecikme, açılan dosya
+sayısıyla çarpılır.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.shard --sinif-basina 500
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import tensorflow as tf
+
+from benchmarks.sentetik import sentetik_resimler
+from input_pipeline import manifest_listesi, veri_seti_olustur
+from tfrecord_shards import bolum_sayisi, shard_veri_seti, shardlari_yaz
+
+SINIFLAR = ['kedi', 'kopek', 'araba', 'ev']
+
+
+def epoch_olc(ds, tekrar):
+    """İlk epoch ısınmadır; sonraki epoch'ların ortalama resim/sn değeri"""
+    for _ in ds:
+        pass
+    sayi = 0
+    baslangic = time.perf_counter()
+    for _ in range(tekrar):
+        for x, _ in ds:
+            sayi += int(x.shape[0])
+    return sayi / (time.perf_counter() - baslangic)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sinif-basina', type=int, default=500)
+    parser.add_argument('--hedef-mb', type=float, default=4, help="shard başına hedef boyut")
+    parser.add_argument('--img-size', type=int, default=160)
+    parser.add_argument('--tekrar', type=int, default=2, help="ölçülen epoch sayısı")
+    parser.add_argument('--calisan', type=int, default=4, help="paylaştırma denetimi için çalışan sayısı")
+    args = parser.parse_args()
+    img_size = (args.img_size, args.img_size)
+
+    kok = tempfile.mkdtemp(prefix='shard_bench_')
+    try:
+        veri_yolu = os.path.join(kok, 'veri_seti')
+        for i, sinif in enumerate(SINIFLAR):
+            sentetik_resimler(os.path.join(veri_yolu, sinif), args.sinif_basina, boyut=(320, 240), tohum=i)
+        siniflar, egitim, _, _ = manifest_listesi(veri_yolu)
+        shard_dizini = os.path.join(kok, 'veri_seti_shards')
+
+        baslangic = time.perf_counter()
+        indeks = shardlari_yaz(veri_yolu, shard_dizini, siniflar, hedef_mb=args.hedef_mb)
+        aktarma = time.perf_counter() - baslangic
+        baslangic = time.perf_counter()
+        shardlari_yaz(veri_yolu, shard_dizini, siniflar, hedef_mb=args.hedef_mb)
+        degismeyen = time.perf_counter() - baslangic
+        shardlar = indeks['bolumler']['egitim']
+        baytlar = [s['bayt'] / 2**20 for s in shardlar]
+        print(f"{len(siniflar)} sınıf, eğitim {len(egitim[0])} resim")
+        print(f"dışa aktarma {aktarma:.2f} sn (değişiklik yokken {degismeyen:.2f} sn); eğitim: {len(shardlar)} "
+              f"shard, {min(baytlar):.2f}-{max(baytlar):.2f} MB")
+
+        print(f"\n{'kaynak':<10}{'resim/sn':>10}{'açılan dosya':>14}")
+        dosyadan = veri_seti_olustur(*egitim, len(siniflar), img_size, karistir=True, onbellek=None)
+        print(f"{'dosyalar':<10}{epoch_olc(dosyadan, args.tekrar):>10.0f}{len(egitim[0]):>14}")
+        sharddan = shard_veri_seti(shard_dizini, 'egitim', img_size, karistir=True)
+        print(f"{'shardlar':<10}{epoch_olc(sharddan, args.tekrar):>10.0f}{len(shardlar):>14}")
+
+        # Her çalışanın okuduğu kayıtların göreli yolları
+        yollar = []
+        for c in range(args.calisan):
+            ds = tf.data.TFRecordDataset([os.path.join(shard_dizini, s['dosya'])
+                                          for s in shardlar[c::args.calisan]])
+            okunan = [tf.io.parse_single_example(k, {'yol': tf.io.FixedLenFeature([], tf.string)})['yol']
+                      .numpy().decode() for k in ds]
+            assert len(okunan) == bolum_sayisi(indeks, 'egitim', args.calisan, c)
+            sayi = sum(int(x.shape[0]) for x, _ in shard_veri_seti(shard_dizini, 'egitim', img_size,
+                                                                      calisan_sayisi=args.calisan,
+                                                                      calisan_indeksi=c))
+            assert sayi == len(okunan)
+            yollar.append(set(okunan))
+        birlesim = set().union(*yollar)
+        beklenen = {os.path.relpath(yol, veri_yolu).replace(os.sep, '/') for yol in egitim[0]}
+        print(f"\n{args.calisan} çalışan: {[len(y) for y in yollar]} resim, ayrık: "
+              f"{sum(map(len, yollar)) == len(birlesim)}, birleşim eğitim bölümü: {birlesim == beklenen}")
+    finally:
+        shutil.rmtree(kok)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Tahmin sunucusu için yük üreteci: sunucuyu bu süreçte başlatır, eşzamanlı
+istemcilerle sentetik JPEG'ler gönderir ve farklı batch boyutlarında
+verimi (istek/s), istemci tarafı p50/p99 gecikmeyi ve batch doluluğunu
+raporlar. batch_boyutu=1 dinamik batch'lemenin kapalı olduğu durumdur.
+
+Yükten önce sunucunun ön işlemesinin (resim_hazirla) eğitimdeki
+load_img + 1/255 ile aynı diziyi verdiği denetlenir.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.sunucu --istemci 16 --sure 20 --batch 1 8 32
+    python -m benchmarks.sunucu --model final_senet_model.h5
+"""
+import io
+import time
+import argparse
+import threading
+import http.client
+
+import numpy as np
+
+from benchmarks.sentetik import sentetik_resim
+from sunucu import sunucu_olustur, resim_hazirla, GIRDI_BOYUTU
+
+
+def on_isleme_farki(resimler):
+    """resim_hazirla ile eğitimdeki load_img + 1/255 arasındaki en büyük mutlak fark"""
+    from tensorflow.keras.preprocessing.image import img_to_array, load_img
+
+    fark = 0.0
+    for govde in resimler:
+        egitim = img_to_array(load_img(io.BytesIO(govde), target_size=GIRDI_BOYUTU)) / 255.0
+        fark = max(fark, float(np.abs(resim_hazirla(govde) - egitim).max()))
+    return fark
+
+
+def istemci(port, resimler, bitis, gecikmeler, hatalar):
+    baglanti = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    i = 0
+    while time.perf_counter() < bitis:
+        govde = resimler[i % len(resimler)]
+        i += 1
+        baslangic = time.perf_counter()
+        try:
+            baglanti.request('POST', '/tahmin', body=govde, headers={'Content-Type': 'image/jpeg'})
+            yanit = baglanti.getresponse()
+            yanit.read()
+            if yanit.status != 200:
+                hatalar.append(yanit.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            hatalar.append(str(e))
+            baglanti.close()
+            baglanti = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            continue
+        gecikmeler.append(time.perf_counter() - baslangic)
+    baglanti.close()
+
+
+def yuk_uret(port, resimler, istemci_sayisi, sure):
+    gecikmeler, hatalar = [], []
+    bitis = time.perf_counter() + sure
+    threadler = [threading.Thread(target=istemci, args=(port, resimler, bitis, gecikmeler, hatalar))
+                 for _ in range(istemci_sayisi)]
+    baslangic = time.perf_counter()
+    for t in threadler:
+        t.start()
+    for t in threadler:
+        t.join()
+    return np.array(gecikmeler), len(hatalar), time.perf_counter() - baslangic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', help="kaydedilmiş model; verilmezse rastgele ağırlıklı SE-ResNet50")
+    parser.add_argument('--istemci', type=int, default=16)
+    parser.add_argument('--sure', type=float, default=20, help="her yapılandırma için saniye")
+    parser.add_argument('--batch', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--bekleme-ms', type=float, default=10)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    import tensorflow as tf
+    if args.model:
+        model = tf.keras.models.load_model(args.model, compile=False)
+    else:
+        from model import create_se_resnet
+        model = create_se_resnet(weights=None)
+    siniflar = [f"sinif_{i}" for i in range(model.output.shape[-1])]
+    model(np.zeros((1,) + GIRDI_BOYUTU + (3,), dtype=np.float32), training=False)
+
+    rnd = np.random.default_rng(0)
+    resimler = []
+    for _ in range(32):
+        tampon = io.BytesIO()
+        sentetik_resim(rnd).save(tampon, 'JPEG', quality=90)
+        resimler.append(tampon.getvalue())
+
+    # draft() ölçeklerinin hepsi denensin diye büyük ve gri tonlu resimler de
+    denetim = list(resimler)
+    for boyut in ((1600, 1200), (900, 700)):
+        tampon = io.BytesIO()
+        sentetik_resim(rnd, boyut).save(tampon, 'JPEG', quality=90)
+        denetim.append(tampon.getvalue())
+    tampon = io.BytesIO()
+    sentetik_resim(rnd).convert('L').save(tampon, 'JPEG', quality=90)
+    denetim.append(tampon.getvalue())
+    fark = on_isleme_farki(denetim)
+    if fark > 0:
+        raise SystemExit(f"resim_hazirla eğitimdeki ön işlemeden farklı (en büyük fark {fark:.4f})")
+    print(f"ön işleme eğitimle aynı ({len(denetim)} resim)")
+
+    print(f"{'batch':>6}{'istek/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'ort. batch':>12}{'doluluk':>9}{'hata':>6}")
+    for batch_boyutu in args.batch:
+        sunucu, batcher = sunucu_olustur(model, siniflar, port=args.port, batch_boyutu=batch_boyutu,
+                                         bekleme_ms=args.bekleme_ms)
+        thread = threading.Thread(target=sunucu.serve_forever, daemon=True)
+        thread.start()
+        try:
+            gecikmeler, hata, gecen = yuk_uret(args.port, resimler, args.istemci, args.sure)
+        finally:
+            sunucu.shutdown()
+            sunucu.server_close()
+            batcher.durdur()
+        ozet = batcher.metrikler.ozet()
+        p50, p99 = (np.percentile(gecikmeler, [50, 99]) * 1e3) if len(gecikmeler) else (float('nan'),) * 2
+        print(f"{batch_boyutu:>6}{len(gecikmeler) / gecen:>10.1f}{p50:>10.0f}{p99:>10.0f}"
+              f"{ozet.get('ortalama_batch', 0):>12.1f}{ozet.get('batch_doluluk', 0):>9.0%}{hata:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,377 @@
+"""
+Toplamadan çıkarıma tüm hattın ağ gerektirmeyen, tekrarlanabilir
+benchmark'ı. Sabit tohumla sentetik bir veri_seti/ oluşturulur; her aşama
+bu klasörün kendi kopyası üzerinde ayrı bir süreçte çalışır, böylece
+aşamalar birbirinin önbelleklerinden etkilenmez. Modeller weights=None ile
+kurulur, arama motorlarının yerini yerel HTTP sunucusu alır.
+
+Aşamalar ve ölçümleri:
+  hash_index    HashIndex ilk oluşturma (tüm resimler hash'lenir) ve
+                değişiklik yokken açılış süresi
+  tekillestirme HammingIndex'e ekleme ve yakın kopya sorgusu hızı
+  filtre        ImageNet filtre modelinin resim/sn'si
+  toplama       ImageCollector'ın yerel sunucudan tek sınıf toplaması;
+                resim/sn ve aşama başına ortalama ms (metrics)
+  veri_yukleme  veri_seti_hazirla: önbellek oluşturma, hazır önbellekle
+                açılış ve önbelleksiz yükleme
+  girdi_hatti   keras, tfdata ve shard yükleyicileri: hazırlık süresi,
+                ilk ve ikinci epoch resim/sn
+  egitim_adimi  SE-ResNet50'nin donuk omurga ve fine-tuning adım süresi
+  cikarim       tek resim gecikmesi ve batch resim/sn
+
+Sonuçlar (ortam, commit ve ayarlarla birlikte) --cikti dosyasına JSON
+olarak yazılır. --karsilastir ile önceki bir sonuç dosyasına göre değişim
+tablosu basılır; adları _saniye veya _ms ile bitenlerde düşük, diğerlerinde
+(…_sn: saniye başına) yüksek değer iyidir. --esik'ten fazla kötüleşme
+varsa çıkış kodu 1 olur.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.uctan_uca --cikti sonuc.json
+    python -m benchmarks.uctan_uca --cikti yeni.json --karsilastir sonuc.json
+    python -m benchmarks.uctan_uca --karsilastir sonuc.json yeni.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+DEPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASAMALAR = ('hash_index', 'tekillestirme', 'filtre', 'toplama', 'veri_yukleme', 'girdi_hatti',
+            'egitim_adimi', 'cikarim')
+
+
+def _sure(fonksiyon, *args, **kwargs):
+    baslangic = time.perf_counter()
+    sonuc = fonksiyon(*args, **kwargs)
+    return time.perf_counter() - baslangic, sonuc
+
+
+def _siniflar(ayarlar):
+    from veri_isleme import SINIFLAR
+
+    return SINIFLAR[:ayarlar['sinif']]
+
+
+def asama_hash_index(ayarlar):
+    from hash_index import HashIndex
+
+    siniflar = _siniflar(ayarlar)
+    soguk, _ = _sure(lambda: HashIndex('veri_seti').uzlastir(siniflar))
+    sicak, _ = _sure(lambda: HashIndex('veri_seti').uzlastir(siniflar))
+    resim = sum(len(os.listdir(os.path.join('veri_seti', sinif))) for sinif in siniflar)
+    return {'olcumler': {'ilk_saniye': soguk, 'acilis_saniye': sicak, 'hash_resim_sn': resim / soguk},
+            'bilgi': {'resim': resim}}
+
+
+def asama_tekillestirme(ayarlar):
+    import random
+
+    from benchmarks.hamming_index import sorgular_olustur
+    from hash_index import HammingIndex, HASH_BITLERI
+
+    rnd = random.Random(ayarlar['tohum'])
+    hashler = [rnd.getrandbits(HASH_BITLERI) for _ in range(ayarlar['hash_sayisi'])]
+    sorgular = sorgular_olustur(hashler, ayarlar['sorgu_sayisi'], 4, rnd)
+    index = HammingIndex(4)
+    ekleme, _ = _sure(lambda: [index.ekle(h) for h in hashler])
+    sorgu, sonuclar = _sure(lambda: [index.yakin_var_mi(h) for h in sorgular])
+    return {'olcumler': {'ekleme_sn': len(hashler) / ekleme, 'sorgu_sn': len(sorgular) / sorgu},
+            'bilgi': {'hash': len(hashler), 'sorgu': len(sorgular), 'yakin_bulunan': sum(sonuclar)}}
+
+
+def asama_filtre(ayarlar):
+    from benchmarks.filtre import olc, resimleri_yukle
+    from filter_backends import KerasFiltresi
+
+    resimler = resimleri_yukle(os.path.join('veri_seti', _siniflar(ayarlar)[0]), ayarlar['resim'])
+    yukleme, filtre = _sure(KerasFiltresi, ayarlar['filtre_modeli'], weights=None)
+    _, hiz = olc(filtre, resimler, 50)
+    return {'olcumler': {'yukleme_saniye': yukleme, 'resim_sn': hiz},
+            'bilgi': {'model': ayarlar['filtre_modeli'], 'resim': len(resimler)}}
+
+
+def asama_toplama(ayarlar):
+    import numpy as np
+
+    import scraper
+    from benchmarks.yerel_sunucu import YerelResimSunucusu, yerel_motor
+    from label_filter import EtiketFiltresi
+
+    logging.disable(logging.INFO)
+    sunucu = YerelResimSunucusu(resim_sayisi=4 * ayarlar['toplama_hedefi'], boyut=(320, 240),
+                                tohum=ayarlar['tohum']).baslat()
+    for motor in scraper.MOTORLAR:
+        scraper.MOTORLAR[motor] = yerel_motor(sunucu)
+    collector = scraper.ImageCollector(save_folder='dataset', onbellek_kapasitesi=0,
+                                       metrik_dosyasi='metrikler.jsonl', metrik_araligi=3600)
+
+    def filtre(x):
+        # Parlak resimler 'kedi', diğerleri başka bir etiket (model yüklenmez)
+        tahminler = np.zeros((len(x), 1000), dtype=np.float32)
+        tahminler[np.arange(len(x)), np.where(x.mean(axis=(1, 2, 3)) > 120, 0, 1)] = 1
+        return tahminler
+
+    collector.filtre = filtre
+    collector.etiket_filtresi = EtiketFiltresi(list(collector.siniflar),
+                                               etiketler=['tabby cat'] + [f"etiket_{i}" for i in range(999)])
+    try:
+        sure, _ = _sure(collector.sinif_resimleri_topla, 'kedi', ayarlar['toplama_hedefi'])
+        ozet = collector.metrikler.ozet()
+    finally:
+        collector.kapat()
+        sunucu.kapat()
+    kabul = collector.collected_counts['kedi']
+    olcumler = {'sure_saniye': sure, 'resim_sn': kabul / sure}
+    olcumler.update({f"{asama}_ms": d['ort_ms'] for asama, d in ozet['asamalar'].items()})
+    return {'olcumler': olcumler, 'bilgi': {'kabul': kabul, 'sonuclar': ozet['sonuclar'].get('kedi', {})}}
+
+
+def asama_veri_yukleme(ayarlar):
+    from input_pipeline import manifest_listesi
+    from veri_isleme import veri_seti_hazirla
+
+    img_size = (ayarlar['img_size'],) * 2
+    # Bölme manifestosu (ve TensorFlow içe aktarımı) ölçüme girmez
+    manifest_listesi('veri_seti')
+    olustur, _ = _sure(veri_seti_hazirla, 'veri_seti', img_size, 'dataset_cache')
+    acilis, (X_train, X_test, *_) = _sure(veri_seti_hazirla, 'veri_seti', img_size, 'dataset_cache')
+    okuma, _ = _sure(lambda: [None for _ in X_train.batchler(32)])
+    onbelleksiz, _ = _sure(veri_seti_hazirla, 'veri_seti', img_size, None)
+    resim = len(X_train) + len(X_test)
+    return {'olcumler': {'onbellek_olusturma_saniye': olustur, 'onbellek_acilis_saniye': acilis,
+                         'onbellek_okuma_resim_sn': len(X_train) / okuma, 'onbelleksiz_saniye': onbelleksiz},
+            'bilgi': {'resim': resim}}
+
+
+def asama_girdi_hatti(ayarlar):
+    from input_pipeline import manifest_listesi
+    from veri_isleme import veri_cesitlendirme
+
+    img_size = (ayarlar['img_size'],) * 2
+    # Bölme manifestosu önceden oluşturulur; yükleyiciler aynı durumdan başlar
+    manifest_listesi('veri_seti')
+
+    olcumler, bilgi = {}, {}
+    for ad in ('keras', 'tfdata', 'shard'):
+        # Üç yükleyici de aynı resim boyutu ve batch ile kurulur
+        hazirlik, (egitim, _, _) = _sure(veri_cesitlendirme, ad, img_size, ayarlar['batch'])
+        olcumler[f"{ad}_hazirlik_saniye"] = hazirlik
+        for epoch in (1, 2):
+            baslangic = time.perf_counter()
+            if ad == 'keras':
+                resim = sum(len(egitim[i][0]) for i in range(len(egitim)))
+                egitim.on_epoch_end()
+            else:
+                resim = sum(int(x.shape[0]) for x, _ in egitim)
+            olcumler[f"{ad}_epoch{epoch}_resim_sn"] = resim / (time.perf_counter() - baslangic)
+        x = egitim[0][0] if ad == 'keras' else next(iter(egitim))[0]
+        bilgi[f"{ad}_batch_sekli"] = [int(boyut) for boyut in x.shape]
+    bilgi['egitim_resim'] = resim
+    return {'olcumler': olcumler, 'bilgi': bilgi}
+
+
+def _model(ayarlar):
+    from model import create_se_resnet, model_derle
+
+    model = create_se_resnet(sinif_sayisi=ayarlar['sinif'], input_shape=(ayarlar['img_size'],) * 2 + (3,),
+                             weights=None)
+    return model_derle(model, 1e-4)
+
+
+def _girdi(ayarlar, batch):
+    import numpy as np
+
+    rnd = np.random.default_rng(ayarlar['tohum'])
+    x = rnd.random((batch, ayarlar['img_size'], ayarlar['img_size'], 3), dtype=np.float32)
+    y = np.eye(ayarlar['sinif'], dtype=np.float32)[rnd.integers(0, ayarlar['sinif'], batch)]
+    return x, y
+
+
+def asama_egitim_adimi(ayarlar):
+    from model import model_derle
+
+    model = _model(ayarlar)
+    x, y = _girdi(ayarlar, ayarlar['batch'])
+    olcumler = {}
+    for asama in ('donuk', 'ince_ayar'):
+        if asama == 'ince_ayar':
+            for layer in model.layers[-50:]:
+                layer.trainable = True
+            model_derle(model, 1e-5)
+        # İlk iki adım izleme ve ısınmadır
+        for _ in range(2):
+            model.train_on_batch(x, y)
+        sure, _ = _sure(lambda: [model.train_on_batch(x, y) for _ in range(ayarlar['adim'])])
+        olcumler[f"{asama}_adim_ms"] = 1000 * sure / ayarlar['adim']
+        olcumler[f"{asama}_resim_sn"] = ayarlar['adim'] * ayarlar['batch'] / sure
+    return {'olcumler': olcumler, 'bilgi': {'batch': ayarlar['batch'], 'adim': ayarlar['adim']}}
+
+
+def asama_cikarim(ayarlar):
+    import numpy as np
+
+    model = _model(ayarlar)
+    x, _ = _girdi(ayarlar, 32)
+    for _ in range(2):
+        model(x[:1], training=False)
+        model(x, training=False)
+    gecikmeler = []
+    for _ in range(20):
+        sure, _ = _sure(model, x[:1], training=False)
+        gecikmeler.append(sure)
+    sure, _ = _sure(lambda: [model(x, training=False) for _ in range(3)])
+    return {'olcumler': {'tek_resim_ms': 1000 * float(np.median(gecikmeler)), 'batch_resim_sn': 3 * len(x) / sure},
+            'bilgi': {'batch': len(x)}}
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=DEPO, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _ortam():
+    ortam = {'python': platform.python_version(), 'platform': platform.platform(), 'cpu': os.cpu_count()}
+    try:
+        surumler = subprocess.run([sys.executable, '-c', 'import numpy, tensorflow; '
+                                   'print(numpy.__version__, tensorflow.__version__)'],
+                                  capture_output=True, text=True, check=True,
+                                  env=dict(os.environ, TF_CPP_MIN_LOG_LEVEL='3')).stdout.split()
+        ortam['numpy'], ortam['tensorflow'] = surumler[-2:]
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        pass
+    return ortam
+
+
+def fikstur_olustur(kok, ayarlar):
+    """Tüm aşamaların kopyaladığı sentetik veri_seti/"""
+    from benchmarks.sentetik import sentetik_resimler
+
+    hedef = os.path.join(kok, 'fikstur', 'veri_seti')
+    for i, sinif in enumerate(_siniflar(ayarlar)):
+        sentetik_resimler(os.path.join(hedef, sinif), ayarlar['resim'], boyut=(320, 240),
+                          tohum=ayarlar['tohum'] + i)
+    return hedef
+
+
+def asama_calistir(asama, kok, fikstur, ayarlar):
+    """Aşamayı kendi kopyasında ayrı bir süreçte çalıştır, sonucunu döndür"""
+    calisma = os.path.join(kok, asama)
+    shutil.copytree(fikstur, os.path.join(calisma, 'veri_seti'))
+    komut = [sys.executable, '-m', 'benchmarks.uctan_uca', '--asama', asama, '--ayarlar', json.dumps(ayarlar)]
+    ortam = dict(os.environ, PYTHONPATH=DEPO, TF_CPP_MIN_LOG_LEVEL='3')
+    sure, cikti = _sure(subprocess.run, komut, cwd=calisma, env=ortam, capture_output=True, text=True)
+    if cikti.returncode != 0:
+        return {'hata': cikti.stderr.strip().splitlines()[-1] if cikti.stderr.strip() else str(cikti.returncode),
+                'toplam_saniye': sure}
+    sonuc = json.loads(cikti.stdout.strip().splitlines()[-1])
+    sonuc['toplam_saniye'] = sure
+    return sonuc
+
+
+def daha_iyi_dusuk(ad):
+    return ad.endswith('_saniye') or ad.endswith('_ms')
+
+
+def karsilastir(onceki, sonraki, esik):
+    """Aşama ölçümlerinin değişim tablosunu bas; esik'ten fazla kötüleşenleri döndür"""
+    farkli = sorted(ad for ad in set(onceki['ayarlar']) | set(sonraki['ayarlar'])
+                    if onceki['ayarlar'].get(ad) != sonraki['ayarlar'].get(ad))
+    if farkli:
+        print(f"UYARI: ayarlar farklı, ölçümler doğrudan karşılaştırılamaz: {', '.join(farkli)}")
+    print(f"\n{'ölçüm':<42}{'önceki':>12}{'şimdi':>12}{'değişim':>10}")
+    gerileyenler = []
+    for asama, sonuc in sonraki['asamalar'].items():
+        eski = onceki['asamalar'].get(asama, {}).get('olcumler', {})
+        for ad, deger in sonuc.get('olcumler', {}).items():
+            if ad not in eski or not eski[ad]:
+                continue
+            degisim = deger / eski[ad] - 1
+            # Pozitif kotulesme: süre arttı veya hız düştü
+            kotulesme = degisim if daha_iyi_dusuk(ad) else -degisim
+            isaret = ''
+            if kotulesme > esik:
+                isaret = '  GERİLEME'
+                gerileyenler.append(f"{asama}.{ad}")
+            elif kotulesme < -esik:
+                isaret = '  iyileşme'
+            print(f"{asama + '.' + ad:<42}{eski[ad]:>12.4g}{deger:>12.4g}{degisim:>+10.1%}{isaret}")
+    print(f"\nönceki: {onceki.get('commit')}, şimdi: {sonraki.get('commit')}; "
+          f"{len(gerileyenler)} ölçüm %{100 * esik:.0f} eşiğinden fazla kötüleşti")
+    return gerileyenler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--asamalar', nargs='+', choices=ASAMALAR, default=list(ASAMALAR))
+    parser.add_argument('--sinif', type=int, default=4, help="sınıf sayısı (en fazla 10)")
+    parser.add_argument('--resim', type=int, default=60, help="sınıf başına sentetik resim")
+    parser.add_argument('--img-size', type=int, default=224)
+    parser.add_argument('--batch', type=int, default=8, help="girdi hattı ve eğitim adımı batch'i")
+    parser.add_argument('--adim', type=int, default=3, help="ölçülen eğitim adımı sayısı")
+    parser.add_argument('--filtre-modeli', default='mobilenetv3')
+    parser.add_argument('--toplama-hedefi', type=int, default=100)
+    parser.add_argument('--hash-sayisi', type=int, default=100000)
+    parser.add_argument('--sorgu-sayisi', type=int, default=20000)
+    parser.add_argument('--tohum', type=int, default=42)
+    parser.add_argument('--cikti', help="sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--karsilastir', nargs='+', metavar='JSON',
+                        help="önceki sonuç dosyası; ikinci dosya verilirse çalıştırmadan ikisini karşılaştır")
+    parser.add_argument('--esik', type=float, default=0.10, help="gerileme sayılan göreli kötüleşme")
+    parser.add_argument('--asama', choices=ASAMALAR, help=argparse.SUPPRESS)
+    parser.add_argument('--ayarlar', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.asama:
+        print(json.dumps(globals()[f"asama_{args.asama}"](json.loads(args.ayarlar)), ensure_ascii=False))
+        return
+
+    if args.karsilastir and len(args.karsilastir) > 2:
+        parser.error("--karsilastir en fazla iki dosya alır")
+    if args.karsilastir and len(args.karsilastir) == 2:
+        dosyalar = []
+        for yol in args.karsilastir:
+            with open(yol, 'r', encoding='utf-8') as f:
+                dosyalar.append(json.load(f))
+        sys.exit(1 if karsilastir(*dosyalar, args.esik) else 0)
+
+    ayarlar = {ad: getattr(args, ad) for ad in ('sinif', 'resim', 'img_size', 'batch', 'adim', 'filtre_modeli',
+                                                'toplama_hedefi', 'hash_sayisi', 'sorgu_sayisi', 'tohum')}
+    sonuclar = {'surum': 1, 'zaman': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': _commit(), 'ortam': _ortam(),
+                'ayarlar': ayarlar, 'asamalar': {}}
+    kok = tempfile.mkdtemp(prefix='uctan_uca_bench_')
+    try:
+        fikstur = fikstur_olustur(kok, ayarlar)
+        print(f"{ayarlar['sinif']} sınıf x {ayarlar['resim']} sentetik resim, commit {sonuclar['commit']}")
+        for asama in args.asamalar:
+            sonuc = asama_calistir(asama, kok, fikstur, ayarlar)
+            sonuclar['asamalar'][asama] = sonuc
+            if 'hata' in sonuc:
+                print(f"{asama:<14}HATA: {sonuc['hata']}")
+                continue
+            print(f"{asama:<14}" + ', '.join(f"{ad} {deger:.4g}" for ad, deger in sonuc['olcumler'].items()))
+    finally:
+        shutil.rmtree(kok)
+
+    if args.cikti:
+        with open(args.cikti, 'w', encoding='utf-8') as f:
+            json.dump(sonuclar, f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar: {args.cikti}")
+    hatalar = [asama for asama, sonuc in sonuclar['asamalar'].items() if 'hata' in sonuc]
+    gerileyenler = []
+    if args.karsilastir:
+        with open(args.karsilastir[0], 'r', encoding='utf-8') as f:
+            gerileyenler = karsilastir(json.load(f), sonuclar, args.esik)
+    sys.exit(1 if hatalar or gerileyenler else 0)
+
+
+if __name__ == '__main__':
+    main()
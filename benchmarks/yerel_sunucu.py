@@ -0,0 +1,162 @@
+"""
+İndirme benchmark'ları için ağ gerektirmeyen yerel HTTP sunucusu. Sentetik
+JPEG'leri keep-alive destekli HTTP/1.1 ile sunar; gerçek web'deki sorunlu
+yanıtları da taklit eder:
+
+    /resim/<i>.jpg     200 image/jpeg
+    /sayfa/<i>.jpg     200 text/html (resim yerine sayfa)
+    /buyuk/<i>.jpg     200 image/jpeg, Content-Length çok büyük
+    /kucuk/<i>.jpg     200 image/jpeg, birkaç yüz bayt
+    /kararsiz/<i>.jpg  ilk istekte 503, sonra resim
+    /yok/<i>.jpg       404
+
+gecikme_ms her yanıttan önce beklenir (uzak sunucu gecikmesi). Açılan TCP
+bağlantıları ve istekler sayılır. yerel_motor() scraper.MOTORLAR yerine
+kullanılabilecek, bu sunucunun URL'lerini döndüren bir arama motoru üretir.
+"""
+import io
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from icrawler.builtin import UrlListCrawler
+
+from benchmarks.sentetik import sentetik_resim
+
+YOLLAR = ('resim', 'sayfa', 'buyuk', 'kucuk', 'kararsiz', 'yok')
+
+
+class _Isleyici(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.kilit:
+            self.server.sayaclar['baglanti'] += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _yanit(self, durum, tur, govde, uzunluk=None):
+        self.send_response(durum)
+        self.send_header('Content-Type', tur)
+        self.send_header('Content-Length', str(len(govde) if uzunluk is None else uzunluk))
+        if uzunluk is not None:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(govde)
+
+    def do_GET(self):
+        sunucu = self.server
+        with sunucu.kilit:
+            sunucu.sayaclar['istek'] += 1
+        if sunucu.gecikme:
+            time.sleep(sunucu.gecikme)
+        try:
+            _, tur, dosya = self.path.split('/')
+            i = int(dosya.split('.')[0])
+            resim = sunucu.resimler[i % len(sunucu.resimler)]
+        except ValueError:
+            tur, resim = 'yok', b''
+
+        if tur == 'resim':
+            self._yanit(200, 'image/jpeg', resim)
+        elif tur == 'sayfa':
+            self._yanit(200, 'text/html; charset=utf-8', b'<html><body>resim degil</body></html>')
+        elif tur == 'buyuk':
+            # Başlık 500 MB der; gövdenin yalnızca başı gönderilip bağlantı kapatılır
+            self._yanit(200, 'image/jpeg', resim[:1024], uzunluk=500 * 2**20)
+        elif tur == 'kucuk':
+            self._yanit(200, 'image/jpeg', resim[:300])
+        elif tur == 'kararsiz':
+            with sunucu.kilit:
+                ilk = self.path not in sunucu.gorulenler
+                sunucu.gorulenler.add(self.path)
+            if ilk:
+                self._yanit(503, 'text/plain', b'gecici hata')
+            else:
+                self._yanit(200, 'image/jpeg', resim)
+        else:
+            self._yanit(404, 'text/plain', b'yok')
+
+
+class _Sunucu(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # İstemcinin erken kapattığı bağlantılar (reddedilen indirmeler) beklenen durum
+        pass
+
+
+class YerelResimSunucusu:
+    def __init__(self, resim_sayisi=50, boyut=(640, 480), gecikme_ms=0, tohum=0):
+        rnd = np.random.default_rng(tohum)
+        resimler = []
+        for _ in range(resim_sayisi):
+            tampon = io.BytesIO()
+            sentetik_resim(rnd, boyut).save(tampon, 'JPEG', quality=90)
+            resimler.append(tampon.getvalue())
+        self._sunucu = _Sunucu(('127.0.0.1', 0), _Isleyici)
+        self._sunucu.resimler = resimler
+        self._sunucu.gecikme = gecikme_ms / 1000
+        self._sunucu.kilit = threading.Lock()
+        self._sunucu.gorulenler = set()
+        self.sayaclari_sifirla()
+
+    @property
+    def adres(self):
+        return f"http://127.0.0.1:{self._sunucu.server_address[1]}"
+
+    @property
+    def sayaclar(self):
+        return self._sunucu.sayaclar
+
+    def sayaclari_sifirla(self):
+        self._sunucu.sayaclar = {'baglanti': 0, 'istek': 0}
+        self._sunucu.gorulenler.clear()
+
+    def url(self, tur, i):
+        return f"{self.adres}/{tur}/{i}.jpg"
+
+    def baslat(self):
+        threading.Thread(target=self._sunucu.serve_forever, daemon=True).start()
+        return self
+
+    def kapat(self):
+        self._sunucu.shutdown()
+        self._sunucu.server_close()
+
+
+def yerel_motor(sunucu, terim_basina=30, sorunlu_sikligi=10, populer=0, populer_orani=0.5, ilk=0):
+    """
+    Her aramada sunucudan sıradaki terim_basina URL'yi (ilk'ten başlayarak)
+    döndüren crawler sınıfı; her sorunlu_sikligi URL'den biri HTML veya
+    503-sonra-resim olur.
+    populer > 0 ise URL'lerin populer_orani kadarı, farklı aramalarda ve
+    motorlarda tekrar tekrar dönen populer adet sabit URL'den seçilir.
+    """
+    sayac = [ilk]
+    kilit = threading.Lock()
+    rnd = random.Random(0)
+
+    class YerelMotor(UrlListCrawler):
+        def crawl(self, keyword, max_num=1000, **kwargs):
+            urller = []
+            with kilit:
+                for _ in range(terim_basina):
+                    if populer and rnd.random() < populer_orani:
+                        urller.append(sunucu.url('resim', 10**6 + rnd.randrange(populer)))
+                        continue
+                    sayac[0] += 1
+                    sira = sayac[0]
+                    if sira % sorunlu_sikligi == 0:
+                        tur = 'sayfa' if sira % (2 * sorunlu_sikligi) == 0 else 'kararsiz'
+                    else:
+                        tur = 'resim'
+                    urller.append(sunucu.url(tur, sira))
+            super().crawl(urller, max_num=max_num)
+
+    return YerelMotor
@@ -0,0 +1,103 @@
+"""
+10 sınıfın sırayla (eski tum_siniflari_topla: sınıf başına 5 eşzamanlı
+arama) ve aynı anda (siniflari_topla: ortak hat, genel arama bütçesi,
+verime göre terim/motor seçimi) toplanmasını yerel HTTP sunucusu üzerinde
+karşılaştırır. Her mod ayrı bir süreçte boş bir çalışma klasöründe çalışır.
+
+Sahte arama motorlarının kalitesi farklıdır: google URL'lerinin 1/20'si,
+bing'in 1/4'ü, baidu'nun 1/2'si sorunludur (HTML veya 503). Sınıflandırıcı
+her resmi piksellerinden türetilen sabit bir sınıfa atar (~%10 kabul; ağ
+ve model gerekmez).
+
+Raporlanan: süre, toplanan resim, URL sayısı ve motorlara giden URL payı.
+
+Çalıştırma (depo kökünden):
+    python -m benchmarks.zamanlayici --hedef 20
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+DEPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MOTOR_KALITESI = {'google': 20, 'bing': 4, 'baidu': 2}
+
+
+def topla(mod, hedef, eszamanli_arama, gecikme_ms):
+    """Çalışma klasöründe tüm sınıfları topla, ölçümleri döndür (alt süreçte çalışır)"""
+    import numpy as np
+
+    import scraper
+    from benchmarks.yerel_sunucu import YerelResimSunucusu, yerel_motor
+    from label_filter import EtiketFiltresi, SINIF_ETIKETLERI
+
+    logging.disable(logging.INFO)
+    sunucu = YerelResimSunucusu(resim_sayisi=6000, boyut=(320, 240), gecikme_ms=gecikme_ms).baslat()
+    for i, (motor, siklik) in enumerate(MOTOR_KALITESI.items()):
+        scraper.MOTORLAR[motor] = yerel_motor(sunucu, sorunlu_sikligi=siklik, ilk=i * 10**5)
+
+    collector = scraper.ImageCollector(save_folder='dataset', eszamanli_arama=eszamanli_arama)
+    siniflar = list(collector.siniflar)
+
+    def filtre(x):
+        # Her resim piksellerinden türetilen tek bir sınıfın ilk etiketine atanır
+        tahminler = np.zeros((len(x), 1000), dtype=np.float32)
+        tahminler[np.arange(len(x)), x[:, ::16, ::16].astype(np.int64).sum(axis=(1, 2, 3)) % len(siniflar)] = 1
+        return tahminler
+
+    etiketler = [SINIF_ETIKETLERI[sinif][0] for sinif in siniflar]
+    etiketler += [f"etiket_{i}" for i in range(1000 - len(etiketler))]
+    collector.filtre = filtre
+    collector.etiket_filtresi = EtiketFiltresi(siniflar, etiketler=etiketler)
+    assert (collector.etiket_filtresi.maskeler[:, :len(siniflar)] == np.eye(len(siniflar), dtype=bool)).all()
+
+    baslangic = time.perf_counter()
+    try:
+        if mod == 'sirali':
+            for sinif in siniflar:
+                collector.siniflari_topla({sinif: hedef}, eszamanli_arama=5)
+        else:
+            collector.siniflari_topla({sinif: hedef for sinif in siniflar}, eszamanli_arama)
+    finally:
+        collector.kapat()
+        sunucu.kapat()
+    return {
+        'sure': time.perf_counter() - baslangic,
+        'toplanan': sum(collector.collected_counts.values()),
+        'motorlar': collector._planlayici._motorlar,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hedef', type=int, default=20, help="sınıf başına hedef")
+    parser.add_argument('--eszamanli-arama', type=int, default=8)
+    parser.add_argument('--gecikme-ms', type=float, default=20)
+    parser.add_argument('--mod', choices=['sirali', 'eszamanli'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mod:
+        print(json.dumps(topla(args.mod, args.hedef, args.eszamanli_arama, args.gecikme_ms)))
+        return
+
+    print(f"10 sınıf x {args.hedef} resim, eşzamanlı arama bütçesi {args.eszamanli_arama}")
+    print(f"{'mod':<11}{'süre s':>8}{'toplanan':>10}{'URL':>7}  URL payı (kaydedilen/URL)")
+    ortam = dict(os.environ, PYTHONPATH=DEPO, TF_CPP_MIN_LOG_LEVEL='3')
+    for mod in ('sirali', 'eszamanli'):
+        kok = tempfile.mkdtemp(prefix=f'zamanlayici_bench_{mod}_')
+        komut = [sys.executable, '-m', 'benchmarks.zamanlayici', '--mod', mod, '--hedef', str(args.hedef),
+                 '--eszamanli-arama', str(args.eszamanli_arama), '--gecikme-ms', str(args.gecikme_ms)]
+        cikti = subprocess.run(komut, cwd=kok, env=ortam, capture_output=True, text=True, check=True).stdout
+        s = json.loads(cikti.strip().splitlines()[-1])
+        toplam_url = sum(url for url, _ in s['motorlar'].values())
+        paylar = '  '.join(f"{motor} {url / toplam_url:.0%} ({kaydedilen}/{url})"
+                           for motor, (url, kaydedilen) in s['motorlar'].items())
+        print(f"{mod:<11}{s['sure']:>8.1f}{s['toplanan']:>10}{toplam_url:>7}  {paylar}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import os
+import json
+import hashlib
+
+import numpy as np
+from tensorflow.keras.preprocessing.image import load_img, img_to_array
+from tensorflow.keras.utils import Sequence, to_categorical
+
+RESIM_UZANTILARI = ('.jpg', '.jpeg', '.png')
+
+
+def kaynak_dosyalari(base_dir, siniflar):
+    """(sınıf indeksi, yol, boyut, mtime) listesi; sıralı olduğu için imza kararlıdır"""
+    dosyalar = []
+    for i, sinif in enumerate(siniflar):
+        sinif_dir = os.path.join(base_dir, sinif)
+        if not os.path.isdir(sinif_dir):
+            continue
+        with os.scandir(sinif_dir) as girdiler:
+            for girdi in sorted(girdiler, key=lambda g: g.name):
+                if girdi.name.lower().endswith(RESIM_UZANTILARI) and girdi.is_file():
+                    st = girdi.stat()
+                    dosyalar.append((i, girdi.path, st.st_size, st.st_mtime_ns))
+    return dosyalar
+
+
+def kaynak_imzasi(dosyalar, img_size):
+    h = hashlib.sha256(json.dumps(list(img_size)).encode())
+    for i, yol, boyut, mtime in dosyalar:
+        h.update(f"{i}|{yol}|{boyut}|{mtime}\n".encode())
+    return h.hexdigest()
+
+
+def onbellek_olustur(base_dir, onbellek_dizini, siniflar, img_size=(224, 224), dosyalar=None):
+    """
+    dataset/ klasörünü tek seferde uint8 bir np.memmap dosyasına (X.dat),
+    etiketleri y.npy'ye ve dosya listesini manifest.json'a yazar.
+    """
+    os.makedirs(onbellek_dizini, exist_ok=True)
+    if dosyalar is None:
+        dosyalar = kaynak_dosyalari(base_dir, siniflar)
+    sekil = (len(dosyalar),) + tuple(img_size) + (3,)
+
+    x_yolu = os.path.join(onbellek_dizini, 'X.dat')
+    X = np.memmap(x_yolu + '.tmp', dtype=np.uint8, mode='w+', shape=sekil) if dosyalar else None
+    y = []
+    kaynaklar = []
+    for i, yol, _, _ in dosyalar:
+        try:
+            img = load_img(yol, target_size=img_size)
+        except Exception:
+            continue
+        X[len(y)] = np.asarray(img, dtype=np.uint8)
+        y.append(i)
+        kaynaklar.append(os.path.relpath(yol, base_dir))
+    if X is not None:
+        X.flush()
+        del X
+        os.replace(x_yolu + '.tmp', x_yolu)
+    np.save(os.path.join(onbellek_dizini, 'y.npy'), np.array(y, dtype=np.int64))
+
+    manifest = {
+        'imza': kaynak_imzasi(dosyalar, img_size),
+        'siniflar': list(siniflar),
+        'img_size': list(img_size),
+        'sayi': len(y),
+        'dosyalar': kaynaklar
+    }
+    # Manifest en son yazılır; yarım kalan bir oluşturma bir sonraki açılışta yeniden yapılır
+    with open(os.path.join(onbellek_dizini, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def onbellek_ac(base_dir, onbellek_dizini, siniflar, img_size=(224, 224)):
+    """
+    Önbelleği kopyalamadan (salt okunur memmap olarak) aç. Kaynak klasör
+    değiştiyse veya önbellek yoksa önce yeniden oluşturur. (X, y) döndürür.
+    """
+    dosyalar = kaynak_dosyalari(base_dir, siniflar)
+    imza = kaynak_imzasi(dosyalar, img_size)
+    manifest_yolu = os.path.join(onbellek_dizini, 'manifest.json')
+    manifest = None
+    if os.path.exists(manifest_yolu):
+        with open(manifest_yolu, encoding='utf-8') as f:
+            manifest = json.load(f)
+    if manifest is None or manifest['imza'] != imza or manifest['siniflar'] != list(siniflar):
+        print("Veri seti önbelleği oluşturuluyor...")
+        manifest = onbellek_olustur(base_dir, onbellek_dizini, siniflar, img_size, dosyalar)
+
+    y = np.load(os.path.join(onbellek_dizini, 'y.npy'))
+    if manifest['sayi'] == 0:
+        return np.zeros((0,) + tuple(img_size) + (3,), dtype=np.uint8), y
+    X = np.memmap(os.path.join(onbellek_dizini, 'X.dat'), dtype=np.uint8, mode='r',
+                  shape=(manifest['sayi'],) + tuple(img_size) + (3,))
+    return X, y
+
+
+def onbellek_dosyalari(onbellek_dizini):
+    """Önbellek satırlarının kaynak dosyaları (base_dir'e göreli, satır sırasıyla)"""
+    with open(os.path.join(onbellek_dizini, 'manifest.json'), encoding='utf-8') as f:
+        return json.load(f)['dosyalar']
+
+
+class OnbellekGorunumu:
+    """
+    uint8 memmap'in bir indeks alt kümesine bakan, okunduğu anda [0, 1]
+    aralığına normalize eden görünüm. Diziyi belleğe kopyalamaz.
+    """
+
+    def __init__(self, X, indeksler):
+        self.X = X
+        self.indeksler = np.asarray(indeksler)
+
+    @property
+    def shape(self):
+        return (len(self.indeksler),) + self.X.shape[1:]
+
+    def __len__(self):
+        return len(self.indeksler)
+
+    def __getitem__(self, anahtar):
+        indeks = self.indeksler[anahtar]
+        if np.ndim(indeks) == 0:
+            return self.X[indeks].astype(np.float32) / 255.0
+        # memmap'ten sıralı okumak diskte daha hızlıdır, sonra istenen sıraya dön
+        sira = np.argsort(indeks)
+        batch = np.empty((len(indeks),) + self.X.shape[1:], dtype=np.float32)
+        batch[sira] = self.X[indeks[sira]]
+        batch /= 255.0
+        return batch
+
+    def batchler(self, batch_size=32):
+        for i in range(0, len(self), batch_size):
+            yield self[i:i + batch_size]
+
+
+class DosyaDizisi(Sequence):
+    """
+    Dosya yolları ve etiketlerinden, ImageDataGenerator'ın artırma ve rescale
+    ayarlarıyla batch üreten Keras dizisi (flow_from_directory'nin dosya
+    listesi alan karşılığı)
+    """
+
+    def __init__(self, yollar, etiketler, sinif_sayisi, datagen, img_size=(224, 224), batch_size=32,
+                 shuffle=True, **kwargs):
+        super().__init__(**kwargs)
+        self.yollar = list(yollar)
+        self.y = to_categorical(np.asarray(etiketler, dtype=np.int64), sinif_sayisi)
+        self.datagen = datagen
+        self.img_size = tuple(img_size)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.sira = np.arange(len(self.yollar))
+        self.on_epoch_end()
+
+    def __len__(self):
+        return int(np.ceil(len(self.yollar) / self.batch_size))
+
+    def __getitem__(self, idx):
+        secilen = self.sira[idx * self.batch_size:(idx + 1) * self.batch_size]
+        batch = np.empty((len(secilen),) + self.img_size + (3,), dtype=np.float32)
+        for i, j in enumerate(secilen):
+            x = img_to_array(load_img(self.yollar[j], target_size=self.img_size))
+            batch[i] = self.datagen.standardize(self.datagen.random_transform(x))
+        return batch, self.y[secilen]
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            np.random.shuffle(self.sira)
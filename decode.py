@@ -0,0 +1,129 @@
+import io
+import os
+import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from PIL import Image
+
+from hash_index import phash_hesapla, taslak_coz
+
+GIRDI_BOYUTU = (224, 224)
+_SLOT_SEKLI = GIRDI_BOYUTU + (3,)
+
+# Çalışan süreçte paylaşımlı belleğe bağlanan slot dizisi
+_paylasimli = None
+_slotlar = None
+
+
+def _paylasimli_bellege_baglan(ad):
+    try:
+        return shared_memory.SharedMemory(name=ad, track=False)
+    except TypeError:
+        # Python < 3.13: çalışanlar ana sürecin resource_tracker'ını paylaşır,
+        # belleği ana süreç kapat() içinde siler
+        return shared_memory.SharedMemory(name=ad)
+
+
+def _ebeveyni_izle(ebeveyn):
+    # Ana süreç çökerse (kapat() çağrılamadan) havuz süreçleri öksüz kalmasın
+    while os.getppid() == ebeveyn:
+        time.sleep(1)
+    os._exit(0)
+
+
+def _calisan_baslat(shm_adi, slot_sayisi):
+    global _paylasimli, _slotlar
+    _paylasimli = _paylasimli_bellege_baglan(shm_adi)
+    _slotlar = np.ndarray((slot_sayisi,) + _SLOT_SEKLI, dtype=np.uint8, buffer=_paylasimli.buf)
+    threading.Thread(target=_ebeveyni_izle, args=(os.getppid(),), daemon=True).start()
+
+
+def resim_coz(kaynak, slot, min_boyut=150):
+    """
+    Çalışan süreçte resmi (dosya yolu veya indirilmiş baytlar) çöz, phash'ini
+    hesapla ve 224x224 uint8 halini paylaşımlı bellekteki slota yaz.
+    (boyut, phash, {'cozme': sn, 'phash': sn}) veya küçük resimler için None
+    döndürür.
+    """
+    baslangic = time.perf_counter()
+    if isinstance(kaynak, bytes):
+        kaynak = io.BytesIO(kaynak)
+    with Image.open(kaynak) as img:
+        boyut = img.size
+        if boyut[0] < min_boyut or boyut[1] < min_boyut:
+            return None
+        # JPEG'lerde tam çözünürlüklü çözmeyi atla, hedefe yakın ölçekte çöz;
+        # phash HashIndex ile aynı çözmeden hesaplanır
+        img = taslak_coz(img)
+        phash_baslangic = time.perf_counter()
+        phash = phash_hesapla(img)
+        phash_bitis = time.perf_counter()
+        _slotlar[slot] = np.asarray(img.resize(GIRDI_BOYUTU))
+    sureler = {'cozme': time.perf_counter() - baslangic - (phash_bitis - phash_baslangic),
+               'phash': phash_bitis - phash_baslangic}
+    return boyut, phash, sureler
+
+
+class ParalelCozucu:
+    """
+    Resim çözme ve ön işlemeyi süreç havuzunda yapar. Çözülen resimler
+    paylaşımlı bellekteki sabit boyutlu slotlara yazılır; böylece ana sürece
+    yalnızca slot numarası, boyut ve phash kopyalanır. sure_bildir verilirse
+    her resmin çalışan süreçteki çözme ve phash süreleri ona iletilir.
+    """
+
+    def __init__(self, islem_sayisi=None, slot_sayisi=256, sure_bildir=None):
+        self.islem_sayisi = islem_sayisi or os.cpu_count()
+        self.slot_sayisi = slot_sayisi
+        self.sure_bildir = sure_bildir
+        self._paylasimli = shared_memory.SharedMemory(
+            create=True, size=slot_sayisi * int(np.prod(_SLOT_SEKLI)))
+        self.slotlar = np.ndarray((slot_sayisi,) + _SLOT_SEKLI, dtype=np.uint8,
+                                  buffer=self._paylasimli.buf)
+        self._bos_slotlar = queue.Queue()
+        for slot in range(slot_sayisi):
+            self._bos_slotlar.put(slot)
+        # TensorFlow yüklü ana süreçten fork etmek güvenli değil
+        self._havuz = ProcessPoolExecutor(
+            max_workers=self.islem_sayisi,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_calisan_baslat,
+            initargs=(self._paylasimli.name, slot_sayisi)
+        )
+
+    def coz(self, kaynak):
+        """
+        Resmi (dosya yolu veya baytlar) bir çalışan süreçte çöz. (slot, boyut,
+        phash) ya da resim reddedildiyse None döndürür. Slot, slot_birak
+        çağrılana kadar ayrılmış kalır.
+        """
+        slot = self._bos_slotlar.get()
+        try:
+            sonuc = self._havuz.submit(resim_coz, kaynak, slot).result()
+        except BaseException:
+            self.slot_birak(slot)
+            raise
+        if sonuc is None:
+            self.slot_birak(slot)
+            return None
+        boyut, phash, sureler = sonuc
+        if self.sure_bildir is not None:
+            self.sure_bildir(**sureler)
+        return slot, boyut, phash
+
+    def slot_birak(self, slot):
+        self._bos_slotlar.put(slot)
+
+    def bos_slot_sayisi(self):
+        return self._bos_slotlar.qsize()
+
+    def kapat(self):
+        self._havuz.shutdown(wait=True, cancel_futures=True)
+        self.slotlar = None
+        self._paylasimli.close()
+        self._paylasimli.unlink()
@@ -0,0 +1,197 @@
+import os
+import json
+import time
+import argparse
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.preprocessing.image import load_img, img_to_array
+
+from input_pipeline import dosya_listesi, manifest_listesi
+from sunucu import sinif_isimleri
+
+IMG_SIZE = (224, 224)
+NICEMLEMELER = ('yok', 'dinamik', 'int8')
+
+
+def resim_yukle(yol, img_size=IMG_SIZE):
+    """Eğitimdeki rescale=1/255 ön işlemesiyle aynı"""
+    return img_to_array(load_img(yol, target_size=img_size)) / 255.0
+
+
+def kalibrasyon_ornekleri(veri_yolu='dataset', ornek_sayisi=200, img_size=IMG_SIZE, tohum=42):
+    """Her sınıftan eşit sayıda rastgele resim seçip int8 kalibrasyonu için döndür"""
+    _, egitim, _ = dosya_listesi(veri_yolu)
+    yollar, etiketler = np.array(egitim[0]), np.array(egitim[1])
+    if not len(yollar):
+        raise ValueError(f"'{veri_yolu}' klasöründe kalibrasyon için resim bulunamadı!")
+    rnd = np.random.default_rng(tohum)
+    sinif_basina = max(1, ornek_sayisi // len(np.unique(etiketler)))
+    secilen = []
+    for etiket in np.unique(etiketler):
+        indeksler = np.flatnonzero(etiketler == etiket)
+        secilen.extend(rnd.choice(indeksler, min(sinif_basina, len(indeksler)), replace=False))
+    return np.stack([resim_yukle(yollar[i], img_size) for i in sorted(secilen)]).astype(np.float32)
+
+
+def savedmodel_aktar(model, yol):
+    """Modeli tek 'serve' imzalı, değişkenleri gömülü bir SavedModel olarak dışa aktar"""
+    model.export(yol, verbose=False)
+    return yol
+
+
+def tflite_aktar(savedmodel_yolu, yol, nicemleme='yok', kalibrasyon=None):
+    """
+    SavedModel'i TFLite'a çevir.
+    nicemleme='dinamik': ağırlıklar int8, aktivasyonlar çalışma anında float.
+    nicemleme='int8': kalibrasyon örnekleriyle tam tamsayı (girdi/çıktı dahil int8).
+    """
+    if nicemleme not in NICEMLEMELER:
+        raise ValueError(f"Bilinmeyen nicemleme: {nicemleme}")
+    converter = tf.lite.TFLiteConverter.from_saved_model(savedmodel_yolu)
+    if nicemleme != 'yok':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if nicemleme == 'int8':
+        if kalibrasyon is None or not len(kalibrasyon):
+            raise ValueError("int8 nicemleme için kalibrasyon örnekleri gerekli")
+
+        def temsili_veri():
+            for x in kalibrasyon:
+                yield [x[None]]
+
+        converter.representative_dataset = temsili_veri
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+    with open(yol, 'wb') as f:
+        f.write(converter.convert())
+    return yol
+
+
+class TFLiteTahminci:
+    """TFLite modelini Keras modeli gibi (float girdi -> float olasılık) çağırılabilir yapar"""
+
+    def __init__(self, yol, is_parcacigi=None):
+        self.interpreter = tf.lite.Interpreter(model_path=yol, num_threads=is_parcacigi)
+        self.girdi = self.interpreter.get_input_details()[0]
+        self.cikti = self.interpreter.get_output_details()[0]
+        self._batch = None
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        if self._batch != len(x):
+            self.interpreter.resize_tensor_input(self.girdi['index'], x.shape)
+            self.interpreter.allocate_tensors()
+            self._batch = len(x)
+        olcek, sifir = self.girdi['quantization']
+        if self.girdi['dtype'] != np.float32:
+            bilgi = np.iinfo(self.girdi['dtype'])
+            x = np.clip(np.round(x / olcek + sifir), bilgi.min, bilgi.max).astype(self.girdi['dtype'])
+        self.interpreter.set_tensor(self.girdi['index'], x)
+        self.interpreter.invoke()
+        y = self.interpreter.get_tensor(self.cikti['index'])
+        olcek, sifir = self.cikti['quantization']
+        if self.cikti['dtype'] != np.float32:
+            y = (y.astype(np.float32) - sifir) * olcek
+        return y
+
+
+def tahminci_yukle(yol):
+    """.h5, SavedModel klasörü veya .tflite dosyasından numpy -> numpy tahmin fonksiyonu"""
+    if yol.endswith('.tflite'):
+        return TFLiteTahminci(yol)
+    if os.path.isdir(yol):
+        # Değişkenler yüklenen nesneye bağlı; nesne silinirse imza çalışmaz
+        yuklenen = tf.saved_model.load(yol)
+        return lambda x: yuklenen.serve(tf.constant(x, dtype=tf.float32)).numpy()
+    model = tf.keras.models.load_model(yol, compile=False)
+    return lambda x: model(x, training=False).numpy()
+
+
+def degerlendir(tahmin_et, X, y, batch_size=32, gecikme_tekrari=50):
+    """(doğruluk, batch=1 için ortalama gecikme ms, tahminler) döndür"""
+    tahminler = np.concatenate([np.argmax(tahmin_et(X[i:i + batch_size]), axis=1)
+                                for i in range(0, len(X), batch_size)])
+    dogruluk = float(np.mean(tahminler == y)) if len(y) else float('nan')
+
+    tek = X[:1]
+    tahmin_et(tek)  # ısınma
+    baslangic = time.perf_counter()
+    for _ in range(gecikme_tekrari):
+        tahmin_et(tek)
+    gecikme = (time.perf_counter() - baslangic) / gecikme_tekrari * 1e3
+    return dogruluk, gecikme, tahminler
+
+
+def boyut_mb(yol):
+    if os.path.isdir(yol):
+        return sum(os.path.getsize(os.path.join(k, d)) for k, _, ds in os.walk(yol) for d in ds) / 2**20
+    return os.path.getsize(yol) / 2**20
+
+
+def karsilastirma_raporu(h5_yolu, aktarilanlar, veri_yolu='veri_seti'):
+    """
+    .h5 modelini ve dışa aktarılan her modeli veri_yolu'nun test bölümünde
+    doğruluk, .h5 ile tahmin uyumu, batch=1 gecikmesi ve dosya boyutuyla karşılaştır.
+    """
+    # Etiketler modelin çıktı sütunlarının sırasında (model yanındaki sınıf dosyası)
+    _, _, _, test = manifest_listesi(veri_yolu, siniflar=sinif_isimleri(veri_yolu, h5_yolu))
+    if not test[0]:
+        raise ValueError(f"'{veri_yolu}' klasörünün test bölümünde resim bulunamadı!")
+    X = np.stack([resim_yukle(yol) for yol in test[0]]).astype(np.float32)
+    y = np.array(test[1])
+
+    rapor = []
+    referans = None
+    for ad, yol in [('keras_h5', h5_yolu)] + list(aktarilanlar.items()):
+        dogruluk, gecikme, tahminler = degerlendir(tahminci_yukle(yol), X, y)
+        if referans is None:
+            referans = tahminler
+        rapor.append({
+            'model': ad,
+            'yol': yol,
+            'dogruluk': dogruluk,
+            'h5_uyumu': float(np.mean(tahminler == referans)),
+            'gecikme_ms': gecikme,
+            'boyut_mb': boyut_mb(yol),
+        })
+    return rapor
+
+
+def disa_aktar(h5_yolu='final_senet_model.h5', cikti_dizini='export', kalibrasyon_yolu='dataset',
+               ornek_sayisi=200):
+    """SavedModel + TFLite (float, dinamik, int8) üret; {ad: yol} döndür"""
+    os.makedirs(cikti_dizini, exist_ok=True)
+    model = tf.keras.models.load_model(h5_yolu, compile=False)
+    savedmodel_yolu = savedmodel_aktar(model, os.path.join(cikti_dizini, 'savedmodel'))
+    aktarilanlar = {'savedmodel': savedmodel_yolu}
+    for nicemleme in NICEMLEMELER:
+        kalibrasyon = None
+        if nicemleme == 'int8':
+            print(f"int8 kalibrasyonu için '{kalibrasyon_yolu}' klasöründen {ornek_sayisi} resim okunuyor...")
+            kalibrasyon = kalibrasyon_ornekleri(kalibrasyon_yolu, ornek_sayisi)
+        yol = os.path.join(cikti_dizini, f"model_{nicemleme}.tflite")
+        aktarilanlar[f"tflite_{nicemleme}"] = tflite_aktar(savedmodel_yolu, yol, nicemleme, kalibrasyon)
+        print(f"{yol} oluşturuldu")
+    return aktarilanlar
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Eğitilmiş modeli SavedModel ve nicemlenmiş TFLite olarak dışa aktar")
+    parser.add_argument('--model', default='final_senet_model.h5')
+    parser.add_argument('--cikti', default='export')
+    parser.add_argument('--kalibrasyon', default='dataset', help="int8 kalibrasyon örneklerinin alınacağı klasör")
+    parser.add_argument('--ornek-sayisi', type=int, default=200)
+    parser.add_argument('--veri-yolu', default='veri_seti', help="test bölümü ve sınıf sırasının okunacağı klasör")
+    parser.add_argument('--rapor-yok', action='store_true', help="karşılaştırma raporunu atla")
+    args = parser.parse_args()
+
+    aktarilanlar = disa_aktar(args.model, args.cikti, args.kalibrasyon, args.ornek_sayisi)
+    if not args.rapor_yok:
+        rapor = karsilastirma_raporu(args.model, aktarilanlar, args.veri_yolu)
+        with open(os.path.join(args.cikti, 'rapor.json'), 'w', encoding='utf-8') as f:
+            json.dump(rapor, f, indent=2, ensure_ascii=False)
+        print(f"\n{'model':<16}{'doğruluk':>10}{'h5 uyumu':>10}{'ms/resim':>10}{'MB':>8}")
+        for satir in rapor:
+            print(f"{satir['model']:<16}{satir['dogruluk']:>10.3f}{satir['h5_uyumu']:>10.3f}"
+                  f"{satir['gecikme_ms']:>10.1f}{satir['boyut_mb']:>8.1f}")
@@ -0,0 +1,358 @@
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import subprocess
+
+import numpy as np
+import tensorflow as tf
+
+from input_pipeline import artirma_katmanlari
+from tfrecord_shards import bolum_sayisi, indeks_oku, shard_veri_seti
+
+DEPO = os.path.dirname(os.path.abspath(__file__))
+TABAN_BATCH = 32
+# Kaldığı yerden devam için kayda yazılan geri çağırma (EarlyStopping,
+# ReduceLROnPlateau, ModelCheckpoint) sayaçları
+GERI_CAGIRMA_ALANLARI = ('wait', 'best', 'best_epoch', 'stopped_epoch', 'cooldown_counter')
+
+
+def ogrenme_orani_olcekle(taban_orani, global_batch, taban_batch=TABAN_BATCH):
+    """Doğrusal ölçekleme: global batch taban_batch'in k katıysa öğrenme oranı da k katı"""
+    return taban_orani * global_batch / taban_batch
+
+
+def strateji_olustur():
+    """
+    TF_CONFIG'e göre MultiWorkerMirroredStrategy (TF_CONFIG yoksa tek çalışan).
+    Başka bir TensorFlow işleminden önce çağrılmalıdır.
+    """
+    iletisim = tf.distribute.experimental.CommunicationOptions(
+        implementation=tf.distribute.experimental.CommunicationImplementation.RING)
+    return tf.distribute.MultiWorkerMirroredStrategy(communication_options=iletisim)
+
+
+def _geri_cagirma_durumu(callbacks, en_iyi):
+    """Geri çağırma sayaçlarını JSON'a, EarlyStopping'in en iyi ağırlıklarını en_iyi değişkenlerine yaz"""
+    durumlar = []
+    for callback in callbacks:
+        durum = {alan: getattr(callback, alan) for alan in GERI_CAGIRMA_ALANLARI if hasattr(callback, alan)}
+        durum = {alan: deger.item() if hasattr(deger, 'item') else deger for alan, deger in durum.items()}
+        if en_iyi and getattr(callback, 'best_weights', None) is not None:
+            for degisken, agirlik in zip(en_iyi, callback.best_weights):
+                degisken.assign(agirlik)
+            durum['best_weights'] = True
+        durumlar.append(durum)
+    return json.dumps(durumlar)
+
+
+def _geri_cagirmalari_yukle(callbacks, durum, en_iyi):
+    # Baş çalışana özgü geri çağırmalar (ModelCheckpoint) listenin sonundadır,
+    # diğer çalışanlarda eşleşmeyenler atlanır
+    for callback, alanlar in zip(callbacks, json.loads(durum)):
+        if alanlar.pop('best_weights', False):
+            callback.best_weights = [degisken.numpy() for degisken in en_iyi]
+        for alan, deger in alanlar.items():
+            setattr(callback, alan, deger)
+
+
+def calisan_bilgisi(strateji):
+    """(görev numarası, çalışan sayısı, baş çalışan mı)"""
+    cozumleyici = strateji.cluster_resolver
+    gorev_no = cozumleyici.task_id or 0
+    calisan_sayisi = len(cozumleyici.cluster_spec().as_dict().get('worker', [])) or 1
+    return gorev_no, calisan_sayisi, gorev_no == 0
+
+
+class DagitikEgitim:
+    """
+    Modeli strateji altında shard'lardan (tfrecord_shards) eğitir. Her çalışan
+    kendi shard'larını okur; epoch başına adım sayısı en az verisi olan
+    çalışana göre seçilir, veri tekrarlandığı için hiçbir çalışan erken bitmez.
+
+    Keras 3'ün model.fit'i MultiWorkerMirroredStrategy altında metrik
+    değerlerini indiremediği için adımlar strategy.run ile çalışır; kayıp ve
+    doğruluk tüm çalışanlarda toplanır, böylece aynı Keras callback'leri
+    (EarlyStopping, ReduceLROnPlateau...) her çalışanda aynı kararı verir.
+
+    Her aşama yedek_dizini/<aşama>/ altına her epoch sonunda (yedek_adimi
+    verilirse her o kadar adımda da) model, optimizer, sayaçlar ve geri
+    çağırmaların durumuyla (bekleme sayaçları, en iyi değer ve ağırlıklar)
+    birlikte kaydedilir. Yeniden başlatılan eğitim son kayıttan devam eder,
+    biten bir aşama atlanır. Kayıtları yalnızca baş çalışan yazar (diğerleri
+    geçici klasöre); çalışanların hepsi aynı klasörü görmelidir.
+
+    Dağıtık yineleyici kaydedilemediğinden devam ederken eğitim verisi
+    kaydedilen adıma kadar ileri sarılır (çözülür, eğitilmez). Eğitimde
+    okuma ve çözme sırası belirleyici olmadığından (shard_veri_seti,
+    deterministic=False) batch'ler kesintisiz bir çalıştırmadakiyle bire bir
+    aynı değildir, karıştırma akışındaki konum ise aynıdır.
+    """
+
+    def __init__(self, strateji, model, shard_dizini, batch_size=32, img_size=(224, 224),
+                 yedek_dizini='dagitik_yedek', yedek_adimi=None, adim_siniri=None, tohum=42):
+        self.strateji = strateji
+        self.model = model
+        self.yedek_dizini = yedek_dizini
+        self.yedek_adimi = yedek_adimi
+        self.gorev_no, self.calisan_sayisi, self.bas_calisan = calisan_bilgisi(strateji)
+        # batch_size replika başınadır
+        self.global_batch = batch_size * strateji.num_replicas_in_sync
+        # aşama -> [{'epoch', 'saniye', 'resim_sn'}]
+        self.olcumler = {}
+
+        indeks = indeks_oku(shard_dizini)
+        calisan_batch = self.global_batch // self.calisan_sayisi
+        self.adimlar = {}
+        for bolum in ('egitim', 'dogrulama', 'test'):
+            en_az = min(bolum_sayisi(indeks, bolum, self.calisan_sayisi, i) for i in range(self.calisan_sayisi))
+            self.adimlar[bolum] = max(1, en_az // calisan_batch)
+            if adim_siniri:
+                self.adimlar[bolum] = min(self.adimlar[bolum], adim_siniri)
+
+        def veri(bolum, karistir):
+            def olustur(baglam):
+                return shard_veri_seti(shard_dizini, bolum, img_size,
+                                       baglam.get_per_replica_batch_size(self.global_batch), karistir=karistir,
+                                       artirma=artirma_katmanlari(tohum) if karistir else None,
+                                       calisan_sayisi=baglam.num_input_pipelines,
+                                       calisan_indeksi=baglam.input_pipeline_id, tohum=tohum).repeat()
+            return strateji.distribute_datasets_from_function(olustur)
+
+        self.veri = {'egitim': veri('egitim', True), 'dogrulama': veri('dogrulama', False),
+                     'test': veri('test', False)}
+
+    def _adimlar_olustur(self):
+        """Eğitilebilir katmanlar ve optimizer değiştikçe yeniden izlenen adım fonksiyonları"""
+        model = self.model
+        optimizer = model.optimizer
+        global_batch = self.global_batch
+
+        def sayaclar(y, tahmin, ornek_kaybi):
+            dogru = tf.reduce_sum(tf.cast(tf.equal(tf.argmax(tahmin, -1), tf.argmax(y, -1)), tf.float32))
+            return tf.stack([tf.reduce_sum(ornek_kaybi), dogru, tf.cast(tf.shape(y)[0], tf.float32)])
+
+        def egitim_adimi(x, y):
+            with tf.GradientTape() as teyp:
+                tahmin = tf.cast(model(x, training=True), tf.float32)
+                ornek_kaybi = tf.keras.losses.categorical_crossentropy(y, tahmin)
+                kayip = tf.nn.compute_average_loss(ornek_kaybi, global_batch_size=global_batch)
+                if model.losses:
+                    kayip += tf.nn.scale_regularization_loss(tf.add_n(model.losses))
+                if hasattr(optimizer, 'scale_loss'):
+                    kayip = optimizer.scale_loss(kayip)
+            gradyanlar = teyp.gradient(kayip, model.trainable_variables)
+            optimizer.apply_gradients(zip(gradyanlar, model.trainable_variables))
+            return sayaclar(y, tahmin, ornek_kaybi)
+
+        def degerlendirme_adimi(x, y):
+            tahmin = tf.cast(model(x, training=False), tf.float32)
+            return sayaclar(y, tahmin, tf.keras.losses.categorical_crossentropy(y, tahmin))
+
+        @tf.function
+        def egit(yineleyici):
+            return self.strateji.reduce('SUM', self.strateji.run(egitim_adimi, args=next(yineleyici)), axis=None)
+
+        @tf.function
+        def degerlendir(yineleyici):
+            return self.strateji.reduce('SUM', self.strateji.run(degerlendirme_adimi, args=next(yineleyici)),
+                                        axis=None)
+
+        return egit, degerlendir
+
+    def _olc(self, adim_fonksiyonu, bolum):
+        yineleyici = iter(self.veri[bolum])
+        toplam = np.zeros(3)
+        for _ in range(self.adimlar[bolum]):
+            toplam += adim_fonksiyonu(yineleyici).numpy()
+        return toplam[0] / toplam[2], toplam[1] / toplam[2]
+
+    def egit(self, asama, epochs, callbacks=None):
+        """
+        Derlenmiş modeli (optimizer'ı strateji kapsamında oluşturulmuş olmalı)
+        bir aşama boyunca eğitir; epoch kayıtlarını (loss, accuracy, val_loss,
+        val_accuracy) döndürür. Aşama daha önce bittiyse ağırlıkları yükleyip atlar.
+        """
+        with self.strateji.scope():
+            # Optimizer değişkenleri kayıt yüklenmeden önce oluşturulur
+            if not self.model.optimizer.built:
+                self.model.optimizer.build(self.model.trainable_variables)
+            epoch = tf.Variable(0, dtype=tf.int64)
+            adim = tf.Variable(0, dtype=tf.int64)
+            bitti = tf.Variable(False)
+        callbacks = list(callbacks or [])
+        # Metin değişkenleri replikalara dağıtılamaz; strateji kapsamı dışında oluşturulur
+        durum = tf.Variable('[]', dtype=tf.string, trainable=False)
+        en_iyi = []
+        if any(getattr(callback, 'restore_best_weights', False) for callback in callbacks):
+            en_iyi = [tf.Variable(tf.zeros(w.shape, w.dtype), trainable=False) for w in self.model.weights]
+        kayit = tf.train.Checkpoint(model=self.model, optimizer=self.model.optimizer, epoch=epoch, adim=adim,
+                                    bitti=bitti, geri_cagirmalar=durum, en_iyi_agirliklar=en_iyi)
+        dizin = os.path.join(self.yedek_dizini, asama)
+        yazma_dizini = dizin if self.bas_calisan else os.path.join(dizin, f".calisan_{self.gorev_no}")
+        yonetici = tf.train.CheckpointManager(kayit, yazma_dizini, max_to_keep=1)
+        son = tf.train.latest_checkpoint(dizin)
+        if son:
+            kayit.restore(son)
+            if bool(bitti.numpy()):
+                print(f"{asama} daha önce tamamlanmış, atlanıyor.")
+                return {}
+            print(f"{asama} kaydından devam ediliyor: epoch {int(epoch.numpy()) + 1}, adım {int(adim.numpy())}")
+
+        egit_adimi, degerlendir_adimi = self._adimlar_olustur()
+        geri_cagirmalar = tf.keras.callbacks.CallbackList(callbacks, model=self.model)
+        gecmis = {}
+        self.model.stop_training = False
+        geri_cagirmalar.on_train_begin()
+        if son:
+            # on_train_begin sayaçları sıfırladığından yükleme ondan sonra yapılır
+            _geri_cagirmalari_yukle(callbacks, durum.numpy().decode(), en_iyi)
+
+        def kaydet():
+            durum.assign(_geri_cagirma_durumu(callbacks, en_iyi))
+            yonetici.save()
+
+        yineleyici = iter(self.veri['egitim'])
+        adim_sayisi = self.adimlar['egitim']
+        atlanacak = int(epoch.numpy()) * adim_sayisi + int(adim.numpy())
+        if atlanacak:
+            print(f"Eğitim verisi {atlanacak} batch ileri sarılıyor...", flush=True)
+            for _ in range(atlanacak):
+                next(yineleyici)
+        while int(epoch.numpy()) < epochs and not self.model.stop_training:
+            e = int(epoch.numpy())
+            geri_cagirmalar.on_epoch_begin(e)
+            baslangic_adimi = int(adim.numpy())
+            toplam = np.zeros(3)
+            baslangic = time.perf_counter()
+            for a in range(baslangic_adimi, adim_sayisi):
+                toplam += egit_adimi(yineleyici).numpy()
+                if self.yedek_adimi and (a + 1) % self.yedek_adimi == 0 and a + 1 < adim_sayisi:
+                    adim.assign(a + 1)
+                    kaydet()
+            saniye = time.perf_counter() - baslangic
+            logs = {'loss': toplam[0] / toplam[2], 'accuracy': toplam[1] / toplam[2]}
+            logs['val_loss'], logs['val_accuracy'] = self._olc(degerlendir_adimi, 'dogrulama')
+            geri_cagirmalar.on_epoch_end(e, logs)
+
+            resim_sn = (adim_sayisi - baslangic_adimi) * self.global_batch / saniye
+            self.olcumler.setdefault(asama, []).append({'epoch': e, 'saniye': saniye, 'resim_sn': resim_sn})
+            print(f"Epoch {e + 1}/{epochs} - {saniye:.0f}s ({resim_sn:.1f} resim/sn) - "
+                  + ' - '.join(f"{ad}: {deger:.4f}" for ad, deger in logs.items()), flush=True)
+            for ad, deger in logs.items():
+                gecmis.setdefault(ad, []).append(deger)
+            epoch.assign(e + 1)
+            adim.assign(0)
+            kaydet()
+        geri_cagirmalar.on_train_end()
+        bitti.assign(True)
+        kaydet()
+        return gecmis
+
+    def degerlendir(self, bolum='test'):
+        """Tüm çalışanlardaki (kayıp, doğruluk)"""
+        _, degerlendir_adimi = self._adimlar_olustur()
+        return self._olc(degerlendir_adimi, bolum)
+
+    def yedekleri_sil(self):
+        """Eğitim tamamlandıktan sonra aşama kayıtlarını sil (yeniden çalıştırma baştan başlar)"""
+        if self.bas_calisan and os.path.isdir(self.yedek_dizini):
+            shutil.rmtree(self.yedek_dizini)
+
+    def hiz_ozeti(self):
+        """Aşama başına ortalama resim/sn; ilk epoch (izleme ve ısınma) birden fazla epoch varsa sayılmaz"""
+        ozet = {}
+        for asama, olcumler in self.olcumler.items():
+            secilen = olcumler[1:] or olcumler
+            ozet[asama] = float(np.mean([o['resim_sn'] for o in secilen]))
+        return ozet
+
+
+def _bos_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+def yerel_baslat(calisan_sayisi, argumanlar, gunluk_dizini='dagitik_gunluk'):
+    """
+    Aynı makinede calisan_sayisi süreç başlatır; her biri TF_CONFIG ile
+    'veri_isleme.py dagitik <argumanlar>' çalıştırır. Baş çalışanın çıktısı
+    ekrana, diğerlerininki gunluk_dizini/calisan_<i>.log dosyalarına gider.
+    Bir çalışan hata verirse diğerleri durdurulur. Çıkış kodunu döndürür.
+    """
+    adresler = [f"localhost:{_bos_port()}" for _ in range(calisan_sayisi)]
+    os.makedirs(gunluk_dizini, exist_ok=True)
+    # Her çalışan çekirdeklerin eşit payını kullanır
+    is_parcacigi = str(max(1, (os.cpu_count() or 1) // calisan_sayisi))
+    surecler = []
+    gunlukler = []
+    for i in range(calisan_sayisi):
+        ortam = dict(os.environ, TF_NUM_INTRAOP_THREADS=is_parcacigi, TF_NUM_INTEROP_THREADS=is_parcacigi,
+                     TF_CONFIG=json.dumps({'cluster': {'worker': adresler}, 'task': {'type': 'worker', 'index': i}}))
+        ortam.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+        cikti = None
+        if i > 0:
+            cikti = open(os.path.join(gunluk_dizini, f"calisan_{i}.log"), 'w', encoding='utf-8')
+            gunlukler.append(cikti)
+        komut = [sys.executable, os.path.join(DEPO, 'veri_isleme.py'), 'dagitik'] + list(argumanlar)
+        surecler.append(subprocess.Popen(komut, env=ortam, stdout=cikti, stderr=subprocess.STDOUT if cikti else None))
+
+    try:
+        while True:
+            kodlar = [surec.poll() for surec in surecler]
+            hatali = [i for i, kod in enumerate(kodlar) if kod not in (None, 0)]
+            if hatali:
+                print(f"Çalışan {hatali[0]} {kodlar[hatali[0]]} koduyla çıktı, diğerleri durduruluyor "
+                      f"(günlük: {gunluk_dizini}/).")
+                for surec in surecler:
+                    if surec.poll() is None:
+                        surec.terminate()
+                return kodlar[hatali[0]]
+            if all(kod == 0 for kod in kodlar):
+                return 0
+            time.sleep(0.5)
+    finally:
+        for surec in surecler:
+            surec.wait()
+        for gunluk in gunlukler:
+            gunluk.close()
+
+
+def olcekleme_raporu(calisan_sayilari, argumanlar, rapor_yolu='olcekleme_raporu.json'):
+    """
+    Aynı eğitimi her çalışan sayısı için yerel olarak çalıştırır ve aşama
+    başına verimi (resim/sn), 1 çalışana göre hızlanmayı ve ölçekleme
+    verimini (hızlanma / çalışan sayısı) raporlar. Replika başına batch sabit
+    kaldığı için global batch çalışan sayısıyla büyür (zayıf ölçekleme).
+    """
+    calisan_sayilari = sorted(set(calisan_sayilari) | {1})
+    sonuclar = {}
+    for n in calisan_sayilari:
+        calisma_raporu = f"{os.path.splitext(rapor_yolu)[0]}_{n}.json"
+        print(f"\n=== {n} çalışan ===")
+        kod = yerel_baslat(n, list(argumanlar) + ['--rapor', calisma_raporu, '--yedek-dizini',
+                                                  f"dagitik_yedek_olcekleme_{n}"])
+        if kod != 0:
+            raise RuntimeError(f"{n} çalışanlı eğitim {kod} koduyla başarısız oldu")
+        with open(calisma_raporu, 'r', encoding='utf-8') as f:
+            sonuclar[n] = json.load(f)
+
+    rapor = {'calisan_sayilari': calisan_sayilari, 'calismalar': {}}
+    print(f"\n{'çalışan':>8}{'global batch':>14}{'aşama':>8}{'resim/sn':>10}{'hızlanma':>10}{'verim':>8}")
+    for n in calisan_sayilari:
+        calisma = dict(sonuclar[n], asamalar={})
+        for asama, resim_sn in sonuclar[n]['hiz'].items():
+            tek = sonuclar[1]['hiz'].get(asama)
+            hizlanma = resim_sn / tek if tek else None
+            calisma['asamalar'][asama] = {'resim_sn': resim_sn, 'hizlanma': hizlanma,
+                                          'verim': hizlanma / n if hizlanma else None}
+            print(f"{n:>8}{sonuclar[n]['global_batch']:>14}{asama:>8}{resim_sn:>10.1f}"
+                  + (f"{hizlanma:>10.2f}{hizlanma / n:>8.0%}" if hizlanma else ''))
+        rapor['calismalar'][str(n)] = calisma
+    with open(rapor_yolu, 'w', encoding='utf-8') as f:
+        json.dump(rapor, f, ensure_ascii=False, indent=2)
+    print(f"Rapor: {rapor_yolu}")
+    return rapor
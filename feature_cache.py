@@ -0,0 +1,200 @@
+import os
+import json
+import hashlib
+
+import numpy as np
+from tensorflow.keras import Model
+from tensorflow.keras.preprocessing.image import ImageDataGenerator, load_img, img_to_array
+from tensorflow.keras.utils import Sequence, to_categorical
+
+from model import (ozellik_katmani, se_yapilandirmasi, create_se_head, agirliklari_aktar, model_derle,
+                   model_maliyeti)
+from input_pipeline import manifest_listesi
+
+# veri_cesitlendirme'deki ImageDataGenerator ile aynı artırma ayarları
+ARTIRMA_AYARLARI = dict(
+    rotation_range=20,
+    width_shift_range=0.2,
+    height_shift_range=0.2,
+    horizontal_flip=True,
+    fill_mode='nearest'
+)
+
+
+def agirlik_ozeti(model):
+    """Modelin ağırlıklarının SHA-256 özeti (önbellek anahtarı için)"""
+    h = hashlib.sha256()
+    for agirlik in model.weights:
+        h.update(agirlik.name.encode())
+        h.update(np.ascontiguousarray(agirlik.numpy()).tobytes())
+    return h.hexdigest()
+
+
+def dosya_ozeti(yollar):
+    h = hashlib.sha256()
+    for yol in yollar:
+        st = os.stat(yol)
+        h.update(f"{yol}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+class _OzellikDizisi(Sequence):
+    """Her epoch'ta sıradaki artırma tohumunun memmap'lenmiş özelliklerini veren dizi"""
+
+    def __init__(self, ozellikler, y, batch_size=32, shuffle=True, **kwargs):
+        super().__init__(**kwargs)
+        self.ozellikler = ozellikler
+        self.y = y
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.epoch = 0
+        self.sira = np.arange(len(y))
+        self._karistir()
+
+    def _karistir(self):
+        if self.shuffle:
+            np.random.shuffle(self.sira)
+
+    def __len__(self):
+        return int(np.ceil(len(self.y) / self.batch_size))
+
+    def __getitem__(self, idx):
+        secilen = np.sort(self.sira[idx * self.batch_size:(idx + 1) * self.batch_size])
+        ozellikler = self.ozellikler[self.epoch % len(self.ozellikler)]
+        return ozellikler[secilen].astype(np.float32), self.y[secilen]
+
+    def on_epoch_end(self):
+        self.epoch += 1
+        self._karistir()
+
+
+class OzellikOnbellegi:
+    """
+    İlk eğitim aşamasında ilk SE bloğundan önceki omurga tamamen donuk
+    olduğundan bu kısmın çıktısı (model.ozellik_katmani) her (resim,
+    artırma tohumu) için yalnızca bir kez hesaplanır ve float16 .npy
+    dosyalarına yazılır. Ardından yalnızca kalan aşamalar (donuk konvolüsyonlar
+    + eğitilebilir SE blokları) ve sınıflandırma başı bu memmap'lenmiş
+    özellikler üzerinde eğitilir.
+
+    Önbellek anahtarı omurga ağırlıklarının özeti, dosya listesi ve girdi
+    hattı ayarlarından oluşur; biri değişirse özellikler yeniden hesaplanır.
+
+    Model SE bloklarını yalnızca 5. aşamada (veya hiç) taşımalıdır; böylece
+    özellikler conv4 (14x14x1024, resim ve tohum başına ~0.4 MB) ya da conv5
+    çıktısıdır. SE 4. aşamada başlarsa kesim conv3'e kayar, özellikler iki kat
+    büyür ve donuk 4. aşama her adımda yeniden çalışır; bu yapılandırma
+    reddedilir (bkz. maliyet(), benchmarks/ozellik_onbellegi.py).
+    """
+
+    def __init__(self, model, veri_yolu='veri_seti', onbellek_dizini='feature_cache',
+                 artirma_sayisi=4, img_size=(224, 224), batch_size=32, dogrulama_orani=0.15, tohum=42):
+        self.model = model
+        self.veri_yolu = veri_yolu
+        self.onbellek_dizini = onbellek_dizini
+        self.artirma_sayisi = artirma_sayisi
+        self.img_size = tuple(img_size)
+        self.batch_size = batch_size
+        self.dogrulama_orani = dogrulama_orani
+        self.tohum = tohum
+
+        self.se_asamalari, self.ratio = se_yapilandirmasi(model)
+        if self.se_asamalari and min(self.se_asamalari) < 5:
+            raise ValueError(f"Özellik önbelleği SE bloklarının yalnızca 5. aşamada olmasını gerektirir "
+                             f"(modelde: {', '.join(map(str, self.se_asamalari))}); --se-asamalari 5 kullanın")
+        self.ozellik_katmani = ozellik_katmani(self.se_asamalari)
+        self.omurga = Model(inputs=model.input, outputs=model.get_layer(self.ozellik_katmani).output)
+        # veri_cesitlendirme ile aynı bölümler; test bölümü burada kullanılmaz
+        self.siniflar, self.egitim, self.dogrulama, _ = manifest_listesi(veri_yolu, dogrulama_orani=dogrulama_orani)
+        self.datagen = ImageDataGenerator(**ARTIRMA_AYARLARI)
+
+    def maliyet(self, bas=None):
+        """
+        Önbelleğin boyutu ve eğitilen başın payı: (resim ve tohum başına MB,
+        toplam GB, baş FLOP / tüm model FLOP).
+        """
+        if bas is None:
+            bas = create_se_head(sinif_sayisi=self.model.output.shape[-1],
+                                 ozellik_sekli=tuple(self.omurga.output.shape[1:]),
+                                 se_asamalari=self.se_asamalari, ratio=self.ratio)
+        mb = int(np.prod(self.omurga.output.shape[1:])) * 2 / 2**20
+        toplam = mb * (len(self.egitim[0]) * self.artirma_sayisi + len(self.dogrulama[0])) / 1024
+        return mb, toplam, model_maliyeti(bas)[2] / model_maliyeti(self.model)[2]
+
+    def _anahtar(self):
+        yapilandirma = {
+            'ozellik_katmani': self.ozellik_katmani,
+            'img_size': self.img_size,
+            'artirma': ARTIRMA_AYARLARI,
+            'artirma_sayisi': self.artirma_sayisi,
+            'dogrulama_orani': self.dogrulama_orani,
+            'tohum': self.tohum,
+            'siniflar': self.siniflar,
+            'dosyalar': dosya_ozeti(self.egitim[0] + self.dogrulama[0]),
+            'agirliklar': agirlik_ozeti(self.omurga),
+        }
+        return hashlib.sha256(json.dumps(yapilandirma, sort_keys=True).encode()).hexdigest()
+
+    def _yol(self, ad):
+        return os.path.join(self.onbellek_dizini, ad)
+
+    def _ozellik_yaz(self, yollar, ad, artirma_tohumu=None):
+        """Resimleri batch'ler halinde omurgadan geçirip float16 .npy dosyasına yaz"""
+        cikti_sekli = (len(yollar),) + tuple(self.omurga.output.shape[1:])
+        ozellikler = np.lib.format.open_memmap(self._yol(ad + '.tmp.npy'), mode='w+',
+                                               dtype=np.float16, shape=cikti_sekli)
+        for i in range(0, len(yollar), self.batch_size):
+            batch = []
+            for j, yol in enumerate(yollar[i:i + self.batch_size], start=i):
+                x = img_to_array(load_img(yol, target_size=self.img_size))
+                if artirma_tohumu is not None:
+                    x = self.datagen.random_transform(x, seed=artirma_tohumu * 1000003 + j)
+                batch.append(x / 255.0)
+            ozellikler[i:i + len(batch)] = self.omurga.predict(np.array(batch), verbose=0)
+        ozellikler.flush()
+        del ozellikler
+        os.replace(self._yol(ad + '.tmp.npy'), self._yol(ad + '.npy'))
+
+    def hazirla(self):
+        """Önbellek güncel değilse özellikleri hesapla; (eğitim listesi, doğrulama) memmap'lerini döndür"""
+        os.makedirs(self.onbellek_dizini, exist_ok=True)
+        anahtar = self._anahtar()
+        anahtar_yolu = self._yol('anahtar.txt')
+        guncel = os.path.exists(anahtar_yolu) and open(anahtar_yolu).read() == anahtar
+        if not guncel:
+            print(f"Omurga özellikleri hesaplanıyor ({self.artirma_sayisi} artırma tohumu)...")
+            if os.path.exists(anahtar_yolu):
+                os.remove(anahtar_yolu)
+            # Tohum 0 artırmasız orijinal resimlerdir
+            for tohum in range(self.artirma_sayisi):
+                self._ozellik_yaz(self.egitim[0], f'egitim_{tohum}',
+                                  artirma_tohumu=None if tohum == 0 else self.tohum + tohum)
+            self._ozellik_yaz(self.dogrulama[0], 'dogrulama')
+            with open(anahtar_yolu, 'w') as f:
+                f.write(anahtar)
+        egitim = [np.load(self._yol(f'egitim_{t}.npy'), mmap_mode='r') for t in range(self.artirma_sayisi)]
+        dogrulama = np.load(self._yol('dogrulama.npy'), mmap_mode='r')
+        return egitim, dogrulama
+
+    def egit(self, epochs=20, ogrenme_orani=1e-4, callbacks=None, hizli=False):
+        """SE blokları ve sınıflandırma başını önbellekteki özelliklerle eğit, ağırlıkları modele geri yaz"""
+        sinif_sayisi = self.model.output.shape[-1]
+        bas = create_se_head(sinif_sayisi=sinif_sayisi, ozellik_sekli=tuple(self.omurga.output.shape[1:]),
+                             se_asamalari=self.se_asamalari, ratio=self.ratio)
+        mb, toplam, pay = self.maliyet(bas)
+        print(f"Özellikler {self.ozellik_katmani} çıktısından: resim ve tohum başına {mb:.2f} MB "
+              f"(toplam ~{toplam:.1f} GB), eğitilen başın FLOP payı %{100 * pay:.0f}")
+        egitim, dogrulama = self.hazirla()
+        y_egitim = to_categorical(self.egitim[1], sinif_sayisi)
+        y_dogrulama = to_categorical(self.dogrulama[1], sinif_sayisi)
+
+        agirliklari_aktar(self.model, bas)
+        model_derle(bas, ogrenme_orani, hizli)
+        history = bas.fit(
+            _OzellikDizisi(egitim, y_egitim, self.batch_size),
+            validation_data=_OzellikDizisi([dogrulama], y_dogrulama, self.batch_size, shuffle=False),
+            epochs=epochs,
+            callbacks=callbacks
+        )
+        agirliklari_aktar(bas, self.model)
+        return history
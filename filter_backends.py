@@ -0,0 +1,76 @@
+import os
+import tempfile
+
+import numpy as np
+from tensorflow.keras.applications import ResNet50, MobileNetV3Large, EfficientNetB0
+from tensorflow.keras.applications import resnet50, mobilenet_v3, efficientnet
+
+from disa_aktar import savedmodel_aktar, tflite_aktar, TFLiteTahminci
+
+# Her arka uç: (1000 sınıflı ImageNet modeli, [0, 255] RGB girdi için ön işleme).
+# MobileNetV3 ve EfficientNet ön işlemeyi modelin içinde yapar.
+ARKA_UCLAR = {
+    'resnet50': (ResNet50, resnet50.preprocess_input),
+    'mobilenetv3': (MobileNetV3Large, mobilenet_v3.preprocess_input),
+    'efficientnetb0': (EfficientNetB0, efficientnet.preprocess_input),
+}
+
+
+class KerasFiltresi:
+    """keras.applications ImageNet modeliyle (batch, 1000) olasılık üreten filtre arka ucu"""
+
+    def __init__(self, ad='resnet50', weights='imagenet'):
+        if ad not in ARKA_UCLAR:
+            raise ValueError(f"Bilinmeyen filtre modeli: {ad}")
+        model_sinifi, self.on_isleme = ARKA_UCLAR[ad]
+        self.ad = ad
+        self.model = model_sinifi(weights=weights)
+
+    def __call__(self, batch):
+        """batch: (n, 224, 224, 3) uint8 veya [0, 255] float RGB"""
+        x = self.on_isleme(np.asarray(batch, dtype=np.float32))
+        # predict() her çağrıda veri hattı kurar; tek batch için doğrudan çağrı daha hızlıdır
+        return np.asarray(self.model(x, training=False))
+
+
+class TFLiteFiltresi:
+    """
+    Bir arka ucun TFLite'a çevrilmiş (nicemlenmiş olabilir) haliyle tahmin.
+    Ön işleme, modelin üretildiği `temel` arka uçla aynıdır.
+    """
+
+    def __init__(self, yol, temel='resnet50', is_parcacigi=None):
+        if temel not in ARKA_UCLAR:
+            raise ValueError(f"Bilinmeyen filtre modeli: {temel}")
+        self.ad = f"{temel}_tflite"
+        self.on_isleme = ARKA_UCLAR[temel][1]
+        self.tahminci = TFLiteTahminci(yol, is_parcacigi or os.cpu_count())
+
+    def __call__(self, batch):
+        return self.tahminci(self.on_isleme(np.asarray(batch, dtype=np.float32)))
+
+
+def tflite_filtresi_olustur(temel, yol, nicemleme='dinamik', kalibrasyon=None, weights='imagenet'):
+    """
+    `temel` arka ucun ImageNet modelini TFLite'a çevirip yol'a yaz.
+    kalibrasyon: int8 için [0, 255] RGB resimler (ön işleme uygulanmamış).
+    """
+    keras_filtresi = KerasFiltresi(temel, weights=weights)
+    if kalibrasyon is not None:
+        kalibrasyon = keras_filtresi.on_isleme(np.asarray(kalibrasyon, dtype=np.float32))
+    with tempfile.TemporaryDirectory() as gecici:
+        savedmodel_yolu = savedmodel_aktar(keras_filtresi.model, os.path.join(gecici, 'savedmodel'))
+        return tflite_aktar(savedmodel_yolu, yol, nicemleme, kalibrasyon)
+
+
+def filtre_olustur(ad='resnet50', tflite_yolu=None, weights='imagenet'):
+    """
+    ImageCollector için filtre arka ucu. tflite_yolu verilirse `ad` ile
+    üretilmiş TFLite modeli yorumlayıcıyla çalıştırılır.
+    """
+    if tflite_yolu:
+        if not os.path.exists(tflite_yolu):
+            print(f"{tflite_yolu} bulunamadı, {ad} modelinden dinamik nicemlenmiş TFLite üretiliyor...")
+            tflite_filtresi_olustur(ad, tflite_yolu, weights=weights)
+        return TFLiteFiltresi(tflite_yolu, temel=ad)
+    return KerasFiltresi(ad, weights=weights)
@@ -0,0 +1,227 @@
+import os
+import json
+import threading
+
+from PIL import Image
+import imagehash
+
+RESIM_UZANTILARI = ('.jpg', '.jpeg', '.png')
+HASH_BITLERI = 64
+# JPEG'ler phash için draft() ile bu boyuta yakın ölçekte çözülür
+TASLAK_BOYUTU = (224, 224)
+# phash tanımı (çözme dahil) değişince artırılır; farklı sürümle yazılmış
+# index kayıtları uzlaştırmada yeniden hash'lenir
+HASH_SURUMU = 2
+
+
+def taslak_coz(img):
+    """
+    Açılmış PIL resmini çöz ve RGB halini döndür. JPEG'ler draft() ile
+    TASLAK_BOYUTU'na yakın ölçekte çözülür, tam çözünürlüklü çözme atlanır.
+    """
+    img.draft('RGB', TASLAK_BOYUTU)
+    img.load()
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    return img
+
+
+def phash_hesapla(img):
+    """
+    taslak_coz ile çözülmüş resmin perceptual hash'i (hex metin). İndirme
+    yolu (decode.resim_coz) ile index'in yeniden oluşturulması aynı dosyaya
+    aynı hash'i vermeli.
+    """
+    return str(imagehash.phash(img))
+
+
+def resim_hashle(resim_yolu):
+    """Resmin perceptual hash'ini hex metin olarak döndür"""
+    with Image.open(resim_yolu) as img:
+        return phash_hesapla(taslak_coz(img))
+
+
+def hash_int(phash):
+    """ImageHash, hex metin veya int olarak verilen hash'i 64 bitlik int'e çevir"""
+    if isinstance(phash, int):
+        return phash
+    return int(str(phash), 16)
+
+
+class HashIndex:
+    """
+    Veri seti klasöründeki resimlerin (yol, boyut, mtime, phash) kayıtlarını
+    diskte tutar. Kayıtlar JSON satırları olarak dosyanın sonuna eklenir,
+    açılışta yalnızca boyutu veya mtime'ı değişen ya da eski HASH_SURUMU ile
+    hash'lenmiş dosyalar yeniden hash'lenir.
+    """
+
+    def __init__(self, kok_dizin, dosya_adi='.hash_index.jsonl'):
+        self.kok_dizin = kok_dizin
+        self.dosya_yolu = os.path.join(kok_dizin, dosya_adi)
+        # göreli yol -> {'boyut': int, 'mtime': int, 'phash': str veya None, 'surum': int}
+        self.kayitlar = {}
+        self._satir_sayisi = 0
+        self._kilit = threading.Lock()
+        os.makedirs(kok_dizin, exist_ok=True)
+        self._yukle()
+
+    def _goreli(self, yol):
+        return os.path.relpath(yol, self.kok_dizin).replace(os.sep, '/')
+
+    def _yukle(self):
+        """Index dosyasını oku, aynı yola ait sonraki satırlar öncekileri ezer"""
+        if not os.path.exists(self.dosya_yolu):
+            return
+        with open(self.dosya_yolu, 'r', encoding='utf-8') as f:
+            for satir in f:
+                self._satir_sayisi += 1
+                try:
+                    kayit = json.loads(satir)
+                    yol = kayit.pop('yol')
+                except (ValueError, KeyError):
+                    # Yarım yazılmış son satır vb. (uzlaştırma sırasında düzelir)
+                    continue
+                if kayit.get('silindi'):
+                    self.kayitlar.pop(yol, None)
+                else:
+                    self.kayitlar[yol] = kayit
+
+    def _yeniden_yaz(self):
+        """Index dosyasını güncel kayıtlarla sıkıştırarak baştan yaz"""
+        gecici_yol = self.dosya_yolu + '.tmp'
+        with open(gecici_yol, 'w', encoding='utf-8') as f:
+            for yol, kayit in self.kayitlar.items():
+                f.write(json.dumps(dict(yol=yol, **kayit)) + '\n')
+        os.replace(gecici_yol, self.dosya_yolu)
+        self._satir_sayisi = len(self.kayitlar)
+
+    def _satir_ekle(self, yol, kayit):
+        with open(self.dosya_yolu, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(dict(yol=yol, **kayit)) + '\n')
+        self._satir_sayisi += 1
+
+    def uzlastir(self, alt_dizinler):
+        """
+        Verilen sınıf klasörlerini tarar; yeni, boyutu/mtime'ı değişen veya
+        eski hash sürümüyle kaydedilmiş dosyaları yeniden hash'ler, diskte artık olmayan kayıtları siler.
+        Yeniden hash'lenen dosya sayısını döndürür.
+        """
+        gorulen = set()
+        degisen = 0
+        silinen = 0
+        with self._kilit:
+            for alt_dizin in alt_dizinler:
+                klasor = os.path.join(self.kok_dizin, alt_dizin)
+                if not os.path.isdir(klasor):
+                    continue
+                with os.scandir(klasor) as girdiler:
+                    for girdi in girdiler:
+                        if not girdi.name.endswith(RESIM_UZANTILARI) or not girdi.is_file():
+                            continue
+                        yol = f"{alt_dizin}/{girdi.name}"
+                        gorulen.add(yol)
+                        st = girdi.stat()
+                        kayit = self.kayitlar.get(yol)
+                        if (kayit and kayit['boyut'] == st.st_size and kayit['mtime'] == st.st_mtime_ns
+                                and kayit.get('surum') == HASH_SURUMU):
+                            continue
+                        try:
+                            phash = resim_hashle(girdi.path)
+                        except Exception as e:
+                            print(f"Mevcut resim hash hatası {girdi.path}: {e}")
+                            phash = None
+                        self.kayitlar[yol] = {'boyut': st.st_size, 'mtime': st.st_mtime_ns, 'phash': phash,
+                                              'surum': HASH_SURUMU}
+                        degisen += 1
+
+            for yol in list(self.kayitlar):
+                if yol.split('/', 1)[0] in alt_dizinler and yol not in gorulen:
+                    del self.kayitlar[yol]
+                    silinen += 1
+
+            if degisen or silinen or self._satir_sayisi != len(self.kayitlar):
+                self._yeniden_yaz()
+        return degisen
+
+    def ekle(self, resim_yolu, phash):
+        """Yeni kaydedilen bir resmi index'e ekle (phash, phash_hesapla ile hesaplanmış olmalı)"""
+        st = os.stat(resim_yolu)
+        yol = self._goreli(resim_yolu)
+        kayit = {'boyut': st.st_size, 'mtime': st.st_mtime_ns,
+                 'phash': str(phash) if phash is not None else None, 'surum': HASH_SURUMU}
+        with self._kilit:
+            self.kayitlar[yol] = kayit
+            self._satir_ekle(yol, kayit)
+
+    def sayi(self, alt_dizin):
+        """Bir sınıf klasöründeki indexlenmiş resim sayısı"""
+        onek = alt_dizin + '/'
+        return sum(1 for yol in self.kayitlar if yol.startswith(onek))
+
+    def hashler(self, alt_dizin=None):
+        """(göreli yol, phash hex) çiftlerini döndür; hash'i hesaplanamayanları atla"""
+        onek = alt_dizin + '/' if alt_dizin else ''
+        return [(yol, kayit['phash']) for yol, kayit in self.kayitlar.items()
+                if yol.startswith(onek) and kayit['phash'] is not None]
+
+
+class HammingIndex:
+    """
+    64 bitlik hash'ler için multi-index hashing ile yakın kopya araması.
+
+    Hash'ler esik + 1 parçaya bölünür; Hamming mesafesi esik'ten küçük veya
+    eşit olan iki hash güvercin yuvası ilkesine göre en az bir parçada birebir
+    aynıdır. Böylece sorgu yalnızca bir parçası eşleşen adayları tarar.
+    """
+
+    def __init__(self, esik=4):
+        if not 0 <= esik < HASH_BITLERI:
+            raise ValueError(f"Geçersiz Hamming eşiği: {esik}")
+        self.esik = esik
+        parca_sayisi = esik + 1
+        taban, artan = divmod(HASH_BITLERI, parca_sayisi)
+        # (kaydırma, maske) çiftleri; bit genişlikleri olabildiğince eşit
+        self._parcalar = []
+        kaydirma = 0
+        for i in range(parca_sayisi):
+            genislik = taban + (1 if i < artan else 0)
+            self._parcalar.append((kaydirma, (1 << genislik) - 1))
+            kaydirma += genislik
+        self._tablolar = [{} for _ in self._parcalar]
+        self._hashler = set()
+
+    def __len__(self):
+        return len(self._hashler)
+
+    def ekle(self, phash):
+        h = hash_int(phash)
+        if h in self._hashler:
+            return
+        self._hashler.add(h)
+        for tablo, (kaydirma, maske) in zip(self._tablolar, self._parcalar):
+            tablo.setdefault((h >> kaydirma) & maske, []).append(h)
+
+    def en_yakin(self, phash):
+        """Eşik içindeki en yakın hash'i ve mesafesini döndür, yoksa (None, None)"""
+        h = hash_int(phash)
+        if h in self._hashler:
+            return h, 0
+        en_iyi, en_iyi_mesafe = None, None
+        for tablo, (kaydirma, maske) in zip(self._tablolar, self._parcalar):
+            for aday in tablo.get((h >> kaydirma) & maske, ()):
+                mesafe = bin(aday ^ h).count('1')
+                if mesafe <= self.esik and (en_iyi_mesafe is None or mesafe < en_iyi_mesafe):
+                    en_iyi, en_iyi_mesafe = aday, mesafe
+        return en_iyi, en_iyi_mesafe
+
+    def yakin_var_mi(self, phash):
+        """Eşik içinde (mesafe <= esik) kayıtlı bir hash var mı"""
+        h = hash_int(phash)
+        if h in self._hashler:
+            return True
+        for tablo, (kaydirma, maske) in zip(self._tablolar, self._parcalar):
+            for aday in tablo.get((h >> kaydirma) & maske, ()):
+                if bin(aday ^ h).count('1') <= self.esik:
+                    return True
+        return False
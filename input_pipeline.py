@@ -0,0 +1,115 @@
+import os
+
+import tensorflow as tf
+from tensorflow.keras import layers
+
+from split_manifest import bolumleri_al
+
+AUTOTUNE = tf.data.AUTOTUNE
+RESIM_UZANTILARI = ('.jpg', '.jpeg', '.png', '.bmp', '.gif')
+
+
+def dosya_listesi(klasor, dogrulama_orani=0.0, siniflar=None):
+    """
+    flow_from_directory ile aynı sırayla (alfabetik sınıf ve dosya adı)
+    dosya yollarını ve etiketlerini döndürür. dogrulama_orani verilirse her
+    sınıfın ilk %oran'lık dosyaları doğrulamaya ayrılır; ayrım deterministiktir.
+    siniflar verilirse etiketler bu listeye göre atanır (test seti için).
+    """
+    if siniflar is None:
+        siniflar = sorted(d for d in os.listdir(klasor) if os.path.isdir(os.path.join(klasor, d)))
+    egitim, dogrulama = ([], []), ([], [])
+    for etiket, sinif in enumerate(siniflar):
+        sinif_dir = os.path.join(klasor, sinif)
+        if not os.path.isdir(sinif_dir):
+            continue
+        dosyalar = sorted(f for f in os.listdir(sinif_dir) if f.lower().endswith(RESIM_UZANTILARI))
+        ayrim = int(dogrulama_orani * len(dosyalar))
+        for i, dosya in enumerate(dosyalar):
+            hedef = dogrulama if i < ayrim else egitim
+            hedef[0].append(os.path.join(sinif_dir, dosya))
+            hedef[1].append(etiket)
+    return siniflar, egitim, dogrulama
+
+
+def manifest_listesi(veri_yolu, siniflar=None, test_orani=0.15, dogrulama_orani=0.15):
+    """
+    dosya_listesi gibi, ama bölümler klasörün bölme manifestosundan gelir
+    (yeni dosyalar önce atanır). (siniflar, egitim, dogrulama, test) döndürür.
+    """
+    if siniflar is None:
+        siniflar = sorted(d for d in os.listdir(veri_yolu) if os.path.isdir(os.path.join(veri_yolu, d)))
+    bolumler = bolumleri_al(veri_yolu, siniflar, test_orani=test_orani, dogrulama_orani=dogrulama_orani)
+    return siniflar, bolumler['egitim'], bolumler['dogrulama'], bolumler['test']
+
+
+def artirma_katmanlari(tohum=None):
+    """ImageDataGenerator(rotation_range=20, shift=0.2, horizontal_flip) karşılığı, batch üzerinde çalışır"""
+    return tf.keras.Sequential([
+        layers.RandomRotation(20 / 360, fill_mode='nearest', seed=tohum),
+        layers.RandomTranslation(0.2, 0.2, fill_mode='nearest', seed=tohum),
+        layers.RandomFlip('horizontal', seed=tohum),
+    ], name='veri_artirma')
+
+
+def resim_coz(bayt, img_size):
+    resim = tf.io.decode_image(bayt, channels=3, expand_animations=False)
+    resim = tf.image.resize(resim, img_size)
+    # Önbellekte float32 yerine uint8 tutmak belleği 4 kat azaltır
+    return tf.cast(tf.clip_by_value(tf.round(resim), 0, 255), tf.uint8)
+
+
+def _resim_oku(yol, img_size):
+    return resim_coz(tf.io.read_file(yol), img_size)
+
+
+def batch_hazirla(ds, batch_size, artirma=None):
+    """uint8 resimleri batch'le, artırmayı batch üzerinde uygula, [0, 1]'e ölçekle ve önceden getir"""
+    ds = ds.batch(batch_size)
+    if artirma is not None:
+        ds = ds.map(lambda x, y: (artirma(tf.cast(x, tf.float32), training=True) / 255.0, y),
+                    num_parallel_calls=AUTOTUNE)
+    else:
+        ds = ds.map(lambda x, y: (tf.cast(x, tf.float32) / 255.0, y), num_parallel_calls=AUTOTUNE)
+    return ds.prefetch(AUTOTUNE)
+
+
+def veri_seti_olustur(yollar, etiketler, sinif_sayisi, img_size=(224, 224), batch_size=32,
+                      karistir=False, artirma=None, onbellek='', tohum=42):
+    """
+    Dosya listesinden paralel çözülen, önbelleklenen ve önceden getirilen bir
+    tf.data.Dataset oluşturur. onbellek: '' bellekte, dosya yolu diskte,
+    None önbellek yok.
+    """
+    ds = tf.data.Dataset.from_tensor_slices((list(yollar), list(etiketler)))
+    ds = ds.map(lambda yol, etiket: (_resim_oku(yol, img_size), tf.one_hot(etiket, sinif_sayisi)),
+                num_parallel_calls=AUTOTUNE)
+    if onbellek is not None:
+        ds = ds.cache(onbellek)
+    if karistir:
+        ds = ds.shuffle(len(yollar), seed=tohum, reshuffle_each_iteration=True)
+    return batch_hazirla(ds, batch_size, artirma)
+
+
+def veri_cesitlendirme_tfdata(veri_yolu='veri_seti', img_size=(224, 224), batch_size=32, dogrulama_orani=0.15,
+                              test_orani=0.15, onbellek='', tohum=42):
+    """veri_cesitlendirme ile aynı (eğitim, doğrulama, test) üçlüsünü tf.data ile döndürür"""
+    if not os.path.exists(veri_yolu) or not os.listdir(veri_yolu):
+        raise ValueError(f"'{veri_yolu}' klasörü boş veya mevcut değil!")
+
+    siniflar, egitim, dogrulama, test = manifest_listesi(veri_yolu, test_orani=test_orani,
+                                                          dogrulama_orani=dogrulama_orani)
+    print(f"Bulunan sınıflar: {siniflar}")
+    print(f"Eğitim: {len(egitim[0])}, doğrulama: {len(dogrulama[0])}, test: {len(test[0])} resim")
+
+    # Disk önbelleği istenirse her alt küme kendi dosyasını kullanır
+    def onbellek_yolu(ad):
+        return onbellek and f"{onbellek}_{ad}"
+
+    train_ds = veri_seti_olustur(*egitim, len(siniflar), img_size, batch_size, karistir=True,
+                                 artirma=artirma_katmanlari(tohum), onbellek=onbellek_yolu('egitim'), tohum=tohum)
+    # Doğrulama artırılmaz, her epoch'ta aynı resimlerle ölçülür
+    val_ds = veri_seti_olustur(*dogrulama, len(siniflar), img_size, batch_size,
+                               onbellek=onbellek_yolu('dogrulama'))
+    test_ds = veri_seti_olustur(*test, len(siniflar), img_size, batch_size, onbellek=None)
+    return train_ds, val_ds, test_ds
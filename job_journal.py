@@ -0,0 +1,162 @@
+import os
+import json
+import threading
+
+
+class ToplamaGunlugu:
+    """
+    Resim toplama işinin diskteki günlüğü. Her olay JSON satırı olarak
+    dosyanın sonuna eklenir (HashIndex ile aynı düzen); açılışta satırlar
+    sırayla uygulanarak durum yeniden kurulur. Çökme sonrası yeniden
+    başlatıldığında toplama kaldığı turdan, aynı arama motoru sırasıyla
+    devam eder; sınıflandırılmayı bekleyen geçici dosyalar yeniden
+    indirilmeden hatta gönderilir, kabul edilmiş olanlar yeniden
+    sınıflandırılmadan kaydedilir.
+
+    Olaylar:
+        tur_basladi  sınıf, deneme, plan [[terim, motor], ...], motor_secimi
+        arama        sınıf, deneme, terim, motor (bir arama tamamlandı)
+        tur_bitti    sınıf, deneme
+        indirildi    sınıf, yol (geçici dosya hatta girdi)
+        kabul        yol, phash (sınıflandırıcı kabul etti, kaydedilmeyi bekliyor)
+        bitti        yol, sonuc (kaydedildi / birakildi / kayip veya SonucOnbellegi'ndeki red sebebi)
+    """
+
+    def __init__(self, kok_dizin, dosya_adi='.toplama_gunlugu.jsonl'):
+        self.dosya_yolu = os.path.join(kok_dizin, dosya_adi)
+        # sınıf -> {'deneme', 'motor_secimi', 'aramalar': {(terim, motor): deneme}, 'acik_tur'}
+        self.siniflar = {}
+        # geçici dosya yolu -> {'sinif': str, 'phash': str (kabul edildiyse)}
+        self.bekleyenler = {}
+        # işlenip silinmiş geçici dosyalar; aynı arama tekrar çalışırsa yeniden indirilmez
+        self.islenmisler = set()
+        self._satir_sayisi = 0
+        self._kilit = threading.Lock()
+        os.makedirs(kok_dizin, exist_ok=True)
+        self._yukle()
+
+    def _sinif(self, sinif):
+        return self.siniflar.setdefault(sinif, {'deneme': 0, 'motor_secimi': 0, 'aramalar': {}, 'acik_tur': None})
+
+    def _uygula(self, kayit):
+        olay = kayit['olay']
+        if olay == 'sinif':
+            # Sıkıştırılmış günlükteki sınıf durumu
+            durum = self._sinif(kayit['sinif'])
+            durum.update(deneme=kayit['deneme'], motor_secimi=kayit['motor_secimi'], acik_tur=kayit['acik_tur'])
+            durum['aramalar'] = {(terim, motor): deneme for terim, motor, deneme in kayit['aramalar']}
+        elif olay == 'tur_basladi':
+            durum = self._sinif(kayit['sinif'])
+            durum['motor_secimi'] = kayit['motor_secimi']
+            durum['acik_tur'] = {'deneme': kayit['deneme'], 'plan': [list(p) for p in kayit['plan']]}
+        elif olay == 'arama':
+            durum = self._sinif(kayit['sinif'])
+            durum['aramalar'][(kayit['terim'], kayit['motor'])] = kayit['deneme']
+            acik_tur = durum['acik_tur']
+            if acik_tur and acik_tur['deneme'] == kayit['deneme']:
+                acik_tur['plan'] = [p for p in acik_tur['plan'] if p != [kayit['terim'], kayit['motor']]]
+        elif olay == 'tur_bitti':
+            durum = self._sinif(kayit['sinif'])
+            durum['deneme'] = kayit['deneme'] + 1
+            durum['acik_tur'] = None
+        elif olay == 'indirildi':
+            self.bekleyenler[kayit['yol']] = {'sinif': kayit['sinif']}
+        elif olay == 'kabul':
+            if kayit['yol'] in self.bekleyenler:
+                self.bekleyenler[kayit['yol']]['phash'] = kayit['phash']
+        elif olay == 'bitti':
+            self.bekleyenler.pop(kayit['yol'], None)
+            self.islenmisler.add(kayit['yol'])
+
+    def _yukle(self):
+        if not os.path.exists(self.dosya_yolu):
+            return
+        with open(self.dosya_yolu, 'r', encoding='utf-8') as f:
+            for satir in f:
+                self._satir_sayisi += 1
+                try:
+                    self._uygula(json.loads(satir))
+                except (ValueError, KeyError):
+                    # Çökme anında yarım yazılmış son satır
+                    continue
+        durum_boyutu = len(self.siniflar) + len(self.bekleyenler) + len(self.islenmisler)
+        if self._satir_sayisi > 2 * durum_boyutu + 100:
+            self._yeniden_yaz()
+
+    def _yeniden_yaz(self):
+        """Günlüğü güncel durumun özetiyle sıkıştırarak baştan yaz"""
+        gecici_yol = self.dosya_yolu + '.tmp'
+        satirlar = []
+        for sinif, durum in self.siniflar.items():
+            satirlar.append({'olay': 'sinif', 'sinif': sinif, 'deneme': durum['deneme'],
+                             'motor_secimi': durum['motor_secimi'], 'acik_tur': durum['acik_tur'],
+                             'aramalar': [[t, m, d] for (t, m), d in durum['aramalar'].items()]})
+        for yol, kayit in self.bekleyenler.items():
+            satirlar.append({'olay': 'indirildi', 'sinif': kayit['sinif'], 'yol': yol})
+            if 'phash' in kayit:
+                satirlar.append({'olay': 'kabul', 'yol': yol, 'phash': kayit['phash']})
+        satirlar.extend({'olay': 'bitti', 'yol': yol, 'sonuc': 'birakildi'} for yol in self.islenmisler)
+        with open(gecici_yol, 'w', encoding='utf-8') as f:
+            for kayit in satirlar:
+                f.write(json.dumps(kayit, ensure_ascii=False) + '\n')
+        os.replace(gecici_yol, self.dosya_yolu)
+        self._satir_sayisi = len(satirlar)
+
+    def _yaz(self, **kayit):
+        with self._kilit:
+            self._uygula(kayit)
+            with open(self.dosya_yolu, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(kayit, ensure_ascii=False) + '\n')
+            self._satir_sayisi += 1
+
+    def durum(self, sinif):
+        """Sınıfın (deneme, motor_secimi, kullanılan (terim, motor) çiftleri, açık tur) durumu"""
+        with self._kilit:
+            durum = self._sinif(sinif)
+            acik_tur = durum['acik_tur']
+            return {
+                'deneme': durum['deneme'],
+                'motor_secimi': durum['motor_secimi'],
+                'aramalar': dict(durum['aramalar']),
+                'acik_tur': {'deneme': acik_tur['deneme'], 'plan': [tuple(p) for p in acik_tur['plan']]}
+                if acik_tur else None
+            }
+
+    def tur_basladi(self, sinif, deneme, plan, motor_secimi):
+        self._yaz(olay='tur_basladi', sinif=sinif, deneme=deneme, plan=[list(p) for p in plan],
+                  motor_secimi=motor_secimi)
+
+    def arama_bitti(self, sinif, deneme, terim, motor):
+        self._yaz(olay='arama', sinif=sinif, deneme=deneme, terim=terim, motor=motor)
+
+    def tur_bitti(self, sinif, deneme):
+        self._yaz(olay='tur_bitti', sinif=sinif, deneme=deneme)
+
+    def indirildi(self, sinif, yol):
+        self._yaz(olay='indirildi', sinif=sinif, yol=yol)
+
+    def kabul_edildi(self, yol, phash):
+        self._yaz(olay='kabul', yol=yol, phash=str(phash))
+
+    def bitti(self, yol, sonuc='birakildi'):
+        self._yaz(olay='bitti', yol=yol, sonuc=sonuc)
+
+    def bekleyen(self, sinif):
+        """Sınıfın işlenmeyi bekleyen geçici dosyaları: [(yol, phash veya None)]"""
+        with self._kilit:
+            return [(yol, kayit.get('phash')) for yol, kayit in self.bekleyenler.items()
+                    if kayit['sinif'] == sinif]
+
+    def biliniyor_mu(self, yol):
+        """Dosya günlükte bekleyen veya işlenmiş olarak kayıtlı mı"""
+        return yol in self.bekleyenler or yol in self.islenmisler
+
+    def sifirla(self):
+        """Toplama tamamlandığında günlüğü sil; sonraki çalıştırma baştan başlar"""
+        with self._kilit:
+            self.siniflar.clear()
+            self.bekleyenler.clear()
+            self.islenmisler.clear()
+            if os.path.exists(self.dosya_yolu):
+                os.remove(self.dosya_yolu)
+            self._satir_sayisi = 0
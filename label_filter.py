@@ -0,0 +1,72 @@
+import json
+
+import numpy as np
+
+IMAGENET_SINIF_INDEKSI = 'https://storage.googleapis.com/download.tensorflow.org/data/imagenet_class_index.json'
+
+# Her hedef sınıf için kabul edilen ImageNet etiket parçaları
+SINIF_ETIKETLERI = {
+    'kedi': ['cat', 'tabby', 'persian_cat', 'siamese_cat', 'egyptian_cat', 'tiger_cat'],
+    'kopek': ['dog', 'golden_retriever', 'labrador', 'german_shepherd', 'beagle', 'husky',
+              'collie', 'poodle', 'terrier', 'spaniel', 'bulldog', 'hound'],
+    'araba': ['car', 'sports_car', 'passenger_car', 'automobile', 'cab', 'jeep', 'limousine',
+              'convertible', 'minivan', 'race_car', 'pickup', 'model'],
+    'ev': ['house', 'home', 'building', 'residence', 'mansion', 'dwelling', 'palace', 'cottage'],
+    'agac': ['tree', 'forest', 'pine_tree', 'oak', 'maple', 'birch', 'palm', 'juniper', 'cypress'],
+    'insan': ['person', 'people', 'human', 'face', 'man', 'woman', 'child', 'boy', 'girl', 'portrait'],
+    'kus': ['bird', 'parrot', 'eagle', 'sparrow', 'hawk', 'robin', 'cardinal', 'peacock', 'owl',
+            'finch', 'canary', 'chicken', 'pigeon', 'flamingo', 'jay', 'hummingbird'],
+    'cicek': ['flower', 'rose', 'tulip', 'sunflower', 'daisy', 'lily', 'orchid', 'iris',
+              'carnation', 'poppy', 'daffodil', 'blossom', 'petal'],
+    'telefon': ['phone', 'mobile_phone', 'smartphone', 'cellphone', 'iphone', 'telephone'],
+    'bilgisayar': ['computer', 'laptop', 'desktop_computer', 'pc', 'monitor', 'keyboard',
+                   'notebook', 'screen', 'workstation', 'macbook', 'chromebook']
+}
+
+
+def imagenet_etiketleri():
+    """1000 ImageNet sınıfının etiketlerini indeks sırasıyla döndür (decode_predictions ile aynı dosya)"""
+    from tensorflow.keras.utils import get_file
+
+    yol = get_file('imagenet_class_index.json', IMAGENET_SINIF_INDEKSI,
+                   cache_subdir='models', file_hash='c2c37ea517e94d9795004a39431a14cb')
+    with open(yol) as f:
+        sinif_indeksi = json.load(f)
+    return [sinif_indeksi[str(i)][1] for i in range(len(sinif_indeksi))]
+
+
+class EtiketFiltresi:
+    """
+    Model çıktısını hedef sınıfa göre kabul/red eden filtre.
+
+    Her hedef sınıf bir kez 1000 ImageNet indeksi üzerinde boolean maskeye
+    çevrilir; kabul kararı tüm batch için tek bir NumPy işlemidir.
+
+    yontem='max': sınıfa ait etiketlerden birinin olasılığı esik'i geçerse
+        kabul (softmax'ta 0.2'yi geçen etiketler zaten ilk 5'tedir, bu yüzden
+        eski top-5 + skor > 0.2 kontrolüyle aynı sonucu verir).
+    yontem='toplam': sınıfa ait etiketlerin toplam olasılığı esik'i geçerse
+        kabul (olasılık birçok köpek ırkına dağıldığında da yakalar).
+    """
+
+    def __init__(self, siniflar, esik=0.2, yontem='max', etiketler=None):
+        if yontem not in ('max', 'toplam'):
+            raise ValueError(f"Bilinmeyen filtre yöntemi: {yontem}")
+        self.esik = esik
+        self.yontem = yontem
+        etiketler = [e.lower() for e in (etiketler or imagenet_etiketleri())]
+        self.sinif_indeksleri = {sinif: i for i, sinif in enumerate(siniflar)}
+        self.maskeler = np.zeros((len(siniflar), len(etiketler)), dtype=bool)
+        for sinif, i in self.sinif_indeksleri.items():
+            kabul_edilen = [k.lower() for k in SINIF_ETIKETLERI.get(sinif, [])]
+            self.maskeler[i] = [any(k in etiket for k in kabul_edilen) for etiket in etiketler]
+
+    def kabul_et(self, tahminler, beklenen_siniflar):
+        """
+        tahminler: (batch, 1000) olasılıklar, beklenen_siniflar: her satırın
+        hedef sınıf adı. Kabul edilen satırlar için True içeren dizi döndürür.
+        """
+        maskeler = self.maskeler[[self.sinif_indeksleri[s] for s in beklenen_siniflar]]
+        if self.yontem == 'toplam':
+            return np.where(maskeler, tahminler, 0).sum(axis=1) > self.esik
+        return np.where(maskeler, tahminler, 0).max(axis=1) > self.esik
@@ -0,0 +1,225 @@
+import json
+import time
+import threading
+from contextlib import nullcontext
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Prometheus çıktısında her bölümün iç içe sözlük seviyelerine verilen etiket adları;
+# kalan seviye sayıysa metrik adı toplama_<bölüm>, sözlükse toplama_<bölüm>_<alan> olur
+PROMETHEUS_ETIKETLERI = {
+    'asamalar': ('asama',),
+    'sonuclar': ('sinif', 'sonuc'),
+    'kuyruklar': ('kuyruk',),
+    'indirici': (),
+    'onbellek': (),
+    'motorlar': ('motor',),
+    'terimler': ('sinif', 'terim'),
+}
+# Anlık değerler; diğer tüm aileler yalnızca artan sayaçlardır
+GOSTERGELER = ('toplama_kuyruklar', 'toplama_asamalar_ort_ms', 'toplama_motorlar_verim')
+
+
+class _KapaliMetrikler:
+    """Ölçüm kapalıyken kullanılan, hiçbir şey yapmayan metrik nesnesi"""
+
+    acik = False
+    _bos = nullcontext()
+
+    def olc(self, asama):
+        return self._bos
+
+    def sure_ekle(self, **sureler):
+        pass
+
+    def sonuc_say(self, sinif, sonuc):
+        pass
+
+    def kaynak_ekle(self, bolum, fonksiyon):
+        pass
+
+    def kapat(self):
+        pass
+
+
+KAPALI = _KapaliMetrikler()
+
+
+class _Olcum:
+    __slots__ = ('metrikler', 'asama', 'baslangic')
+
+    def __init__(self, metrikler, asama):
+        self.metrikler = metrikler
+        self.asama = asama
+
+    def __enter__(self):
+        self.baslangic = time.perf_counter()
+
+    def __exit__(self, *hata):
+        self.metrikler.sure_ekle(**{self.asama: time.perf_counter() - self.baslangic})
+
+
+class ToplamaMetrikleri:
+    """
+    Toplama hattının aşama süreleri (arama, indirme, çözme, phash, tahmin,
+    kaydetme), sınıf başına sonuç sayaçları ve kaynak_ekle ile bağlanan
+    anlık değerler (kuyruk derinlikleri, indirici/önbellek sayaçları,
+    motor ve terim verimleri).
+
+    dosya_yolu verilirse her aralik saniyede bir ozet() JSON satırı olarak
+    dosyanın sonuna eklenir (kapat() son durumu da yazar). port verilirse
+    GET /metrics Prometheus metin biçimini, GET /metrikler aynı özeti JSON
+    olarak döndürür.
+    """
+
+    acik = True
+
+    def __init__(self, dosya_yolu=None, aralik=10, host='127.0.0.1', port=None):
+        self.dosya_yolu = dosya_yolu
+        self.aralik = aralik
+        self._baslangic = time.time()
+        # aşama -> [adet, toplam saniye]
+        self._asamalar = {}
+        # sınıf -> {sonuç: adet}
+        self._sonuclar = {}
+        # bölüm -> anlık değerleri döndüren fonksiyon
+        self._kaynaklar = {}
+        self._kilit = threading.Lock()
+        self._dur = threading.Event()
+        self._yazici = None
+        self._sunucu = None
+        if dosya_yolu:
+            self._yazici = threading.Thread(target=self._periyodik_yaz, name="metrik-yazici", daemon=True)
+            self._yazici.start()
+        if port is not None:
+            self._sunucu = ThreadingHTTPServer((host, port), _istek_isleyici_olustur(self))
+            self._sunucu.daemon_threads = True
+            threading.Thread(target=self._sunucu.serve_forever, name="metrik-sunucu", daemon=True).start()
+
+    @property
+    def adres(self):
+        if self._sunucu is None:
+            return None
+        host, port = self._sunucu.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def olc(self, asama):
+        """with bloğunun süresini aşamaya ekleyen bağlam yöneticisi"""
+        return _Olcum(self, asama)
+
+    def sure_ekle(self, **sureler):
+        """Başka yerde ölçülmüş süreleri ekle: sure_ekle(cozme=0.01, phash=0.002)"""
+        with self._kilit:
+            for asama, saniye in sureler.items():
+                sayac = self._asamalar.get(asama)
+                if sayac is None:
+                    sayac = self._asamalar[asama] = [0, 0.0]
+                sayac[0] += 1
+                sayac[1] += saniye
+
+    def sonuc_say(self, sinif, sonuc):
+        with self._kilit:
+            sayaclar = self._sonuclar.setdefault(sinif, {})
+            sayaclar[sonuc] = sayaclar.get(sonuc, 0) + 1
+
+    def kaynak_ekle(self, bolum, fonksiyon):
+        """ozet()'e her çağrıda fonksiyon() sonucunu bolum adıyla ekle"""
+        with self._kilit:
+            self._kaynaklar[bolum] = fonksiyon
+
+    def ozet(self):
+        with self._kilit:
+            ozet = {
+                'zaman': round(time.time(), 3),
+                'gecen_sn': round(time.time() - self._baslangic, 3),
+                'asamalar': {asama: {'adet': adet, 'saniye': round(saniye, 6),
+                                     'ort_ms': round(1000 * saniye / adet, 3)}
+                             for asama, (adet, saniye) in self._asamalar.items()},
+                'sonuclar': {sinif: dict(sayaclar) for sinif, sayaclar in self._sonuclar.items()},
+            }
+            kaynaklar = list(self._kaynaklar.items())
+        for bolum, fonksiyon in kaynaklar:
+            try:
+                ozet[bolum] = fonksiyon()
+            except Exception as e:
+                ozet[bolum] = {'hata': str(e)}
+        return ozet
+
+    def prometheus(self):
+        """ozet()'i Prometheus metin biçimine çevir"""
+        aileler = {}
+        for bolum, deger in self.ozet().items():
+            if bolum in PROMETHEUS_ETIKETLERI:
+                _duzlestir(aileler, f"toplama_{bolum}", PROMETHEUS_ETIKETLERI[bolum], deger, {})
+        satirlar = []
+        for ad, ornekler in aileler.items():
+            satirlar.append(f"# TYPE {ad} {'gauge' if ad in GOSTERGELER else 'counter'}")
+            satirlar.extend(ornekler)
+        return '\n'.join(satirlar) + '\n'
+
+    def _yaz(self):
+        with open(self.dosya_yolu, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.ozet(), ensure_ascii=False) + '\n')
+
+    def _periyodik_yaz(self):
+        while not self._dur.wait(self.aralik):
+            self._yaz()
+
+    def kapat(self):
+        """Son durumu dosyaya yaz, yazıcıyı ve HTTP sunucusunu durdur"""
+        self._dur.set()
+        if self._yazici is not None:
+            self._yazici.join()
+            self._yaz()
+        if self._sunucu is not None:
+            self._sunucu.shutdown()
+            self._sunucu.server_close()
+
+
+def _etiket_degeri(deger):
+    return str(deger).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _duzlestir(aileler, ad, etiket_adlari, deger, etiketler):
+    if etiket_adlari:
+        for anahtar, alt in deger.items():
+            _duzlestir(aileler, ad, etiket_adlari[1:], alt, dict(etiketler, **{etiket_adlari[0]: anahtar}))
+        return
+    if isinstance(deger, dict):
+        for alan, alt in deger.items():
+            _duzlestir(aileler, f"{ad}_{alan}", (), alt, etiketler)
+        return
+    if not isinstance(deger, (int, float)):
+        return
+    etiket = ','.join(f'{k}="{_etiket_degeri(v)}"' for k, v in etiketler.items())
+    aileler.setdefault(ad, []).append(f"{ad}{{{etiket}}} {deger}" if etiket else f"{ad} {deger}")
+
+
+def _istek_isleyici_olustur(metrikler):
+    class MetrikIsleyici(BaseHTTPRequestHandler):
+        def _yanit(self, tur, govde):
+            govde = govde.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', tur)
+            self.send_header('Content-Length', str(len(govde)))
+            self.end_headers()
+            self.wfile.write(govde)
+
+        def do_GET(self):
+            if self.path == '/metrics':
+                self._yanit('text/plain; version=0.0.4; charset=utf-8', metrikler.prometheus())
+            elif self.path == '/metrikler':
+                self._yanit('application/json; charset=utf-8', json.dumps(metrikler.ozet(), ensure_ascii=False))
+            else:
+                self.send_error(404)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetrikIsleyici
+
+
+def metrikler_olustur(dosya_yolu=None, aralik=10, port=None):
+    """Dosya veya port verilmediyse ölçüm kapalıdır (KAPALI: her çağrı boş işlem)"""
+    if not dosya_yolu and port is None:
+        return KAPALI
+    return ToplamaMetrikleri(dosya_yolu, aralik, port=port)
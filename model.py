@@ -1,68 +1,235 @@
+import re
+
 import tensorflow as tf
 from tensorflow.keras import layers, Model
 from tensorflow.keras.applications import ResNet50
 
-def squeeze_excite_block(input_tensor, ratio=16):
+# ResNet50 aşamaları: (aşama numarası, filtre sayısı, blok sayısı)
+RESNET50_ASAMALARI = [(2, 64, 3), (3, 128, 4), (4, 256, 6), (5, 512, 3)]
+BN_EPSILON = 1.001e-5
+
+def squeeze_excite_block(input_tensor, ratio=16, name=None):
     """Squeeze and Excitation bloğu"""
     filters = input_tensor.shape[-1]
-    
+    isim = (lambda ek: f"{name}_{ek}") if name else (lambda ek: None)
+
     # Squeeze operation
-    squeeze = layers.GlobalAveragePooling2D()(input_tensor)
-    
+    squeeze = layers.GlobalAveragePooling2D(name=isim('squeeze'))(input_tensor)
+
     # Excitation operation
-    excitation = layers.Dense(filters // ratio, activation='relu')(squeeze)
-    excitation = layers.Dense(filters, activation='sigmoid')(excitation)
-    excitation = layers.Reshape((1, 1, filters))(excitation)
-    
+    excitation = layers.Dense(filters // ratio, activation='relu', name=isim('reduce'))(squeeze)
+    excitation = layers.Dense(filters, activation='sigmoid', name=isim('expand'))(excitation)
+    excitation = layers.Reshape((1, 1, filters), name=isim('reshape'))(excitation)
+
     # Scale
-    scale = layers.multiply([input_tensor, excitation])
-    
+    scale = layers.multiply([input_tensor, excitation], name=isim('scale'))
+
     return scale
 
-def create_se_resnet(sinif_sayisi=10, input_shape=(224, 224, 3)):
-    """SENet mimarisi (ResNet50 tabanlı)"""
-    
-    # Base model olarak ResNet50 kullan
-    base_model = ResNet50(
-        weights='imagenet',
-        include_top=False,
-        input_shape=input_shape
-    )
-    
-    # Base model katmanlarını dondur
-    for layer in base_model.layers:
-        layer.trainable = False
-    
-    # SE bloklarını ekle
-    x = base_model.output
-    
-    # Her konvolüsyon bloğuna SE bloğu ekle
-    for i in range(1, 6):
-        if i > 3:  # Son bloklara SE ekle
-            block_name = f'conv{i}_block3_out'
-            try:
-                block_output = base_model.get_layer(block_name).output
-                x = squeeze_excite_block(block_output)
-            except:
-                continue
-    
+def _conv_bn(x, filters, kernel_size, name, strides=1, padding='valid'):
+    x = layers.Conv2D(filters, kernel_size, strides=strides, padding=padding, name=f'{name}_conv')(x)
+    return layers.BatchNormalization(axis=3, epsilon=BN_EPSILON, name=f'{name}_bn')(x)
+
+def _residual_blok(x, filters, name, stride=1, conv_shortcut=False, se_ratio=None):
+    """
+    keras.applications ResNet50 ile aynı isimli bottleneck bloğu. se_ratio
+    verilirse SE bloğu artık (residual) dala, toplamadan önce eklenir.
+    """
+    if conv_shortcut:
+        shortcut = _conv_bn(x, 4 * filters, 1, f'{name}_0', strides=stride)
+    else:
+        shortcut = x
+
+    x = _conv_bn(x, filters, 1, f'{name}_1', strides=stride)
+    x = layers.Activation('relu', name=f'{name}_1_relu')(x)
+    x = _conv_bn(x, filters, 3, f'{name}_2', padding='same')
+    x = layers.Activation('relu', name=f'{name}_2_relu')(x)
+    x = _conv_bn(x, 4 * filters, 1, f'{name}_3')
+
+    if se_ratio is not None:
+        x = squeeze_excite_block(x, ratio=se_ratio, name=f'{name}_se')
+
+    x = layers.Add(name=f'{name}_add')([shortcut, x])
+    return layers.Activation('relu', name=f'{name}_out')(x)
+
+def resnet_asamalari(x, baslangic_asamasi=2, se_asamalari=(4, 5), ratio=16):
+    """ResNet50 aşamalarını baslangic_asamasi'ndan itibaren uygula; seçilen aşamalara SE ekle"""
+    for asama, filters, blok_sayisi in RESNET50_ASAMALARI:
+        if asama < baslangic_asamasi:
+            continue
+        se_ratio = ratio if asama in se_asamalari else None
+        for blok in range(1, blok_sayisi + 1):
+            x = _residual_blok(
+                x, filters, f'conv{asama}_block{blok}',
+                stride=(1 if asama == 2 else 2) if blok == 1 else 1,
+                conv_shortcut=blok == 1,
+                se_ratio=se_ratio
+            )
+    return x
+
+def ozellik_katmani(se_asamalari):
+    """
+    İlk eğitim aşamasında tamamen donuk kalan omurganın son katmanı: ilk SE
+    bloğunu içeren aşamadan hemen önceki çıktı.
+    """
+    if not se_asamalari:
+        return 'conv5_block3_out'
+    ilk = min(se_asamalari)
+    if ilk == 2:
+        return 'pool1_pool'
+    onceki = next(a for a in RESNET50_ASAMALARI if a[0] == ilk - 1)
+    return f'conv{onceki[0]}_block{onceki[2]}_out'
+
+def se_yapilandirmasi(model):
+    """Model katmanlarından (SE içeren aşamalar, SE ratio) çıkar"""
+    asamalar = set()
+    ratio = 16
+    for layer in model.layers:
+        eslesme = re.match(r'conv(\d)_block\d+_se_reduce$', layer.name)
+        if eslesme:
+            asamalar.add(int(eslesme.group(1)))
+            ratio = layer.kernel.shape[0] // layer.units
+    return tuple(sorted(asamalar)), ratio
+
+def siniflandirma_basi(x, sinif_sayisi=10):
+    """Omurga çıktısı üzerine isimli sınıflandırma katmanlarını ekle"""
+    x = layers.GlobalAveragePooling2D(name='head_pool')(x)
+    x = layers.Dense(1024, activation='relu', name='head_dense_1')(x)
+    x = layers.BatchNormalization(name='head_bn_1')(x)
+    x = layers.Dropout(0.5, name='head_dropout_1')(x)
+    x = layers.Dense(512, activation='relu', name='head_dense_2')(x)
+    x = layers.BatchNormalization(name='head_bn_2')(x)
+    x = layers.Dropout(0.3, name='head_dropout_2')(x)
+    # Karma hassasiyette de softmax float32 hesaplanır (sayısal kararlılık için)
+    return layers.Dense(sinif_sayisi, activation='softmax', dtype='float32', name='predictions')(x)
+
+def _onceden_egitilmisleri_dondur(model):
+    """ImageNet'ten gelen ResNet katmanlarını dondur; SE ve sınıflandırma katmanları eğitilebilir kalır"""
+    for layer in model.layers:
+        if layer.name.startswith(('conv', 'pool')) and '_se_' not in layer.name:
+            layer.trainable = False
+
+def create_se_head(sinif_sayisi=10, ozellik_sekli=(28, 28, 512), se_asamalari=(4, 5), ratio=16):
+    """
+    ozellik_katmani(se_asamalari) çıktısını girdi alan, kalan ResNet
+    aşamaları + SE blokları + sınıflandırma başından oluşan model. Katman
+    isimleri create_se_resnet ile aynıdır, ağırlıklar isimle aktarılabilir.
+    """
+    girdi = layers.Input(shape=ozellik_sekli, name='ozellik_girdisi')
+    baslangic = min(se_asamalari) if se_asamalari else 6
+    x = resnet_asamalari(girdi, baslangic, se_asamalari, ratio)
+    model = Model(inputs=girdi, outputs=siniflandirma_basi(x, sinif_sayisi), name='se_head')
+    _onceden_egitilmisleri_dondur(model)
+    return model
+
+def agirliklari_aktar(kaynak, hedef):
+    """Aynı isimli katmanların ağırlıklarını kaynak modelden hedefe kopyala"""
+    hedef_katmanlar = {layer.name: layer for layer in hedef.layers}
+    for layer in kaynak.layers:
+        if layer.weights and layer.name in hedef_katmanlar:
+            hedef_katmanlar[layer.name].set_weights(layer.get_weights())
+
+def create_se_resnet(sinif_sayisi=10, input_shape=(224, 224, 3), weights='imagenet',
+                     se_asamalari=(4, 5), ratio=16):
+    """
+    SE-ResNet50: SE blokları seçilen aşamalardaki (2-5) her residual bloğun
+    artık dalına eklenir. ImageNet ağırlıkları keras ResNet50'den katman
+    ismiyle kopyalanır ve dondurulur; yalnızca SE ve sınıflandırma katmanları eğitilir.
+    """
+    girdi = layers.Input(shape=input_shape, name='input_layer')
+
+    # Stem: keras ResNet50 ile aynı katmanlar
+    x = layers.ZeroPadding2D(padding=3, name='conv1_pad')(girdi)
+    x = _conv_bn(x, 64, 7, 'conv1', strides=2)
+    x = layers.Activation('relu', name='conv1_relu')(x)
+    x = layers.ZeroPadding2D(padding=1, name='pool1_pad')(x)
+    x = layers.MaxPooling2D(3, strides=2, name='pool1_pool')(x)
+
+    # SE bloklarını residual yollara ekle
+    x = resnet_asamalari(x, 2, se_asamalari, ratio)
+
     # Sınıflandırma katmanları
-    x = layers.GlobalAveragePooling2D()(x)
-    x = layers.Dense(1024, activation='relu')(x)
-    x = layers.BatchNormalization()(x)
-    x = layers.Dropout(0.5)(x)
-    x = layers.Dense(512, activation='relu')(x)
-    x = layers.BatchNormalization()(x)
-    x = layers.Dropout(0.3)(x)
-    predictions = layers.Dense(sinif_sayisi, activation='softmax')(x)
-    
+    predictions = siniflandirma_basi(x, sinif_sayisi)
+
     # Model oluştur
-    model = Model(inputs=base_model.input, outputs=predictions)
-    
+    model = Model(inputs=girdi, outputs=predictions, name='se_resnet50')
+
+    if weights is not None:
+        base_model = ResNet50(weights=weights, include_top=False, input_shape=input_shape)
+        agirliklari_aktar(base_model, model)
+
+    # Base model katmanlarını dondur
+    _onceden_egitilmisleri_dondur(model)
+
     return model
 
-def model_olustur(sinif_sayisi=10):
+def model_maliyeti(model):
+    """
+    (toplam parametre, eğitilebilir parametre, tek resim için FLOP) döndür.
+    FLOP'lar Conv2D/Dense çarp-topla işlemleri (x2) ve SE ölçekleme/toplama
+    gibi eleman bazlı işlemlerden hesaplanır.
+    """
+    flops = 0
+    for layer in model.layers:
+        if isinstance(layer, layers.Conv2D):
+            kh, kw, cin, cout = layer.kernel.shape
+            _, h, w, _ = layer.output.shape
+            flops += 2 * h * w * kh * kw * cin * cout
+        elif isinstance(layer, layers.Dense):
+            cin, cout = layer.kernel.shape
+            flops += 2 * cin * cout
+        elif isinstance(layer, (layers.Add, layers.Multiply, layers.BatchNormalization)):
+            boyut = 1
+            for d in layer.output.shape[1:]:
+                boyut *= d
+            flops += boyut
+    egitilebilir = sum(int(tf.size(w)) for w in model.trainable_weights)
+    return model.count_params(), egitilebilir, flops
+
+def bf16_destekleniyor():
+    """CPU'da bfloat16 hızlandırması (AVX512-BF16 / AMX) var mı"""
+    if tf.config.list_physical_devices('GPU'):
+        return True
+    try:
+        with open('/proc/cpuinfo') as f:
+            bayraklar = f.read()
+    except OSError:
+        return False
+    return 'avx512_bf16' in bayraklar or 'amx_bf16' in bayraklar
+
+def hizli_egitim_ayarla(mod='kapali'):
+    """
+    Karma hassasiyet politikasını ayarla. Model oluşturulmadan önce çağrılmalı.
+    mod: 'kapali' (float32), 'float16' (mixed_float16, kayıp ölçekleme ile)
+    veya 'bfloat16' (mixed_bfloat16, CPU'da desteklenmiyorsa float32'ye döner).
+    Etkin politika adını döndürür.
+    """
+    politika = {'kapali': 'float32', 'float16': 'mixed_float16', 'bfloat16': 'mixed_bfloat16'}[mod]
+    if politika == 'mixed_bfloat16' and not bf16_destekleniyor():
+        print("Uyarı: bu işlemcide bfloat16 hızlandırması yok, float32 kullanılıyor.")
+        politika = 'float32'
+    tf.keras.mixed_precision.set_global_policy(politika)
+    return politika
+
+def model_derle(model, ogrenme_orani, hizli=False):
+    """
+    Modeli Adam ile derle. hizli=True ise XLA (jit_compile) açılır ve
+    mixed_float16 politikasında kayıp ölçeklemeli optimizer kullanılır.
+    """
+    optimizer = tf.keras.optimizers.Adam(ogrenme_orani)
+    if tf.keras.mixed_precision.global_policy().name == 'mixed_float16':
+        optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+    model.compile(
+        optimizer=optimizer,
+        loss='categorical_crossentropy',
+        metrics=['accuracy'],
+        jit_compile=hizli
+    )
+    return model
+
+def model_olustur(sinif_sayisi=10, weights='imagenet', se_asamalari=(4, 5), ratio=16):
     """Ana model oluşturma fonksiyonu"""
-    model = create_se_resnet(sinif_sayisi=sinif_sayisi)
-    
-    return model 
\ No newline at end of file
+    model = create_se_resnet(sinif_sayisi=sinif_sayisi, weights=weights,
+                             se_asamalari=se_asamalari, ratio=ratio)
+
+    return model
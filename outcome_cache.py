@@ -0,0 +1,126 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+# Önbelleğe alınan sonuçlar; diğerleri (hedefe ulaşıldı, hat durdu vb.) kalıcı değildir
+SONUCLAR = (
+    'kaydedildi',   # kabul edilip dataset'e yazıldı
+    'reddedildi',   # indirilirken reddedildi (resim değil, çok büyük/küçük, 4xx)
+    'boyut',        # çözüldü ama 150 pikselden küçük
+    'bozuk',        # çözülemedi
+    'kopya',        # kaydedilmiş bir resmin yakın kopyası
+    'sinif',        # filtre modeli hedef sınıfa ait bulmadı
+)
+
+
+class SonucOnbellegi:
+    """
+    Daha önce görülmüş URL'lerin ve bayt özetlerinin (SHA-256) sonuçlarını
+    çalıştırmalar, turlar ve arama motorları arasında saklar; bilinen bir URL
+    indirilmeden, bilinen baytlar çözülmeden elenir.
+
+    Kayıtlar HashIndex gibi JSON satırları olarak dosyanın sonuna eklenir.
+    Bellekte en fazla kapasite kadar anahtar tutulur, en uzun süredir
+    kullanılmayan atılır (LRU); kapat() dosyayı kullanım sırasıyla sıkıştırır.
+
+    'sinif' sonucu yalnızca aynı hedef sınıf ve aynı filtre ayarları
+    (filtre_imzasi) için geçerlidir; diğer sonuçlar her sınıf için geçerlidir.
+    kapasite=0 ise önbellek kapalıdır.
+    """
+
+    def __init__(self, kok_dizin, kapasite=200_000, filtre_imzasi='', dosya_adi='.sonuc_onbellegi.jsonl'):
+        self.dosya_yolu = os.path.join(kok_dizin, dosya_adi)
+        self.kapasite = kapasite
+        self.filtre_imzasi = filtre_imzasi
+        # 'u:<url>' veya 'h:<sha256>' -> {'sonuc': str, 'siniflar': [...], 'filtre': str}
+        self.kayitlar = OrderedDict()
+        self.sayaclar = {'url_isabet': 0, 'ozet_isabet': 0, 'yeni': 0, 'atilan': 0}
+        self._satir_sayisi = 0
+        self._degisti = False
+        self._kilit = threading.Lock()
+        if self.kapasite:
+            os.makedirs(kok_dizin, exist_ok=True)
+            self._yukle()
+
+    def _yukle(self):
+        if not os.path.exists(self.dosya_yolu):
+            return
+        with open(self.dosya_yolu, 'r', encoding='utf-8') as f:
+            for satir in f:
+                self._satir_sayisi += 1
+                try:
+                    kayit = json.loads(satir)
+                    anahtar = kayit.pop('anahtar')
+                except (ValueError, KeyError):
+                    # Çökme anında yarım yazılmış son satır
+                    continue
+                self.kayitlar[anahtar] = kayit
+                self.kayitlar.move_to_end(anahtar)
+        while len(self.kayitlar) > self.kapasite:
+            self.kayitlar.popitem(last=False)
+        if self._satir_sayisi > 2 * len(self.kayitlar) + 1000:
+            self._yeniden_yaz()
+
+    def _yeniden_yaz(self):
+        """Dosyayı en eski kullanılandan en yeniye sıkıştırarak baştan yaz"""
+        gecici_yol = self.dosya_yolu + '.tmp'
+        with open(gecici_yol, 'w', encoding='utf-8') as f:
+            for anahtar, kayit in self.kayitlar.items():
+                f.write(json.dumps(dict(anahtar=anahtar, **kayit), ensure_ascii=False) + '\n')
+        os.replace(gecici_yol, self.dosya_yolu)
+        self._satir_sayisi = len(self.kayitlar)
+        self._degisti = False
+
+    def _gecerli(self, kayit, sinif):
+        if kayit['sonuc'] != 'sinif':
+            return True
+        return sinif in kayit.get('siniflar', ()) and kayit.get('filtre') == self.filtre_imzasi
+
+    def bak(self, url=None, ozet=None, sinif=None):
+        """URL'nin veya bayt özetinin hedef sınıf için bilinen sonucu, yoksa None"""
+        if not self.kapasite:
+            return None
+        with self._kilit:
+            for anahtar, sayac in ((f"u:{url}", 'url_isabet'), (f"h:{ozet}", 'ozet_isabet')):
+                kayit = self.kayitlar.get(anahtar)
+                if kayit is not None and self._gecerli(kayit, sinif):
+                    self.kayitlar.move_to_end(anahtar)
+                    self.sayaclar[sayac] += 1
+                    self._degisti = True
+                    return kayit['sonuc']
+        return None
+
+    def kaydet(self, sonuc, url=None, ozet=None, sinif=None):
+        """Sonucu URL ve/veya bayt özeti için kaydet"""
+        if not self.kapasite or sonuc not in SONUCLAR:
+            return
+        anahtarlar = ([f"u:{url}"] if url else []) + ([f"h:{ozet}"] if ozet else [])
+        if not anahtarlar:
+            return
+        with self._kilit, open(self.dosya_yolu, 'a', encoding='utf-8') as f:
+            for anahtar in anahtarlar:
+                kayit = {'sonuc': sonuc}
+                if sonuc == 'sinif':
+                    onceki = self.kayitlar.get(anahtar)
+                    # Aynı filtreyle başka sınıflar için de reddedildiyse onlar da korunur
+                    siniflar = set(onceki.get('siniflar', ())) if onceki and onceki['sonuc'] == 'sinif' \
+                        and onceki.get('filtre') == self.filtre_imzasi else set()
+                    kayit.update(siniflar=sorted(siniflar | {sinif}), filtre=self.filtre_imzasi)
+                self.kayitlar[anahtar] = kayit
+                self.kayitlar.move_to_end(anahtar)
+                f.write(json.dumps(dict(anahtar=anahtar, **kayit), ensure_ascii=False) + '\n')
+                self._satir_sayisi += 1
+                self.sayaclar['yeni'] += 1
+            while len(self.kayitlar) > self.kapasite:
+                self.kayitlar.popitem(last=False)
+                self.sayaclar['atilan'] += 1
+            self._degisti = True
+
+    def kapat(self):
+        """Kullanım sırasını (LRU) kalıcı yapmak için dosyayı sıkıştır"""
+        if not self.kapasite:
+            return
+        with self._kilit:
+            if self._degisti:
+                self._yeniden_yaz()
@@ -0,0 +1,171 @@
+import queue
+import threading
+
+# Kuyruklarda "girdi bitti" işareti
+_BITTI = object()
+
+
+class ToplamaHatti:
+    """
+    İndirme → çözme → sınıflandırma → kaydetme aşamalarını sınırlı
+    kuyruklarla birbirine bağlayan akış hattı.
+
+    Aşamalar aynı anda çalışır; kuyruk dolduğunda üretici bekler (geri
+    basınç), bu yüzden sabit süreli beklemelere gerek kalmaz. `kaydet`
+    True döndürdüğünde (hedef sayıya ulaşıldığında) hat durur.
+
+    Aşama fonksiyonları:
+        coz(oge)            -> çözülmüş öğe veya None (reddedildi)
+        siniflandir(ogeler) -> kabul edilen öğelerin listesi
+        kaydet(oge)         -> hedefe ulaşıldıysa True
+        birak(oge)          -> hattan düşen öğenin kaynaklarını serbest bırak
+    """
+
+    def __init__(self, coz, siniflandir, kaydet, birak=None, cozucu_sayisi=4,
+                 batch_boyutu=50, kuyruk_boyutu=128, batch_bekleme=0.5):
+        self.coz = coz
+        self.siniflandir = siniflandir
+        self.kaydet = kaydet
+        self.birak = birak or (lambda oge: None)
+        self.cozucu_sayisi = cozucu_sayisi
+        self.batch_boyutu = batch_boyutu
+        self.batch_bekleme = batch_bekleme
+
+        self.girdi_kuyrugu = queue.Queue(kuyruk_boyutu)
+        self.tahmin_kuyrugu = queue.Queue(kuyruk_boyutu)
+        self.kayit_kuyrugu = queue.Queue(kuyruk_boyutu)
+        self.dur = threading.Event()
+
+        self._kilit = threading.Lock()
+        self._biten_cozucu = 0
+        self._threadler = []
+
+    def baslat(self):
+        self._threadler = [threading.Thread(target=self._cozucu, name=f"cozucu-{i}", daemon=True)
+                           for i in range(self.cozucu_sayisi)]
+        self._threadler.append(threading.Thread(target=self._siniflandirici, name="siniflandirici", daemon=True))
+        self._threadler.append(threading.Thread(target=self._kaydedici, name="kaydedici", daemon=True))
+        for t in self._threadler:
+            t.start()
+        return self
+
+    def _koy(self, kuyruk, oge):
+        """Kuyruk boşalana kadar bekle; hat durdurulduysa False döndür"""
+        while not self.dur.is_set():
+            try:
+                kuyruk.put(oge, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def gonder(self, oge):
+        """Hattın girişine bir öğe ekle (kuyruk doluysa bekler)"""
+        if not self._koy(self.girdi_kuyrugu, oge):
+            self.birak(oge)
+            return False
+        return True
+
+    def bitir(self):
+        """Yeni girdi gelmeyeceğini bildir; kuyruktakiler işlenmeye devam eder"""
+        for _ in range(self.cozucu_sayisi):
+            if not self._koy(self.girdi_kuyrugu, _BITTI):
+                break
+
+    def durdur(self):
+        self.dur.set()
+
+    def bekle(self):
+        for t in self._threadler:
+            t.join()
+        # Durdurulan hatta kalan öğeleri serbest bırak
+        for kuyruk in (self.girdi_kuyrugu, self.tahmin_kuyrugu, self.kayit_kuyrugu):
+            while True:
+                try:
+                    oge = kuyruk.get_nowait()
+                except queue.Empty:
+                    break
+                if oge is not _BITTI:
+                    self.birak(oge)
+
+    def _al(self, kuyruk, zaman_asimi=0.1):
+        """Hat durdurulana kadar kuyruktan öğe almayı dene"""
+        while not self.dur.is_set():
+            try:
+                return kuyruk.get(timeout=zaman_asimi)
+            except queue.Empty:
+                continue
+        return _BITTI
+
+    def _cozucu(self):
+        while True:
+            oge = self._al(self.girdi_kuyrugu)
+            if oge is _BITTI:
+                break
+            try:
+                cozulmus = self.coz(oge)
+            except Exception as e:
+                print(f"Resim yüklemede hata: {e}")
+                cozulmus = None
+            if cozulmus is None:
+                self.birak(oge)
+            elif not self._koy(self.tahmin_kuyrugu, cozulmus):
+                self.birak(cozulmus)
+        with self._kilit:
+            self._biten_cozucu += 1
+            son_cozucu = self._biten_cozucu == self.cozucu_sayisi
+        if son_cozucu:
+            self._koy(self.tahmin_kuyrugu, _BITTI)
+
+    def _batch_isle(self, batch):
+        try:
+            kabul_edilenler = self.siniflandir(batch)
+        except Exception as e:
+            print(f"Batch tahmin hatası: {e}")
+            kabul_edilenler = []
+        kabul_idleri = {id(oge) for oge in kabul_edilenler}
+        for oge in batch:
+            if id(oge) not in kabul_idleri:
+                self.birak(oge)
+        for oge in kabul_edilenler:
+            if not self._koy(self.kayit_kuyrugu, oge):
+                self.birak(oge)
+
+    def _siniflandirici(self):
+        bitti = False
+        while not bitti:
+            oge = self._al(self.tahmin_kuyrugu)
+            if oge is _BITTI:
+                break
+            # Batch dolana ya da batch_bekleme süresi geçene kadar öğe topla
+            batch = [oge]
+            while len(batch) < self.batch_boyutu:
+                try:
+                    oge = self.tahmin_kuyrugu.get(timeout=self.batch_bekleme)
+                except queue.Empty:
+                    break
+                if oge is _BITTI:
+                    bitti = True
+                    break
+                batch.append(oge)
+            if self.dur.is_set():
+                for oge in batch:
+                    self.birak(oge)
+                break
+            self._batch_isle(batch)
+        self._koy(self.kayit_kuyrugu, _BITTI)
+
+    def _kaydedici(self):
+        while True:
+            oge = self._al(self.kayit_kuyrugu)
+            if oge is _BITTI:
+                break
+            try:
+                hedefe_ulasildi = self.kaydet(oge)
+            except Exception as e:
+                print(f"Resim kaydetme hatası: {e}")
+                hedefe_ulasildi = False
+            self.birak(oge)
+            if hedefe_ulasildi:
+                self.durdur()
+                break
@@ -0,0 +1,125 @@
+import math
+import random
+import threading
+
+
+class AramaButcesi:
+    """
+    Tüm sınıflarda aynı anda çalışan arama sayısını sınırlayan semafor.
+    Yer boşaldığında bekleyenler arasından önceliği (oncelik(sinif))
+    en yüksek olan, yani hedefine en uzak sınıf alır.
+    """
+
+    def __init__(self, boyut, oncelik):
+        self.boyut = boyut
+        self.oncelik = oncelik
+        self._kosul = threading.Condition()
+        self._kullanilan = 0
+        # sınıf -> bekleyen arama sayısı
+        self._bekleyenler = {}
+
+    def al(self, sinif, iptal=None):
+        """Yer açılınca True; beklerken iptal() True olursa False döndür"""
+        with self._kosul:
+            self._bekleyenler[sinif] = self._bekleyenler.get(sinif, 0) + 1
+            try:
+                while self._kullanilan >= self.boyut or max(self._bekleyenler, key=self.oncelik) != sinif:
+                    if iptal is not None and iptal():
+                        return False
+                    self._kosul.wait(0.5)
+                self._kullanilan += 1
+                return True
+            finally:
+                self._bekleyenler[sinif] -= 1
+                if not self._bekleyenler[sinif]:
+                    del self._bekleyenler[sinif]
+                # Sıradaki sınıf değişmiş olabilir
+                self._kosul.notify_all()
+
+    def birak(self):
+        with self._kosul:
+            self._kullanilan -= 1
+            self._kosul.notify_all()
+
+
+class AramaPlanlayici:
+    """
+    Her sınıfın sıradaki turunda aranacak (terim, motor) çiftlerini seçer.
+    Terim ve motor başına gelen URL ve kaydedilen resim sayıları izlenir;
+    verim (kaydedilen / URL) az veriyle yanılmamak için sınıf ve motor
+    ortalamalarına doğru çekilerek tahmin edilir. Az denenmiş terimlere ve
+    motorlara keşif payı (UCB) eklenir; böylece baştaki turlar terimleri ve
+    motorları dolaşır, sonrakiler en verimli terim ve motorlara yönelir.
+    """
+
+    def __init__(self, motorlar, kesif=0.5, onsel_agirlik=20):
+        self.motorlar = list(motorlar)
+        self.kesif = kesif
+        self.onsel_agirlik = onsel_agirlik
+        self._kilit = threading.Lock()
+        # (sinif, terim) -> [url, kaydedilen]
+        self._terimler = {}
+        # motor -> [url, kaydedilen]
+        self._motorlar = {motor: [0, 0] for motor in self.motorlar}
+
+    def url_geldi(self, sinif, terim, motor):
+        with self._kilit:
+            self._terimler.setdefault((sinif, terim), [0, 0])[0] += 1
+            self._motorlar[motor][0] += 1
+
+    def kaydedildi(self, sinif, terim, motor):
+        with self._kilit:
+            self._terimler.setdefault((sinif, terim), [0, 0])[1] += 1
+            self._motorlar[motor][1] += 1
+
+    def ozet(self):
+        """(motor -> [url, kaydedilen], (sınıf, terim) -> [url, kaydedilen]) kopyaları"""
+        with self._kilit:
+            return ({motor: list(sayac) for motor, sayac in self._motorlar.items()},
+                    {anahtar: list(sayac) for anahtar, sayac in self._terimler.items()})
+
+    def _oran(self, sayac, onsel):
+        url, kaydedilen = sayac
+        return (kaydedilen + self.onsel_agirlik * onsel) / (url + self.onsel_agirlik)
+
+    def plan(self, sinif, terimler, kullanilanlar, boyut):
+        """
+        Daha önce kullanılmamış (terim, motor) çiftlerinden tahmini verimi en
+        yüksek boyut tanesini seç; bir turda her terim en fazla bir kez aranır
+        """
+        with self._kilit:
+            sinif_sayaci = [0, 0]
+            for (c, _), (url, kaydedilen) in self._terimler.items():
+                if c == sinif:
+                    sinif_sayaci[0] += url
+                    sinif_sayaci[1] += kaydedilen
+            genel = [sum(s[0] for s in self._motorlar.values()), sum(s[1] for s in self._motorlar.values())]
+            genel_oran = self._oran(genel, 0.5)
+            motor_bonuslari = {motor: self.kesif * genel_oran * math.sqrt(math.log(genel[0] + 1) / (url + 1))
+                               for motor, (url, _) in self._motorlar.items()}
+            sinif_orani = self._oran(sinif_sayaci, genel_oran)
+            toplam_url = sinif_sayaci[0] + 1
+
+            adaylar = []
+            for terim in terimler:
+                url, kaydedilen = self._terimler.get((sinif, terim), (0, 0))
+                terim_orani = self._oran((url, kaydedilen), sinif_orani)
+                bonus = self.kesif * sinif_orani * math.sqrt(math.log(toplam_url + 1) / (url + 1))
+                for motor in self.motorlar:
+                    if (terim, motor) in kullanilanlar:
+                        continue
+                    # Motorun genel ortalamaya göre ne kadar iyi olduğu terimin tahminini ölçekler
+                    motor_carpani = self._oran(self._motorlar[motor], genel_oran) / genel_oran
+                    # Eşitlikleri rastgele boz (veri yokken ilk tur terimleri karıştırır)
+                    puan = terim_orani * motor_carpani + bonus + motor_bonuslari[motor] + random.random() * 1e-9
+                    adaylar.append((puan, terim, motor))
+
+        adaylar.sort(reverse=True)
+        plan, secilen_terimler = [], set()
+        for _, terim, motor in adaylar:
+            if terim not in secilen_terimler:
+                plan.append((terim, motor))
+                secilen_terimler.add(terim)
+                if len(plan) == boyut:
+                    break
+        return plan
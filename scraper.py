@@ -1,20 +1,54 @@
+import io
 import os
 import time
 import shutil
+import hashlib
+import threading
 import numpy as np
 from PIL import Image
+from icrawler import ImageDownloader
 from icrawler.builtin import GoogleImageCrawler, BingImageCrawler, BaiduImageCrawler
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
 
-import tensorflow as tf
-from tensorflow.keras.applications.resnet50 import ResNet50, preprocess_input, decode_predictions
-from tensorflow.keras.preprocessing.image import img_to_array
 
-import imagehash
-import random
+from hash_index import HashIndex, HammingIndex
+from pipeline import ToplamaHatti
+from decode import ParalelCozucu
+from label_filter import EtiketFiltresi
+from job_journal import ToplamaGunlugu
+from async_downloader import AsenkronIndirici
+from outcome_cache import SonucOnbellegi
+from scheduler import AramaButcesi, AramaPlanlayici
+from metrics import metrikler_olustur
+
+# Arama motorları (günlükte ve planlayıcıda isimleriyle tutulur)
+MOTORLAR = {'google': GoogleImageCrawler, 'bing': BingImageCrawler, 'baidu': BaiduImageCrawler}
+MOTOR_SIRASI = list(MOTORLAR)
+
+class UrlIleten(ImageDownloader):
+    """
+    Arama motorunun bulduğu resim URL'lerini indirmeden geri çağırma
+    fonksiyonuna ileten indirici; indirme ortak AsenkronIndirici'de yapılır
+    """
+
+    def __init__(self, *args, geri_cagir=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.geri_cagir = geri_cagir
+
+    def download(self, task, default_ext, timeout=5, max_retry=3, overwrite=False, **kwargs):
+        task['success'] = False
+        task['filename'] = None
+        # Hat durdurulduysa veya URL sınırına ulaşıldıysa crawler'ı da sonlandır
+        if not self.geri_cagir(task['file_url']):
+            self.signal.set(reach_max_num=True)
+        return False
 
 class ImageCollector:
-    def __init__(self, save_folder="dataset"):
+    def __init__(self, save_folder="dataset", benzerlik_esigi=4, cozucu_sayisi=None, tahmin_batch_boyutu=50,
+                 filtre_esigi=0.2, filtre_yontemi='max', filtre_modeli='resnet50', filtre_tflite=None,
+                 indirme_eszamanli=64, host_basina=4, host_hizi=None, bellekte=False,
+                 onbellek_kapasitesi=200_000, eszamanli_arama=8, metrik_dosyasi=None, metrik_araligi=10,
+                 metrik_portu=None):
         self.save_folder = save_folder
         self.temp_folder = "temp_images"
 
@@ -78,254 +112,497 @@ class ImageCollector:
         os.makedirs(self.save_folder, exist_ok=True)
         os.makedirs(self.temp_folder, exist_ok=True)
         
-        # ResNet50 modelini belleğe al (tek seferlik yükleme)
-        print("ResNet50 modeli yükleniyor...")
-        self.model = ResNet50(weights='imagenet')
+        # Filtre modeli ve etiket maskeleri ilk toplamada yüklenir (_filtre_al);
+        # tüm hedefler zaten doluysa TensorFlow hiç içe aktarılmaz
+        self.filtre_ayarlari = dict(model=filtre_modeli, tflite=filtre_tflite, esik=filtre_esigi, yontem=filtre_yontemi)
+        self.filtre = None
+        self.etiket_filtresi = None
+        
+        # Kaydedilmiş resimlerin hash'leri; Hamming mesafesi benzerlik_esigi'ne
+        # kadar olan (yeniden boyutlandırılmış/sıkıştırılmış) kopyalar da yakalanır
+        self.saved_hash_index = HammingIndex(esik=benzerlik_esigi)
         
-        # Kaydedilmiş resimlerin hash'lerini tutmak için set
-        self.saved_hash_set = set()
+        # Tur, arama ve bekleyen dosya günlüğü; çökme sonrası kaldığı yerden devam edilir
+        self.gunluk = ToplamaGunlugu(self.save_folder)
         
-        # Her sınıf için mevcut resim sayısını izle
+        # Her sınıf için mevcut resim sayısını ve hedefi izle
         self.collected_counts = {sinif: 0 for sinif in self.siniflar.keys()}
+        self.hedef_sayilari = {}
+        
+        # Akış hattı ayarları (cozucu_sayisi: çözme süreç sayısı, None ise çekirdek sayısı)
+        self.cozucu_sayisi = cozucu_sayisi or os.cpu_count()
+        self.tahmin_batch_boyutu = tahmin_batch_boyutu
+        self.kuyruk_boyutu = 128
+        self._paralel_cozucu = None
+        
+        # Tüm terimlerin URL'leri tek bağlantı havuzundan indirilir (host_hizi: host başına istek/sn)
+        self.indirme_ayarlari = dict(eszamanli=indirme_eszamanli, host_basina=host_basina, host_hizi=host_hizi)
+        self._indirici = None
+        
+        # bellekte=True: indirilen baytlar temp_images'a yazılmadan doğrudan çözülür,
+        # yalnızca kabul edilenler dataset'e yazılır. Bu öğeler günlüğe girmez;
+        # çalışma yarıda kalırsa hattaki resimler sonraki çalıştırmada yeniden indirilir.
+        self.bellekte = bellekte
+        # Bu çalıştırmada hatta giren (sınıf, SHA-256) çiftleri (farklı URL'lerden gelen aynı dosya)
+        self._gorulen_ozetler = set()
+        self._ozet_kilidi = threading.Lock()
+        
+        # URL ve bayt özeti -> önceki sonuç; bilinenler indirilmeden/çözülmeden elenir (_onbellek_al)
+        self.onbellek_kapasitesi = onbellek_kapasitesi
+        self.onbellek = None
+        
+        # Tüm sınıflarda aynı anda çalışabilecek arama sayısı (siniflari_topla)
+        self.eszamanli_arama = eszamanli_arama
+        self._planlayici = None
+        
+        # Aşama süreleri, sonuç sayaçları ve kuyruk derinlikleri; metrik_dosyasi'na
+        # metrik_araligi saniyede bir JSON satırı yazılır, metrik_portu'nda /metrics
+        # sunulur. İkisi de verilmezse ölçüm kapalıdır ve çağrılar boş işlemdir.
+        self.metrikler = metrikler_olustur(metrik_dosyasi, metrik_araligi, metrik_portu)
         
         # Mevcut resimleri yükle
         self._load_existing_images()
 
     def _load_existing_images(self):
-        """Mevcut resimleri yükle ve hash'lerini hesapla"""
+        """Mevcut resimleri hash index'inden yükle, yalnızca değişen dosyaları yeniden hash'le"""
         print("Mevcut resimler kontrol ediliyor...")
+        self.hash_index = HashIndex(self.save_folder)
+        degisen = self.hash_index.uzlastir(list(self.siniflar.keys()))
+        if degisen:
+            print(f"{degisen} resmin hash'i yeniden hesaplandı.")
         for sinif in self.siniflar.keys():
-            sinif_klasoru = os.path.join(self.save_folder, sinif)
-            if os.path.exists(sinif_klasoru):
-                resimler = [os.path.join(sinif_klasoru, f) for f in os.listdir(sinif_klasoru) if f.endswith(('.jpg', '.jpeg', '.png'))]
-                self.collected_counts[sinif] = len(resimler)
-                for resim_yolu in resimler:
-                    try:
-                        img = Image.open(resim_yolu)
-                        if img.mode != 'RGB':
-                            img = img.convert('RGB')
-                        phash = imagehash.phash(img)
-                        self.saved_hash_set.add(phash)
-                        img.close()
-                    except Exception as e:
-                        print(f"Mevcut resim hash hatası {resim_yolu}: {e}")
+            self.collected_counts[sinif] = self.hash_index.sayi(sinif)
+            for _, phash in self.hash_index.hashler(sinif):
+                self.saved_hash_index.ekle(phash)
+            if self.collected_counts[sinif]:
                 print(f"{sinif}: {self.collected_counts[sinif]} mevcut resim bulundu.")
 
+    def _cozucu_al(self):
+        """Süreç havuzunu ilk toplama başlamadan önce bir kez oluştur"""
+        if self._paralel_cozucu is None:
+            # Kuyruktaki, batch'teki ve çözülmekte olan resimlerin hepsine yetecek kadar slot
+            slot_sayisi = self.kuyruk_boyutu + self.tahmin_batch_boyutu + 2 * self.cozucu_sayisi
+            self._paralel_cozucu = ParalelCozucu(islem_sayisi=self.cozucu_sayisi, slot_sayisi=slot_sayisi,
+                                                 sure_bildir=self.metrikler.sure_ekle)
+        return self._paralel_cozucu
+
+    def _onbellek_al(self):
+        """Sonuç önbelleğini bir kez yükle; sınıf kararları filtre ayarlarına bağlıdır"""
+        if self.onbellek is None:
+            ayarlar = self.filtre_ayarlari
+            imza = f"{ayarlar['model']}:{ayarlar['esik']}:{ayarlar['yontem']}"
+            self.onbellek = SonucOnbellegi(self.save_folder, kapasite=self.onbellek_kapasitesi, filtre_imzasi=imza)
+        return self.onbellek
+
+    def _indirici_al(self):
+        """Ortak asenkron indiriciyi ilk toplama başlamadan önce bir kez başlat"""
+        if self._indirici is None:
+            self._indirici = AsenkronIndirici(**self.indirme_ayarlari).baslat()
+        return self._indirici
+
+    def _filtre_al(self):
+        """Filtre modelini ve hedef sınıfların ImageNet maskelerini bir kez yükle"""
+        if self.filtre is None:
+            from filter_backends import filtre_olustur
+
+            ayarlar = self.filtre_ayarlari
+            print(f"{ayarlar['model']} filtre modeli yükleniyor{' (TFLite)' if ayarlar['tflite'] else ''}...")
+            # Tüm arka uçlar 1000 sınıflı ImageNet olasılıkları üretir, kabul mantığı ortaktır
+            self.filtre = filtre_olustur(ayarlar['model'], ayarlar['tflite'])
+            self.etiket_filtresi = EtiketFiltresi(list(self.siniflar.keys()), esik=ayarlar['esik'],
+                                                  yontem=ayarlar['yontem'])
+        return self.filtre
+
+    def kapat(self):
+        """İndiriciyi ve çözme süreçlerini kapat; işlenmemiş geçici dosyalar sonraki çalıştırma için korunur"""
+        # Son metrik satırı indirici ve önbellek sayaçları hâlâ erişilebilirken yazılır
+        self.metrikler.kapat()
+        if self._indirici is not None:
+            self._indirici.kapat()
+            self._indirici = None
+        if self.onbellek is not None:
+            self.onbellek.kapat()
+        if self._paralel_cozucu is not None:
+            self._paralel_cozucu.kapat()
+            self._paralel_cozucu = None
+
     def temizle(self):
         """Geçici klasörü temizle"""
         if os.path.exists(self.temp_folder):
             shutil.rmtree(self.temp_folder)
         os.makedirs(self.temp_folder, exist_ok=True)
 
-    def _check_prediction(self, decoded_predictions, beklenen_sinif):
-        """
-        Toplu sınıflandırma sonucunda elde edilen tahmin listesinden,
-        beklenen sınıfa ait etiketlerin (skor > 0.2) varlığını kontrol eder.
-        """
-        sinif_map = {
-            'kedi': ['cat', 'tabby', 'persian_cat', 'siamese_cat', 'egyptian_cat', 'tiger_cat'],
-            'kopek': ['dog', 'golden_retriever', 'labrador', 'german_shepherd', 'beagle', 'husky',
-                     'collie', 'poodle', 'terrier', 'spaniel', 'bulldog', 'hound'],
-            'araba': ['car', 'sports_car', 'passenger_car', 'automobile', 'cab', 'jeep', 'limousine',
-                     'convertible', 'minivan', 'race_car', 'pickup', 'model'],
-            'ev': ['house', 'home', 'building', 'residence', 'mansion', 'dwelling', 'palace', 'cottage'],
-            'agac': ['tree', 'forest', 'pine_tree', 'oak', 'maple', 'birch', 'palm', 'juniper', 'cypress'],
-            'insan': ['person', 'people', 'human', 'face', 'man', 'woman', 'child', 'boy', 'girl', 'portrait'],
-            'kus': ['bird', 'parrot', 'eagle', 'sparrow', 'hawk', 'robin', 'cardinal', 'peacock', 'owl',
-                   'finch', 'canary', 'chicken', 'pigeon', 'flamingo', 'jay', 'hummingbird'],
-            'cicek': ['flower', 'rose', 'tulip', 'sunflower', 'daisy', 'lily', 'orchid', 'iris',
-                     'carnation', 'poppy', 'daffodil', 'blossom', 'petal'],
-            'telefon': ['phone', 'mobile_phone', 'smartphone', 'cellphone', 'iphone', 'telephone'],
-            'bilgisayar': ['computer', 'laptop', 'desktop_computer', 'pc', 'monitor', 'keyboard', 
-                          'notebook', 'screen', 'workstation', 'macbook', 'chromebook']
-        }
-        kabul_edilen = sinif_map.get(beklenen_sinif, [])
-        for (_, etiket, skor) in decoded_predictions:
-            for kabul in kabul_edilen:
-                if kabul.lower() in etiket.lower() and skor > 0.2:  # Eşik değeri düşürdük
-                    return True
-        return False
+    def _crawl(self, motor, arama, sinif_adi, hat, deneme, max_num=200):
+        """Arama motorundan bir terimin URL'lerini al; inen her dosya doğrudan hatta gönderilir"""
+        # Geçici alt klasör oluştur (turlar arasında dosya adı çakışmasın)
+        temp_sub_folder = os.path.join(self.temp_folder, sinif_adi, f"{deneme:02d}_{arama.replace(' ', '_')}")
+        os.makedirs(temp_sub_folder, exist_ok=True)
+        indirmeler = []
 
-    def sinif_resimleri_topla(self, sinif_adi, hedef_sayi):
-        print(f"{sinif_adi} sınıfı için resimler toplanıyor... (Mevcut: {self.collected_counts[sinif_adi]}/{hedef_sayi})")
-        
-        # Eğer hedef sayıya ulaşıldıysa, işlemi atla
-        if self.collected_counts[sinif_adi] >= hedef_sayi:
-            print(f"{sinif_adi} sınıfı için hedef sayıya zaten ulaşılmış.")
+        def dosya_geldi(dosya_yolu, url, baslangic):
+            self.metrikler.sure_ekle(indirme=time.perf_counter() - baslangic)
+            self.gunluk.indirildi(sinif_adi, dosya_yolu)
+            with open(dosya_yolu, 'rb') as f:
+                veri = f.read()
+            self._hatta_gonder(hat, {'yol': dosya_yolu, 'sinif': sinif_adi, 'url': url, 'arama': (arama, motor)},
+                               veri)
+
+        def veri_geldi(veri, url, baslangic):
+            self.metrikler.sure_ekle(indirme=time.perf_counter() - baslangic)
+            self._hatta_gonder(hat, {'veri': veri, 'sinif': sinif_adi, 'url': url, 'arama': (arama, motor)}, veri)
+
+        def reddedildi(url):
+            self.metrikler.sonuc_say(sinif_adi, 'reddedildi')
+            self.onbellek.kaydet('reddedildi', url=url)
+
+        def url_geldi(url):
+            if self._sinif_bitti(sinif_adi, hat) or len(indirmeler) >= max_num:
+                return False
+            self._planlayici.url_geldi(sinif_adi, arama, motor)
+            # Daha önce sonucu belli olmuş URL'ler (başka tur/motor/çalıştırma) indirilmez
+            onceki = self.onbellek.bak(url=url, sinif=sinif_adi)
+            if onceki is not None:
+                # Önbellek isabeti ayrı sayılır; 'kaydedildi' yalnızca bu çalıştırmada yazılanlardır
+                self.metrikler.sonuc_say(sinif_adi, f"onbellek_{onceki}")
+                indirmeler.append(None)
+                return True
+            # İndirme süresi kuyrukta (bağlantı/host sınırı) bekleme dahil ölçülür
+            baslangic = time.perf_counter()
+            if self.bellekte:
+                indirmeler.append(self._indirici.indir(url, teslim=lambda veri: veri_geldi(veri, url, baslangic),
+                                                       red=reddedildi))
+                return True
+            # Dosya adı arama sonucundaki sıradan gelir; yeniden başlatıldığında önceki
+            # çalıştırmada inmiş (bekleyen veya işlenmiş) dosyalar yeniden indirilmez
+            uzanti = os.path.splitext(url.split('?')[0])[1].lower()
+            if uzanti not in ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'):
+                uzanti = '.jpg'
+            dosya_yolu = os.path.join(temp_sub_folder, f"{deneme * 100 + len(indirmeler) + 1:06d}{uzanti}")
+            if self.gunluk.biliniyor_mu(dosya_yolu) or os.path.exists(dosya_yolu):
+                indirmeler.append(None)
+            else:
+                indirmeler.append(self._indirici.indir(url, dosya_yolu,
+                                                       teslim=lambda yol: dosya_geldi(yol, url, baslangic),
+                                                       red=reddedildi))
+            return True
+
+        # Arama motoru yalnızca URL listesi üretir
+        crawler = MOTORLAR[motor](
+            feeder_threads=1,
+            parser_threads=1,
+            downloader_threads=1,
+            downloader_cls=UrlIleten,
+            storage={'root_dir': temp_sub_folder},
+            extra_downloader_args={'geri_cagir': url_geldi}
+        )
+        try:
+            with self.metrikler.olc('arama'):
+                crawler.crawl(keyword=f"{arama} photo high quality", max_num=max_num)
+        except Exception as e:
+            print(f"Crawler hatası ({arama}): {e}")
+        # Arama, URL'leri hatta girince tamamlanmış sayılır (günlük ve tur sonu için)
+        wait([indirme for indirme in indirmeler if indirme is not None])
+        self.gunluk.arama_bitti(sinif_adi, deneme, arama, motor)
+
+    def _hatta_gonder(self, hat, oge, veri):
+        """Baytları daha önce görülmüş resimleri çözmeden ele, kalanları hatta gönder"""
+        oge['ozet'] = hashlib.sha256(veri).hexdigest()
+        onceki = self.onbellek.bak(ozet=oge['ozet'], sinif=oge['sinif'])
+        if onceki is not None:
+            # URL de aynı sonuçla kaydedilir; sonraki aramalarda indirilmeden elenir
+            oge['sonuc'] = onceki
+            oge['onbellekten'] = True
+            self._oge_birak(oge)
             return
-        
-        sinif_klasoru = os.path.join(self.save_folder, sinif_adi)
-        os.makedirs(sinif_klasoru, exist_ok=True)
+        anahtar = (oge['sinif'], oge['ozet'])
+        with self._ozet_kilidi:
+            isleniyor = anahtar in self._gorulen_ozetler
+            self._gorulen_ozetler.add(anahtar)
+        if isleniyor:
+            # Aynı baytlar bu sınıf için zaten hatta; sonucu ilk kopya belirler, önbelleğe yazılmaz
+            self._oge_birak(oge)
+        else:
+            hat.gonder(oge)
+
+    def _resim_coz(self, oge):
+        """Resmi süreç havuzunda çöz, boyut ve kopya kontrolü yap"""
+        try:
+            sonuc = self._paralel_cozucu.coz(oge['veri'] if 'veri' in oge else oge['yol'])
+        except Exception:
+            oge['sonuc'] = 'bozuk'
+            raise
+        if sonuc is None:
+            oge['sonuc'] = 'boyut'
+            return None
+        oge['slot'], _, oge['phash'] = sonuc
+        if self.saved_hash_index.yakin_var_mi(oge['phash']):
+            oge['sonuc'] = 'kopya'
+            return None
+        return oge
+
+    def _batch_siniflandir(self, ogeler):
+        """Batch'i tek seferde tahmin et, beklenen sınıfa uyanları döndür"""
+        slotlar = [oge.pop('slot') for oge in ogeler]
+        batch_array = self._paralel_cozucu.slotlar[slotlar].astype(np.float32)
+        for slot in slotlar:
+            self._paralel_cozucu.slot_birak(slot)
+        with self.metrikler.olc('tahmin'):
+            tahminler = self.filtre(batch_array)
+        kabul = self.etiket_filtresi.kabul_et(tahminler, [oge['sinif'] for oge in ogeler])
+        kabul_edilenler = []
+        for oge, kabul_edildi in zip(ogeler, kabul):
+            if kabul_edildi:
+                kabul_edilenler.append(oge)
+            else:
+                oge['sonuc'] = 'sinif'
+        for oge in kabul_edilenler:
+            if 'yol' in oge:
+                self.gunluk.kabul_edildi(oge['yol'], oge['phash'])
+        return kabul_edilenler
+
+    def _resim_kaydet(self, oge):
+        """Kabul edilen resmi kaydet; toplanan tüm sınıflar hedefe ulaştıysa True döndür"""
+        sinif_adi = oge['sinif']
+        hedef_sayi = self.hedef_sayilari[sinif_adi]
         indirilen = self.collected_counts[sinif_adi]
-        
-        # Daha fazla deneme için sayıyı artırdık
-        max_deneme = 20
-        arama_terimleri = list(self.siniflar[sinif_adi])
+        if indirilen >= hedef_sayi:
+            return self._hepsi_tamam()
+        # Aynı anda çözülen yakın kopyalar hattın sonunda bir kez daha elenir
+        if self.saved_hash_index.yakin_var_mi(oge['phash']):
+            oge['sonuc'] = 'kopya'
+            return False
 
-        deneme = 0
-        motor_secimi = 0  # Kullanılacak crawler motoru (0: Google, 1: Bing, 2: Baidu)
-        crawlers = [GoogleImageCrawler, BingImageCrawler, BaiduImageCrawler]
-        
-        while indirilen < hedef_sayi and deneme < max_deneme:
-            # Geçici dizini temizleyelim
-            self.temizle()
-            
-            # Arama terimlerini karıştır
-            random.shuffle(arama_terimleri)
-            
-            # Bu turda kullanılacak terimleri seç (her seferinde farklı terimler kullan)
-            batch_size = 5  # Her turda kaç terim kullanılacak
-            batch_terms = arama_terimleri[:batch_size]
-            
-            # Farklı motorlar için ThreadPoolExecutor kullanalım
-            with ThreadPoolExecutor(max_workers=min(batch_size, 8)) as executor:
-                for arama in batch_terms:
-                    if indirilen >= hedef_sayi:
-                        break
-                    
-                    # Farklı motorlar arasında geçiş yap
-                    crawler_class = crawlers[motor_secimi % len(crawlers)]
-                    motor_secimi += 1
-                    
-                    # Geçici alt klasör oluştur
-                    temp_sub_folder = os.path.join(self.temp_folder, f"{arama.replace(' ', '_')}")
-                    os.makedirs(temp_sub_folder, exist_ok=True)
-                    
-                    # Crawler'ı yapılandır
-                    crawler = crawler_class(
-                        feeder_threads=2,
-                        parser_threads=2,
-                        downloader_threads=4,
-                        storage={'root_dir': temp_sub_folder}
-                    )
-                    
-                    # Resimleri indir
-                    try:
-                        executor.submit(
-                            crawler.crawl,
-                            keyword=f"{arama} photo high quality",
-                            max_num=200,  # Daha fazla resim dene
-                            min_size=(150, 150),  # Biraz daha büyük resimler için
-                            file_idx_offset=deneme * 100
-                        )
-                    except Exception as e:
-                        print(f"Crawler hatası ({arama}): {e}")
-                        continue
-            
-            # Tüm indirme işlemleri tamamlandıktan sonra devam et
-            time.sleep(5)  # Tüm indirmelerin tamamlanması için biraz bekle
-            
-            # Resimleri işleme
-            temp_klasorler = [os.path.join(self.temp_folder, d) for d in os.listdir(self.temp_folder) 
-                            if os.path.isdir(os.path.join(self.temp_folder, d))]
-            
-            for klasor in temp_klasorler:
-                if indirilen >= hedef_sayi:
+        hedef_dosya_yolu = os.path.join(self.save_folder, sinif_adi, f"{sinif_adi}_{indirilen:04d}.jpg")
+        with self.metrikler.olc('kaydetme'):
+            self._resim_yaz(oge, hedef_dosya_yolu)
+        indirilen += 1
+        oge['sonuc'] = 'kaydedildi'
+        self.collected_counts[sinif_adi] = indirilen
+        self.saved_hash_index.ekle(oge['phash'])
+        self.hash_index.ekle(hedef_dosya_yolu, oge['phash'])
+        if 'arama' in oge:
+            self._planlayici.kaydedildi(sinif_adi, *oge['arama'])
+        if indirilen % 10 == 0:
+            print(f"{sinif_adi}: {indirilen}/{hedef_sayi} resim toplandı ({indirilen/hedef_sayi*100:.1f}%)")
+        return indirilen >= hedef_sayi and self._hepsi_tamam()
+
+    def _hepsi_tamam(self):
+        return all(self.collected_counts[sinif] >= hedef for sinif, hedef in self.hedef_sayilari.items())
+
+    def _resim_yaz(self, oge, hedef_dosya_yolu):
+        """Resmi dataset'e yaz; zaten RGB JPEG ise baytları yeniden kodlamadan kopyala"""
+        kaynak = io.BytesIO(oge['veri']) if 'veri' in oge else oge['yol']
+        with Image.open(kaynak) as img:
+            if img.format == 'JPEG' and img.mode == 'RGB':
+                if 'veri' in oge:
+                    with open(hedef_dosya_yolu, 'wb') as f:
+                        f.write(oge['veri'])
+                else:
+                    shutil.copyfile(oge['yol'], hedef_dosya_yolu)
+                return
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            img.save(hedef_dosya_yolu, 'JPEG', quality=85)
+
+    def _oge_birak(self, oge):
+        """Hattan çıkan öğenin slotunu serbest bırak, sonucunu önbelleğe yaz ve geçici dosyasını sil"""
+        slot = oge.pop('slot', None)
+        if slot is not None:
+            self._paralel_cozucu.slot_birak(slot)
+        sonuc = oge.get('sonuc', 'birakildi')
+        self.metrikler.sonuc_say(oge['sinif'], f"onbellek_{sonuc}" if oge.get('onbellekten') else sonuc)
+        if 'sonuc' in oge:
+            self.onbellek.kaydet(oge['sonuc'], url=oge.get('url'), ozet=oge.get('ozet'), sinif=oge['sinif'])
+        if 'yol' not in oge:
+            return
+        try:
+            os.remove(oge['yol'])
+        except OSError:
+            pass
+        self.gunluk.bitti(oge['yol'], oge.get('sonuc', 'birakildi'))
+
+    def _bekleyenleri_isle(self, siniflar, hat):
+        """Önceki çalıştırmada indirilip işlenmemiş dosyaları yeniden indirmeden işle"""
+        bekleyenler = []
+        for sinif_adi in siniflar:
+            # Günlüğe yazılamadan (çökme anında) inmiş dosyaları da bekleyenlere ekle
+            for kok, _, dosyalar in os.walk(os.path.join(self.temp_folder, sinif_adi)):
+                for dosya in dosyalar:
+                    yol = os.path.join(kok, dosya)
+                    if dosya.endswith('.part'):
+                        # Yarıda kalmış indirme
+                        os.remove(yol)
+                    elif not self.gunluk.biliniyor_mu(yol):
+                        self.gunluk.indirildi(sinif_adi, yol)
+            sinif_bekleyenleri = self.gunluk.bekleyen(sinif_adi)
+            if sinif_bekleyenleri:
+                print(f"{sinif_adi}: önceki çalıştırmadan kalan {len(sinif_bekleyenleri)} dosya işleniyor...")
+            bekleyenler.extend((yol, phash, sinif_adi) for yol, phash in sinif_bekleyenleri)
+
+        # Önce tüm sınıfların kabul edilmiş olanları yeniden sınıflandırılmadan kaydedilir,
+        # sonra sınıflandırılmamışlar hatta gönderilir (kaydedici thread'le yarışmamak için)
+        for yol, phash, sinif_adi in sorted(bekleyenler, key=lambda b: b[1] is None):
+            oge = {'yol': yol, 'sinif': sinif_adi}
+            if not os.path.exists(yol):
+                self.gunluk.bitti(yol, 'kayip')
+            elif phash is None:
+                if not hat.gonder(oge):
+                    return
+            else:
+                oge['phash'] = phash
+                hepsi_tamam = self._resim_kaydet(oge)
+                self._oge_birak(oge)
+                if hepsi_tamam:
+                    hat.durdur()
+                    return
+
+    def _metrik_kaynaklarini_bagla(self, hat):
+        """Kuyruk derinliklerini, indirici/önbellek sayaçlarını ve arama verimlerini metriklere bağla"""
+        cozucu, indirici, onbellek, planlayici = self._paralel_cozucu, self._indirici, self.onbellek, self._planlayici
+
+        def verimler():
+            motorlar, _ = planlayici.ozet()
+            return {motor: {'url': url, 'kaydedilen': kaydedilen, 'verim': round(kaydedilen / url, 4) if url else 0}
+                    for motor, (url, kaydedilen) in motorlar.items()}
+
+        def terim_verimleri():
+            _, terimler = planlayici.ozet()
+            sonuc = {}
+            for (sinif_adi, terim), (url, kaydedilen) in terimler.items():
+                sonuc.setdefault(sinif_adi, {})[terim] = {'url': url, 'kaydedilen': kaydedilen}
+            return sonuc
+
+        self.metrikler.kaynak_ekle('kuyruklar', lambda: {
+            'girdi': hat.girdi_kuyrugu.qsize(), 'tahmin': hat.tahmin_kuyrugu.qsize(),
+            'kayit': hat.kayit_kuyrugu.qsize(), 'bos_slot': cozucu.bos_slot_sayisi()})
+        self.metrikler.kaynak_ekle('indirici', lambda: dict(indirici.sayaclar))
+        self.metrikler.kaynak_ekle('onbellek', lambda: dict(onbellek.sayaclar))
+        self.metrikler.kaynak_ekle('motorlar', verimler)
+        self.metrikler.kaynak_ekle('terimler', terim_verimleri)
+
+    def _sinif_bitti(self, sinif_adi, hat):
+        return hat.dur.is_set() or self.collected_counts[sinif_adi] >= self.hedef_sayilari[sinif_adi]
+
+    def _eksik_orani(self, sinif_adi):
+        """Sınıfın hedefe kalan oranı; arama bütçesinde önceliği belirler"""
+        hedef = self.hedef_sayilari[sinif_adi]
+        return (hedef - self.collected_counts[sinif_adi]) / hedef
+
+    def _sinif_turlari(self, sinif_adi, hat, butce, arama_havuzu, max_deneme=20, tur_boyutu=5):
+        """Sınıfın arama turlarını hedefe ulaşana veya terimler tükenene kadar çalıştır"""
+        # Önceki çalıştırma yarıda kaldıysa tur ve kullanılan (terim, motor) çiftleri günlükten gelir
+        durum = self.gunluk.durum(sinif_adi)
+        deneme = durum['deneme']
+        motor_secimi = durum['motor_secimi']
+        acik_tur = durum['acik_tur']
+        kullanilanlar = set(durum['aramalar'])
+
+        while not self._sinif_bitti(sinif_adi, hat) and deneme < max_deneme:
+            if acik_tur is not None and acik_tur['deneme'] == deneme:
+                # Yarıda kalan turun tamamlanmamış aramalarıyla devam et
+                plan = acik_tur['plan']
+                acik_tur = None
+            else:
+                # Kullanılmamış çiftler arasından verimi en yüksek olanlar
+                plan = self._planlayici.plan(sinif_adi, self.siniflar[sinif_adi], kullanilanlar, tur_boyutu)
+                if not plan:
+                    print(f"{sinif_adi}: kullanılmamış arama terimi kalmadı.")
+                    break
+                motor_secimi += len(plan)
+                self.gunluk.tur_basladi(sinif_adi, deneme, plan, motor_secimi)
+            kullanilanlar.update(plan)
+
+            futures = []
+            for arama, motor in plan:
+                # Bütçe dolduysa yer açılana kadar bekle; yer hedefine en uzak sınıfa verilir
+                if not butce.al(sinif_adi, iptal=lambda: self._sinif_bitti(sinif_adi, hat)):
                     break
-                    
-                temp_dosyalar = [os.path.join(klasor, dosya) for dosya in os.listdir(klasor)
-                               if dosya.endswith(('.jpg', '.jpeg', '.png'))]
-                
-                if not temp_dosyalar:
-                    continue
-                
-                # Resimleri daha küçük batch'lere ayır (bellek için)
-                batch_size = 50  # Bellek için daha küçük batch'ler
-                for i in range(0, len(temp_dosyalar), batch_size):
-                    if indirilen >= hedef_sayi:
-                        break
-                        
-                    batch_files = temp_dosyalar[i:i+batch_size]
-                    pil_resimler = []
-                    resimler_hash = []
-                    dosya_yolları = []
-                    
-                    for dosya_yolu in batch_files:
-                        try:
-                            img = Image.open(dosya_yolu)
-                            if img.size[0] < 150 or img.size[1] < 150:
-                                img.close()
-                                continue
-                            if img.mode != 'RGB':
-                                img = img.convert('RGB')
-                            phash = imagehash.phash(img)
-                            if phash in self.saved_hash_set:
-                                img.close()
-                                continue
-                            pil_resimler.append(img)
-                            resimler_hash.append(phash)
-                            dosya_yolları.append(dosya_yolu)
-                        except Exception as e:
-                            print(f"Resim yüklemede hata: {e}")
-                            continue
-                    
-                    if not pil_resimler:
-                        continue
-                    
-                    # Batch işleme
-                    batch_imgs = [img.resize((224, 224)) for img in pil_resimler]
-                    batch_array = np.array([img_to_array(i) for i in batch_imgs])
-                    batch_array = preprocess_input(batch_array)
-                    
-                    try:
-                        tahminler = self.model.predict(batch_array, verbose=0)
-                        decoded_list = decode_predictions(tahminler, top=5)
-                    except Exception as e:
-                        print(f"Batch tahmin hatası: {e}")
-                        for img in pil_resimler:
-                            try:
-                                img.close()
-                            except:
-                                pass
-                        continue
-                    
-                    # Sınıf kontrolü ve kaydetme
-                    for i, decoded in enumerate(decoded_list):
-                        if indirilen >= hedef_sayi:
-                            break
-                        if not self._check_prediction(decoded, sinif_adi):
-                            continue
-                        
-                        hedef_dosya_yolu = os.path.join(sinif_klasoru, f"{sinif_adi}_{indirilen:04d}.jpg")
-                        try:
-                            pil_resimler[i].save(hedef_dosya_yolu, 'JPEG', quality=85)
-                            indirilen += 1
-                            self.collected_counts[sinif_adi] = indirilen
-                            self.saved_hash_set.add(resimler_hash[i])
-                            if indirilen % 10 == 0:
-                                print(f"{sinif_adi}: {indirilen}/{hedef_sayi} resim toplandı ({indirilen/hedef_sayi*100:.1f}%)")
-                        except Exception as e:
-                            print(f"Resim kaydetme hatası: {e}")
-                            continue
-                    
-                    # Resimleri kapat
-                    for img in pil_resimler:
-                        try:
-                            img.close()
-                        except:
-                            pass
-            
+                future = arama_havuzu.submit(self._crawl, motor, arama, sinif_adi, hat, deneme)
+                future.add_done_callback(lambda _: butce.birak())
+                futures.append(future)
+
+            # Tur bitene kadar indirilenler hatta işlenmeye devam eder
+            wait(futures)
+            if len(futures) < len(plan):
+                break
+            self.gunluk.tur_bitti(sinif_adi, deneme)
             deneme += 1
-            # Hızla çok fazla istek göndermemek için kısa bekle
-            time.sleep(2)
 
-        print(f"{sinif_adi} sınıfı için toplam {indirilen}/{hedef_sayi} resim toplandı.")
-        
-    def tum_siniflari_topla(self, hedef_sayi=500):
-        siniflar = list(self.siniflar.keys())
-        # Sınıfların sırasını karıştır (daha dengeli toplama için)
-        random.shuffle(siniflar)
+    def siniflari_topla(self, hedefler, eszamanli_arama=None):
+        """
+        hedefler: {sınıf: hedef sayı}. Sınıflar aynı anda toplanır; tek filtre
+        modeli, çözme havuzu ve batch kuyruğu (ToplamaHatti) paylaşılır. Aynı
+        anda en fazla eszamanli_arama arama çalışır, boşalan yer hedefine en
+        uzak sınıfa verilir; her sınıfın terim/motor seçimi verime göre uyarlanır.
+        """
+        self.hedef_sayilari = {}
+        for sinif_adi, hedef_sayi in hedefler.items():
+            print(f"{sinif_adi} sınıfı için resimler toplanıyor... "
+                  f"(Mevcut: {self.collected_counts[sinif_adi]}/{hedef_sayi})")
+            # Eğer hedef sayıya ulaşıldıysa, sınıfı atla
+            if self.collected_counts[sinif_adi] >= hedef_sayi:
+                print(f"{sinif_adi} sınıfı için hedef sayıya zaten ulaşılmış.")
+                continue
+            os.makedirs(os.path.join(self.save_folder, sinif_adi), exist_ok=True)
+            self.hedef_sayilari[sinif_adi] = hedef_sayi
+        if not self.hedef_sayilari:
+            return
+
+        # İndirme, çözme, sınıflandırma ve kaydetme aynı anda çalışır
+        self._filtre_al()
+        self._cozucu_al()
+        self._indirici_al()
+        self._onbellek_al()
+        hat = ToplamaHatti(
+            coz=self._resim_coz,
+            siniflandir=self._batch_siniflandir,
+            kaydet=self._resim_kaydet,
+            birak=self._oge_birak,
+            # Süreçler hiç boş kalmasın diye süreç başına iki bekleyen iş
+            cozucu_sayisi=2 * self.cozucu_sayisi,
+            batch_boyutu=self.tahmin_batch_boyutu,
+            kuyruk_boyutu=self.kuyruk_boyutu
+        ).baslat()
+        if self._planlayici is None:
+            # Terim ve motor verimleri çalıştırma boyunca (sınıflar arası motor verimi dahil) korunur
+            self._planlayici = AramaPlanlayici(MOTOR_SIRASI)
+        butce = AramaButcesi(eszamanli_arama or self.eszamanli_arama, oncelik=self._eksik_orani)
+        self._metrik_kaynaklarini_bagla(hat)
+
+        siniflar = list(self.hedef_sayilari)
+        try:
+            self._bekleyenleri_isle(siniflar, hat)
+            with ThreadPoolExecutor(max_workers=butce.boyut) as arama_havuzu, \
+                    ThreadPoolExecutor(max_workers=len(siniflar)) as sinif_havuzu:
+                wait([sinif_havuzu.submit(self._sinif_turlari, sinif_adi, hat, butce, arama_havuzu)
+                      for sinif_adi in siniflar])
+        finally:
+            hat.bitir()
+            hat.bekle()
+
+        for sinif_adi in siniflar:
+            print(f"{sinif_adi} sınıfı için toplam {self.collected_counts[sinif_adi]}/"
+                  f"{self.hedef_sayilari[sinif_adi]} resim toplandı.")
+
+    def sinif_resimleri_topla(self, sinif_adi, hedef_sayi):
+        self.siniflari_topla({sinif_adi: hedef_sayi})
         
-        for sinif in siniflar:
-            self.sinif_resimleri_topla(sinif, hedef_sayi)
+    def tum_siniflari_topla(self, hedef_sayi=500, eszamanli_arama=None):
+        # Geçici klasör başta temizlenmez: önceki çalıştırmadan bekleyen dosyalar
+        # günlükle birlikte işlenir. İş tamamlanınca ikisi de sıfırlanır.
+        self.siniflari_topla({sinif: hedef_sayi for sinif in self.siniflar}, eszamanli_arama)
         self.temizle()
+        self.gunluk.sifirla()
 
-def veri_topla(hedef_sayi=500):
-    collector = ImageCollector(save_folder="dataset")
+def veri_topla(hedef_sayi=500, filtre_modeli='resnet50', filtre_tflite=None, bellekte=False, eszamanli_arama=8,
+               metrik_dosyasi=None, metrik_araligi=10, metrik_portu=None):
+    collector = ImageCollector(save_folder="dataset", filtre_modeli=filtre_modeli, filtre_tflite=filtre_tflite,
+                               bellekte=bellekte, eszamanli_arama=eszamanli_arama, metrik_dosyasi=metrik_dosyasi,
+                               metrik_araligi=metrik_araligi, metrik_portu=metrik_portu)
     try:
         collector.tum_siniflari_topla(hedef_sayi=hedef_sayi)
     finally:
-        collector.temizle()
+        collector.kapat()
 
 if __name__ == "__main__":
     veri_topla(hedef_sayi=500)  # Her sınıf için 500 resim hedefi
\ No newline at end of file
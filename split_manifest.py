@@ -0,0 +1,143 @@
+import os
+import json
+import hashlib
+
+from hash_index import HashIndex, HammingIndex, hash_int
+
+BOLUMLER = ('egitim', 'dogrulama', 'test')
+
+
+def hash_orani(anahtar):
+    """Metnin SHA-256 özetinden [0, 1) aralığında kararlı bir sayı"""
+    return int(hashlib.sha256(anahtar.encode('utf-8')).hexdigest()[:16], 16) / 2**64
+
+
+class BolmeManifestosu:
+    """
+    Veri klasöründeki resimleri dosya taşımadan eğitim/doğrulama/test
+    bölümlerine atayan kalıcı liste. Kayıtlar HashIndex gibi JSON satırları
+    olarak dosyanın sonuna eklenir.
+
+    Bölüm, resmin phash'inin kararlı özetinden gelir; böylece aynı resim her
+    makinede ve her çalıştırmada aynı bölüme düşer. Daha önce atanmış bir
+    resme Hamming mesafesi esik'e kadar olan yakın kopyalar (başka sınıfta
+    olsa bile) o resmin bölümüne girer, bölümler arasına kopya sızmaz.
+
+    Atanmış bir dosyanın bölümü değişmez; guncelle() yalnızca yeni dosyaları
+    hash'leyip atar (phash'ler klasörün HashIndex'inden gelir). Oranlar
+    yalnızca yeni atanan dosyaları etkiler. Okunamayan (phash'i
+    hesaplanamayan) dosyalar hiçbir bölüme alınmaz.
+    """
+
+    def __init__(self, kok_dizin, test_orani=0.15, dogrulama_orani=0.15, esik=4,
+                 dosya_adi='.bolme_manifestosu.jsonl'):
+        self.kok_dizin = kok_dizin
+        self.dosya_yolu = os.path.join(kok_dizin, dosya_adi)
+        self.test_orani = test_orani
+        # Test dışında kalanların oranı (ImageDataGenerator validation_split gibi)
+        self.dogrulama_orani = dogrulama_orani
+        # göreli yol -> {'bolum': str, 'phash': str}
+        self.kayitlar = {}
+        self._yakinlar = HammingIndex(esik)
+        # phash (int) -> bölüm
+        self._hash_bolumleri = {}
+        self._satir_sayisi = 0
+        os.makedirs(kok_dizin, exist_ok=True)
+        self._yukle()
+
+    def _yukle(self):
+        if not os.path.exists(self.dosya_yolu):
+            return
+        with open(self.dosya_yolu, 'r', encoding='utf-8') as f:
+            for satir in f:
+                self._satir_sayisi += 1
+                try:
+                    kayit = json.loads(satir)
+                    yol = kayit.pop('yol')
+                except (ValueError, KeyError):
+                    continue
+                if kayit.get('silindi'):
+                    self.kayitlar.pop(yol, None)
+                else:
+                    self.kayitlar[yol] = kayit
+        for kayit in self.kayitlar.values():
+            self._grup_ekle(kayit['phash'], kayit['bolum'])
+
+    def _grup_ekle(self, phash, bolum):
+        h = hash_int(phash)
+        if h not in self._hash_bolumleri:
+            self._hash_bolumleri[h] = bolum
+            self._yakinlar.ekle(h)
+
+    def _yeniden_yaz(self):
+        gecici_yol = self.dosya_yolu + '.tmp'
+        with open(gecici_yol, 'w', encoding='utf-8') as f:
+            for yol, kayit in self.kayitlar.items():
+                f.write(json.dumps(dict(yol=yol, **kayit), ensure_ascii=False) + '\n')
+        os.replace(gecici_yol, self.dosya_yolu)
+        self._satir_sayisi = len(self.kayitlar)
+
+    def _bolum_sec(self, phash):
+        """Yakın kopyası atanmışsa onun bölümü, değilse phash özetinden gelen bölüm"""
+        yakin, _ = self._yakinlar.en_yakin(phash)
+        if yakin is not None:
+            return self._hash_bolumleri[yakin]
+        oran = hash_orani(phash)
+        if oran < self.test_orani:
+            return 'test'
+        if oran < self.test_orani + (1 - self.test_orani) * self.dogrulama_orani:
+            return 'dogrulama'
+        return 'egitim'
+
+    def guncelle(self, siniflar):
+        """
+        Sınıf klasörlerindeki yeni dosyaları ata, silinmiş olanları çıkar.
+        Yeni atanan dosya sayısını döndürür.
+        """
+        siniflar = list(siniflar)
+        index = HashIndex(self.kok_dizin)
+        index.uzlastir(siniflar)
+        hashler = {yol: phash for yol, phash in index.hashler() if yol.split('/', 1)[0] in siniflar}
+
+        satirlar = []
+        # Aynı çağrıdaki yakın kopyaların hangisinin grubu belirleyeceği sıradan bağımsız olsun
+        for yol in sorted(set(hashler) - set(self.kayitlar)):
+            kayit = {'bolum': self._bolum_sec(hashler[yol]), 'phash': hashler[yol]}
+            self.kayitlar[yol] = kayit
+            self._grup_ekle(kayit['phash'], kayit['bolum'])
+            satirlar.append(dict(yol=yol, **kayit))
+        for yol in list(self.kayitlar):
+            if yol.split('/', 1)[0] in siniflar and yol not in hashler:
+                del self.kayitlar[yol]
+                satirlar.append({'yol': yol, 'silindi': True})
+
+        if self._satir_sayisi + len(satirlar) > 2 * len(self.kayitlar) + 1000:
+            self._yeniden_yaz()
+        elif satirlar:
+            with open(self.dosya_yolu, 'a', encoding='utf-8') as f:
+                for satir in satirlar:
+                    f.write(json.dumps(satir, ensure_ascii=False) + '\n')
+            self._satir_sayisi += len(satirlar)
+        return sum(1 for satir in satirlar if 'bolum' in satir)
+
+    def listele(self, bolum, siniflar):
+        """Bölümdeki (yollar, etiketler); etiket sınıfın siniflar'daki sırasıdır"""
+        etiketler = {sinif: i for i, sinif in enumerate(siniflar)}
+        secilen = sorted((etiketler[yol.split('/', 1)[0]], yol) for yol, kayit in self.kayitlar.items()
+                         if kayit['bolum'] == bolum and yol.split('/', 1)[0] in etiketler)
+        return [os.path.join(self.kok_dizin, yol) for _, yol in secilen], [etiket for etiket, _ in secilen]
+
+    def sayilar(self):
+        sayilar = dict.fromkeys(BOLUMLER, 0)
+        for kayit in self.kayitlar.values():
+            sayilar[kayit['bolum']] += 1
+        return sayilar
+
+
+def bolumleri_al(kok_dizin, siniflar, **ayarlar):
+    """Manifesti yeni dosyalarla güncelle; {bölüm: (yollar, etiketler)} döndür"""
+    manifesto = BolmeManifestosu(kok_dizin, **ayarlar)
+    yeni = manifesto.guncelle(siniflar)
+    if yeni:
+        print(f"{yeni} yeni resim bölümlere atandı: {manifesto.sayilar()}")
+    return {bolum: manifesto.listele(bolum, siniflar) for bolum in BOLUMLER}
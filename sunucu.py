@@ -0,0 +1,252 @@
+import io
+import os
+import json
+import time
+import queue
+import threading
+import argparse
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+from PIL import Image
+
+GIRDI_BOYUTU = (224, 224)
+
+
+def sinif_dosyasi(model_yolu):
+    """Modelin çıktı sütunlarına karşılık gelen sınıf isimlerinin yan dosyası"""
+    return os.path.splitext(model_yolu)[0] + '.siniflar.json'
+
+
+def siniflari_kaydet(model_yolu, siniflar):
+    with open(sinif_dosyasi(model_yolu), 'w', encoding='utf-8') as f:
+        json.dump(list(siniflar), f, ensure_ascii=False)
+
+
+def sinif_isimleri(veri_yolu='veri_seti', model_yolu=None):
+    """
+    Modelin yanında kaydedilmiş sınıf isimleri; yan dosya yoksa eğitim
+    yükleyicileriyle aynı sırada (alfabetik) veri_yolu'ndaki klasörler
+    """
+    if model_yolu and os.path.exists(sinif_dosyasi(model_yolu)):
+        with open(sinif_dosyasi(model_yolu), encoding='utf-8') as f:
+            return json.load(f)
+    return sorted(d for d in os.listdir(veri_yolu) if os.path.isdir(os.path.join(veri_yolu, d)))
+
+
+def resim_hazirla(veri, img_size=GIRDI_BOYUTU):
+    """
+    Resim baytlarını eğitimdeki load_img + rescale=1/255 ile aynı şekilde
+    (tam çözünürlükte çözme, RGB, en yakın komşu yeniden boyutlandırma,
+    [0, 1]) diziye çevir. JPEG'lerde draft() kullanılmaz: küçültülmüş ölçekte
+    çözme, modelin eğitimde görmediği girdiler üretir.
+    """
+    with Image.open(io.BytesIO(veri)) as img:
+        img = img.convert('RGB').resize(img_size, Image.NEAREST)
+    return np.asarray(img, dtype=np.float32) / 255.0
+
+
+class Metrikler:
+    """Son `pencere` isteğin gecikmelerini ve batch doluluklarını tutar"""
+
+    def __init__(self, batch_boyutu, pencere=10000):
+        self.batch_boyutu = batch_boyutu
+        self.gecikmeler = deque(maxlen=pencere)
+        self.batchler = deque(maxlen=pencere)
+        self.istek_sayisi = 0
+        self.hata_sayisi = 0
+        self._kilit = threading.Lock()
+
+    def istek(self, gecikme, hata=False):
+        with self._kilit:
+            self.istek_sayisi += 1
+            self.hata_sayisi += hata
+            if not hata:
+                self.gecikmeler.append(gecikme)
+
+    def batch(self, boyut):
+        with self._kilit:
+            self.batchler.append(boyut)
+
+    def ozet(self):
+        with self._kilit:
+            gecikmeler = np.array(self.gecikmeler)
+            batchler = np.array(self.batchler)
+            ozet = {'istek': self.istek_sayisi, 'hata': self.hata_sayisi, 'batch': len(batchler)}
+        if len(gecikmeler):
+            ozet['p50_ms'] = float(np.percentile(gecikmeler, 50) * 1e3)
+            ozet['p99_ms'] = float(np.percentile(gecikmeler, 99) * 1e3)
+        if len(batchler):
+            ozet['ortalama_batch'] = float(batchler.mean())
+            ozet['batch_doluluk'] = float(batchler.mean() / self.batch_boyutu)
+        return ozet
+
+
+class _Istek:
+    __slots__ = ('x', 'sonuc', 'hata', 'hazir')
+
+    def __init__(self, x):
+        self.x = x
+        self.sonuc = None
+        self.hata = None
+        self.hazir = threading.Event()
+
+
+class DinamikBatcher:
+    """
+    Eşzamanlı istekleri en fazla `batch_boyutu` resim ya da ilk istekten
+    itibaren `bekleme_ms` milisaniye dolana kadar toplar, tek bir tahmin
+    çağrısı yapar ve sonuçları isteklere geri dağıtır.
+
+    tahmin_et(x) -> (batch, sinif_sayisi) olasılıklar
+    """
+
+    def __init__(self, tahmin_et, batch_boyutu=32, bekleme_ms=10, kuyruk_boyutu=1024):
+        self.tahmin_et = tahmin_et
+        self.batch_boyutu = batch_boyutu
+        self.bekleme = bekleme_ms / 1000
+        self.kuyruk = queue.Queue(kuyruk_boyutu)
+        self.metrikler = Metrikler(batch_boyutu)
+        self.dur = threading.Event()
+        self._thread = threading.Thread(target=self._calis, name="batcher", daemon=True)
+
+    def baslat(self):
+        self._thread.start()
+        return self
+
+    def durdur(self):
+        self.dur.set()
+        self._thread.join()
+
+    def tahmin(self, x, zaman_asimi=30):
+        """Tek resmin olasılıklarını döndür (batch tamamlanana kadar bekler)"""
+        baslangic = time.perf_counter()
+        istek = _Istek(x)
+        self.kuyruk.put(istek, timeout=zaman_asimi)
+        if not istek.hazir.wait(zaman_asimi):
+            istek.hata = TimeoutError("Tahmin zaman aşımına uğradı")
+        self.metrikler.istek(time.perf_counter() - baslangic, hata=istek.hata is not None)
+        if istek.hata is not None:
+            raise istek.hata
+        return istek.sonuc
+
+    def _calis(self):
+        while not self.dur.is_set():
+            try:
+                istek = self.kuyruk.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            # Batch dolana ya da ilk istekten beri bekleme süresi geçene kadar topla
+            batch = [istek]
+            son_an = time.perf_counter() + self.bekleme
+            while len(batch) < self.batch_boyutu:
+                kalan = son_an - time.perf_counter()
+                try:
+                    batch.append(self.kuyruk.get(timeout=kalan) if kalan > 0 else self.kuyruk.get_nowait())
+                except queue.Empty:
+                    break
+            self.metrikler.batch(len(batch))
+            try:
+                olasiliklar = self.tahmin_et(np.stack([i.x for i in batch]))
+                for i, sonuc in zip(batch, olasiliklar):
+                    i.sonuc = sonuc
+            except Exception as e:
+                for i in batch:
+                    i.hata = e
+            for i in batch:
+                i.hazir.set()
+
+
+def model_tahmincisi(model):
+    """Keras modelini batcher'ın beklediği numpy -> numpy fonksiyonuna çevir"""
+    def tahmin_et(x):
+        # predict() her çağrıda veri hattı kurar; küçük batch'lerde doğrudan çağrı daha hızlıdır
+        return np.asarray(model(x, training=False))
+    return tahmin_et
+
+
+def istek_isleyici_olustur(batcher, siniflar, ilk_k=3):
+    class TahminIsleyici(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _json(self, kod, veri):
+            govde = json.dumps(veri, ensure_ascii=False).encode('utf-8')
+            self.send_response(kod)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(govde)))
+            self.end_headers()
+            self.wfile.write(govde)
+
+        def do_GET(self):
+            if self.path == '/metrikler':
+                self._json(200, batcher.metrikler.ozet())
+            elif self.path == '/saglik':
+                self._json(200, {'durum': 'hazir', 'siniflar': siniflar})
+            else:
+                self._json(404, {'hata': 'bulunamadı'})
+
+        def do_POST(self):
+            if self.path != '/tahmin':
+                self._json(404, {'hata': 'bulunamadı'})
+                return
+            uzunluk = int(self.headers.get('Content-Length', 0))
+            try:
+                x = resim_hazirla(self.rfile.read(uzunluk))
+            except Exception as e:
+                self._json(400, {'hata': f"Resim okunamadı: {e}"})
+                return
+            try:
+                olasiliklar = batcher.tahmin(x)
+            except Exception as e:
+                self._json(503, {'hata': str(e)})
+                return
+            sira = np.argsort(olasiliklar)[::-1][:ilk_k]
+            self._json(200, {
+                'sinif': siniflar[sira[0]],
+                'olasilik': float(olasiliklar[sira[0]]),
+                'ilk_k': [{'sinif': siniflar[i], 'olasilik': float(olasiliklar[i])} for i in sira]
+            })
+
+        def log_message(self, format, *args):
+            pass
+
+    return TahminIsleyici
+
+
+def sunucu_olustur(model, siniflar, host='127.0.0.1', port=8000, batch_boyutu=32, bekleme_ms=10):
+    """(HTTP sunucusu, batcher) döndür; sunucu serve_forever ile çalıştırılır"""
+    batcher = DinamikBatcher(model_tahmincisi(model), batch_boyutu, bekleme_ms).baslat()
+    sunucu = ThreadingHTTPServer((host, port), istek_isleyici_olustur(batcher, siniflar))
+    sunucu.daemon_threads = True
+    return sunucu, batcher
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Eğitilmiş SE-ResNet modeli için dinamik batch'leyen tahmin sunucusu")
+    parser.add_argument('--model', default='final_senet_model.h5')
+    parser.add_argument('--veri-yolu', default='veri_seti',
+                        help="model yanında sınıf dosyası yoksa sınıf isimlerinin okunacağı eğitim klasörü")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--batch-boyutu', type=int, default=32)
+    parser.add_argument('--bekleme-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(args.model, compile=False)
+    siniflar = sinif_isimleri(args.veri_yolu, args.model)
+    # İlk çağrı grafiği hazırlar; ilk isteğin gecikmesine yansımasın
+    model(np.zeros((1,) + GIRDI_BOYUTU + (3,), dtype=np.float32), training=False)
+
+    sunucu, batcher = sunucu_olustur(model, siniflar, args.host, args.port, args.batch_boyutu, args.bekleme_ms)
+    print(f"Sunucu http://{args.host}:{args.port} adresinde çalışıyor (POST /tahmin, GET /metrikler)")
+    try:
+        sunucu.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sunucu.server_close()
+        batcher.durdur()
+        print(json.dumps(batcher.metrikler.ozet(), ensure_ascii=False))
@@ -0,0 +1,243 @@
+import os
+import json
+import heapq
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import tensorflow as tf
+
+from input_pipeline import AUTOTUNE, artirma_katmanlari, batch_hazirla, resim_coz
+from split_manifest import BOLUMLER, BolmeManifestosu
+
+INDEKS_DOSYASI = 'indeks.json'
+
+_OZELLIKLER = {
+    'resim': tf.io.FixedLenFeature([], tf.string),
+    'etiket': tf.io.FixedLenFeature([], tf.int64),
+    'sinif': tf.io.FixedLenFeature([], tf.string),
+    'phash': tf.io.FixedLenFeature([], tf.string),
+    'yol': tf.io.FixedLenFeature([], tf.string),
+}
+
+
+def _bayt(deger):
+    return tf.train.Feature(bytes_list=tf.train.BytesList(value=[deger]))
+
+
+def _ornek(bayt, etiket, sinif, phash, yol):
+    return tf.train.Example(features=tf.train.Features(feature={
+        'resim': _bayt(bayt),
+        'etiket': tf.train.Feature(int64_list=tf.train.Int64List(value=[etiket])),
+        'sinif': _bayt(sinif.encode('utf-8')),
+        'phash': _bayt(phash.encode('ascii')),
+        'yol': _bayt(yol.encode('utf-8')),
+    })).SerializeToString()
+
+
+def shard_planla(boyutlar, hedef_bayt, en_az_shard=8, tohum=42):
+    """
+    Dosyaları toplam baytları dengeli shard'lara dağıt; her shard için dosya
+    indekslerinin listesini döndürür. Dosyalar karıştırılmış sırayla o an en
+    küçük shard'a eklenir: shard'lar en fazla bir dosya boyutu kadar farklıdır
+    ve her shard tüm sınıflardan karışık resim içerir.
+    """
+    if not boyutlar:
+        return []
+    shard_sayisi = max(en_az_shard, -(-sum(boyutlar) // hedef_bayt))
+    shard_sayisi = min(shard_sayisi, len(boyutlar))
+    shardlar = [[] for _ in range(shard_sayisi)]
+    yigin = [(0, i) for i in range(shard_sayisi)]
+    for i in np.random.default_rng(tohum).permutation(len(boyutlar)):
+        bayt, s = heapq.heappop(yigin)
+        shardlar[s].append(int(i))
+        heapq.heappush(yigin, (bayt + boyutlar[i], s))
+    return shardlar
+
+
+def _dosyalari_listele(manifesto, siniflar):
+    """{bölüm: [(göreli yol, etiket, phash, boyut, mtime)]}; okunamayanlar atlanır"""
+    bolumler = {bolum: [] for bolum in BOLUMLER}
+    etiketler = {sinif: i for i, sinif in enumerate(siniflar)}
+    for yol, kayit in sorted(manifesto.kayitlar.items()):
+        sinif = yol.split('/', 1)[0]
+        if sinif not in etiketler:
+            continue
+        try:
+            st = os.stat(os.path.join(manifesto.kok_dizin, yol))
+        except OSError:
+            continue
+        bolumler[kayit['bolum']].append((yol, etiketler[sinif], kayit['phash'], st.st_size, st.st_mtime_ns))
+    return bolumler
+
+
+def _imza(bolumler, siniflar, ayarlar):
+    h = hashlib.sha256(json.dumps([list(siniflar), ayarlar]).encode())
+    for bolum, dosyalar in bolumler.items():
+        for yol, etiket, phash, boyut, mtime in dosyalar:
+            h.update(f"{bolum}|{yol}|{etiket}|{phash}|{boyut}|{mtime}\n".encode())
+    return h.hexdigest()
+
+
+def _shard_yaz(kok_dizin, hedef, dosyalar, siniflar):
+    sayi = 0
+    with tf.io.TFRecordWriter(hedef + '.tmp') as yazici:
+        for yol, etiket, phash, _, _ in dosyalar:
+            try:
+                with open(os.path.join(kok_dizin, yol), 'rb') as f:
+                    bayt = f.read()
+            except OSError:
+                continue
+            yazici.write(_ornek(bayt, etiket, siniflar[etiket], phash, yol))
+            sayi += 1
+    os.replace(hedef + '.tmp', hedef)
+    return sayi
+
+
+def indeks_oku(shard_dizini):
+    with open(os.path.join(shard_dizini, INDEKS_DOSYASI), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def shardlari_yaz(kok_dizin, shard_dizini, siniflar=None, hedef_mb=64, en_az_shard=8, tohum=42,
+                  is_parcacigi=4, zorla=False):
+    """
+    kok_dizin'deki resimleri bölme manifestosundaki bölümlerine göre
+    <bölüm>-00000-of-000NN.tfrecord shard'larına paketler. Her kayıtta
+    resmin orijinal baytları (yeniden kodlanmaz), etiket, sınıf adı, phash ve
+    göreli yol bulunur. Shard'lar yaklaşık hedef_mb boyutunda ve bayt olarak
+    dengelidir; çalışanlara dağıtılabilmesi için bölüm başına en az
+    en_az_shard tanedir (dosya sayısı yetmezse daha az).
+
+    siniflar verilmezse kok_dizin'deki tüm klasörlerdir. Sınıflar her zaman
+    ada göre sıralanır; etiketler manifest_listesi ve sunucu ile aynı sırada
+    olur ve imza, shard'ları hangi yolun yazdığına bağlı kalmaz.
+
+    indeks.json en son yazılır ve kaynak dosyaların imzasını tutar; imza
+    değişmediyse (zorla verilmedikçe) hiçbir şey yazılmaz. İndeksi döndürür.
+    """
+    if siniflar is None:
+        siniflar = (d for d in os.listdir(kok_dizin) if os.path.isdir(os.path.join(kok_dizin, d)))
+    siniflar = sorted(siniflar)
+    manifesto = BolmeManifestosu(kok_dizin)
+    manifesto.guncelle(siniflar)
+    bolumler = _dosyalari_listele(manifesto, siniflar)
+    imza = _imza(bolumler, siniflar, [hedef_mb, en_az_shard, tohum])
+
+    if not zorla:
+        try:
+            indeks = indeks_oku(shard_dizini)
+            if indeks.get('imza') == imza:
+                return indeks
+        except (OSError, ValueError):
+            pass
+
+    os.makedirs(shard_dizini, exist_ok=True)
+    isler = []
+    indeks = {'imza': imza, 'siniflar': list(siniflar), 'bolumler': {}}
+    for bolum, dosyalar in bolumler.items():
+        plan = shard_planla([d[3] for d in dosyalar], int(hedef_mb * 2**20), en_az_shard, tohum)
+        indeks['bolumler'][bolum] = []
+        for i, secilen in enumerate(plan):
+            ad = f"{bolum}-{i:05d}-of-{len(plan):05d}.tfrecord"
+            shard = [dosyalar[j] for j in secilen]
+            indeks['bolumler'][bolum].append({'dosya': ad, 'sayi': len(shard), 'bayt': sum(d[3] for d in shard)})
+            isler.append((ad, shard))
+
+    with ThreadPoolExecutor(max_workers=is_parcacigi) as havuz:
+        sayilar = list(havuz.map(lambda s: _shard_yaz(kok_dizin, os.path.join(shard_dizini, s[0]), s[1], siniflar),
+                                 isler))
+    # Okunamayan dosyalar atlandıysa gerçek kayıt sayısını yaz
+    sayilar = dict(zip((ad for ad, _ in isler), sayilar))
+    for shardlar in indeks['bolumler'].values():
+        for shard in shardlar:
+            shard['sayi'] = sayilar[shard['dosya']]
+
+    with open(os.path.join(shard_dizini, INDEKS_DOSYASI + '.tmp'), 'w', encoding='utf-8') as f:
+        json.dump(indeks, f, ensure_ascii=False)
+    os.replace(os.path.join(shard_dizini, INDEKS_DOSYASI + '.tmp'), os.path.join(shard_dizini, INDEKS_DOSYASI))
+
+    # Önceki dışa aktarmadan kalan shard'lar
+    guncel = set(sayilar)
+    for ad in os.listdir(shard_dizini):
+        if ad.endswith('.tfrecord') and ad not in guncel:
+            os.remove(os.path.join(shard_dizini, ad))
+    return indeks
+
+
+def bolum_sayisi(indeks, bolum, calisan_sayisi=1, calisan_indeksi=0):
+    """Çalışanın okuyacağı kayıt sayısı (shard_veri_seti ile aynı shard dağılımı)"""
+    return sum(shard['sayi'] for shard in indeks['bolumler'][bolum][calisan_indeksi::calisan_sayisi])
+
+
+def shard_veri_seti(shard_dizini, bolum, img_size=(224, 224), batch_size=32, karistir=False, artirma=None,
+                    calisan_sayisi=1, calisan_indeksi=0, paralel_okuma=8, karistirma_tamponu=1024, tohum=42):
+    """
+    Bölümün shard'larından tf.data.Dataset oluşturur. Shard'lar çalışanlara
+    dosya düzeyinde paylaştırılır (calisan_indeksi, calisan_indeksi +
+    calisan_sayisi, ...), her çalışan yalnızca kendi shard'larını açar. karistir
+    verilirse shard sırası her epoch karıştırılır, paralel_okuma shard aynı
+    anda okunur ve kayıtlar çözülmeden önce karistirma_tamponu'nda karıştırılır.
+
+    batch_size çalışan başınadır; tf.distribute ile çalışanın global batch'teki
+    payı verilmelidir. Çalışan sayısı shard sayısından fazla olamaz.
+    """
+    indeks = indeks_oku(shard_dizini)
+    shardlar = indeks['bolumler'][bolum]
+    if calisan_sayisi > len(shardlar):
+        raise ValueError(f"'{bolum}' bölümünde {len(shardlar)} shard var, {calisan_sayisi} çalışana "
+                         "dağıtılamaz; daha küçük --hedef-mb veya daha büyük --en-az-shard ile yeniden aktarın.")
+    dosyalar = [os.path.join(shard_dizini, shard['dosya']) for shard in shardlar]
+    sinif_sayisi = len(indeks['siniflar'])
+
+    ds = tf.data.Dataset.from_tensor_slices(dosyalar)
+    if calisan_sayisi > 1:
+        ds = ds.shard(calisan_sayisi, calisan_indeksi)
+    if karistir:
+        ds = ds.shuffle(len(dosyalar), seed=tohum, reshuffle_each_iteration=True)
+    ds = ds.interleave(tf.data.TFRecordDataset, cycle_length=max(1, min(paralel_okuma, len(dosyalar))),
+                       num_parallel_calls=AUTOTUNE, deterministic=not karistir)
+    if karistir:
+        # Sıkıştırılmış baytlar karıştırılır; çözülmüş resimlere göre tampon ~20 kat küçük kalır
+        ds = ds.shuffle(karistirma_tamponu, seed=tohum, reshuffle_each_iteration=True)
+
+    def coz(kayit):
+        ornek = tf.io.parse_single_example(kayit, _OZELLIKLER)
+        return resim_coz(ornek['resim'], img_size), tf.one_hot(ornek['etiket'], sinif_sayisi)
+
+    ds = ds.map(coz, num_parallel_calls=AUTOTUNE, deterministic=not karistir)
+    ds = batch_hazirla(ds, batch_size, artirma)
+    if calisan_sayisi > 1:
+        # Elle paylaştırıldı; tf.distribute'un ikinci kez paylaştırmaması için
+        secenekler = tf.data.Options()
+        secenekler.experimental_distribute.auto_shard_policy = tf.data.experimental.AutoShardPolicy.OFF
+        ds = ds.with_options(secenekler)
+    return ds
+
+
+def veri_cesitlendirme_shard(veri_yolu='veri_seti', shard_dizini=None, img_size=(224, 224), batch_size=32,
+                             calisan_sayisi=1, calisan_indeksi=0, tohum=42):
+    """
+    veri_cesitlendirme ile aynı (eğitim, doğrulama, test) üçlüsünü shard'lardan
+    döndürür. Shard'lar eksik veya eskiyse önce yeniden yazılır; çok çalışanlı
+    eğitimde bu, çalışanlar başlamadan 'shard' alt komutuyla yapılmalıdır.
+    """
+    if shard_dizini is None:
+        shard_dizini = f"{veri_yolu.rstrip('/')}_shards"
+    if calisan_sayisi > 1:
+        indeks = indeks_oku(shard_dizini)
+    else:
+        if not os.path.exists(veri_yolu) or not os.listdir(veri_yolu):
+            raise ValueError(f"'{veri_yolu}' klasörü boş veya mevcut değil!")
+        indeks = shardlari_yaz(veri_yolu, shard_dizini, tohum=tohum)
+    print(f"Bulunan sınıflar: {indeks['siniflar']}")
+    print(', '.join(f"{bolum}: {bolum_sayisi(indeks, bolum)} resim / {len(indeks['bolumler'][bolum])} shard"
+                    for bolum in BOLUMLER))
+
+    ortak = dict(img_size=img_size, batch_size=batch_size, calisan_sayisi=calisan_sayisi,
+                 calisan_indeksi=calisan_indeksi)
+    train_ds = shard_veri_seti(shard_dizini, 'egitim', karistir=True, artirma=artirma_katmanlari(tohum),
+                               tohum=tohum, **ortak)
+    val_ds = shard_veri_seti(shard_dizini, 'dogrulama', **ortak)
+    test_ds = shard_veri_seti(shard_dizini, 'test', **ortak)
+    return train_ds, val_ds, test_ds
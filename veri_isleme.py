@@ -1,56 +1,95 @@
 import os
+import sys
+import json
 import numpy as np
-from sklearn.model_selection import train_test_split
-from tensorflow.keras.preprocessing.image import load_img, img_to_array
-from tensorflow.keras.utils import to_categorical
-from tensorflow.keras.preprocessing.image import ImageDataGenerator
-from model import model_olustur
-import tensorflow as tf
-
-def veri_seti_hazirla(base_dir="dataset", img_size=(224, 224)):
+import argparse
+
+# TensorFlow ve icrawler ağır bağımlılıklardır (içe aktarma saniyeler
+# sürer); her fonksiyon yalnızca ihtiyaç duyduğunu, ilk çağrıldığında yükler.
+
+SINIFLAR = ['kedi', 'kopek', 'araba', 'ev', 'agac',
+            'insan', 'kus', 'cicek', 'telefon', 'bilgisayar']
+
+def veri_seti_hazirla(base_dir="dataset", img_size=(224, 224), onbellek_dizini="dataset_cache"):
+    """
+    Eğitim (eğitim + doğrulama bölümleri) ve test ayrımı base_dir'in bölme
+    manifestosundan (split_manifest) gelir; yeni resimler önce manifeste atanır.
+    onbellek_dizini verilirse resimler bir kez uint8 memmap önbelleğe yazılır ve
+    X_train/X_test, okundukça normalize edilen OnbellekGorunumu nesneleri olur;
+    indekslenen (veya batchler() ile okunan) her batch ayrı normalize edilir.
+    None verilirse tüm veri eskisi gibi float32 dizilere yüklenir.
+    """
+    from tensorflow.keras.utils import to_categorical
+    from split_manifest import bolumleri_al
+
     # Sınıf listesi - sabit sınıfları kullan
-    siniflar = ['kedi', 'kopek', 'araba', 'ev', 'agac', 
-                'insan', 'kus', 'cicek', 'telefon', 'bilgisayar']
+    siniflar = SINIFLAR
     sinif_sayisi = len(siniflar)
+    bolumler = bolumleri_al(base_dir, siniflar)
+    egitim_yollari = bolumler['egitim'][0] + bolumler['dogrulama'][0]
+    egitim_etiketleri = bolumler['egitim'][1] + bolumler['dogrulama'][1]
     
-    # Veri ve etiketleri tutacak listeler
-    X = []
-    y = []
-    
-    # Her sınıf için
-    for i, sinif in enumerate(siniflar):
-        sinif_dir = os.path.join(base_dir, sinif)
-        if not os.path.exists(sinif_dir):
-            continue
-            
-        for img_name in os.listdir(sinif_dir):
+    if onbellek_dizini is not None:
+        from dataset_cache import onbellek_ac, onbellek_dosyalari, OnbellekGorunumu
+
+        X, y = onbellek_ac(base_dir, onbellek_dizini, siniflar, img_size)
+        y = to_categorical(y, sinif_sayisi)
+        # Önbellek satırları kaynak dosyalarının bölümüne göre ayrılır
+        satirlar = {os.path.normpath(os.path.join(base_dir, yol)): i
+                    for i, yol in enumerate(onbellek_dosyalari(onbellek_dizini))}
+        train_idx, test_idx = (np.array([satirlar[os.path.normpath(yol)] for yol in yollar
+                                         if os.path.normpath(yol) in satirlar], dtype=np.int64)
+                               for yollar in (egitim_yollari, bolumler['test'][0]))
+        return (OnbellekGorunumu(X, train_idx), OnbellekGorunumu(X, test_idx),
+                y[train_idx], y[test_idx], sinif_sayisi)
+    
+    from tensorflow.keras.preprocessing.image import load_img, img_to_array
+
+    def yukle(yollar, etiketler):
+        X = []
+        y = []
+        for img_path, etiket in zip(yollar, etiketler):
             try:
-                img_path = os.path.join(sinif_dir, img_name)
                 img = load_img(img_path, target_size=img_size)
-                img_array = img_to_array(img)
-                img_array = img_array / 255.0
-                X.append(img_array)
-                y.append(i)
-            except:
+            except Exception:
                 continue
+            X.append(img_to_array(img) / 255.0)
+            y.append(etiket)
+        return np.array(X), to_categorical(np.array(y, dtype=np.int64), sinif_sayisi)
     
-    X = np.array(X)
-    y = np.array(y)
-    y = to_categorical(y, sinif_sayisi)
-    
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, y_train = yukle(egitim_yollari, egitim_etiketleri)
+    X_test, y_test = yukle(*bolumler['test'])
     
     return X_train, X_test, y_train, y_test, sinif_sayisi
 
-def veri_cesitlendirme():
+def veri_cesitlendirme(yukleyici='keras', img_size=(224, 224), batch_size=32):
+    """
+    (eğitim, doğrulama, test) üçlüsünü döndürür. yukleyici='tfdata' ise
+    paralel çözen ve önbellekleyen tf.data hattı, 'shard' ise veri_seti_shards/
+    altındaki TFRecord shard'ları, 'keras' ise ImageDataGenerator kullanılır.
+    Üç bölüm de veri_seti/'nin bölme manifestosundan (split_manifest) okunur.
+    """
     veri_yolu = 'veri_seti'
-    test_yolu = 'test_veri_seti'
+    
+    if yukleyici == 'tfdata':
+        from input_pipeline import veri_cesitlendirme_tfdata
+
+        return veri_cesitlendirme_tfdata(veri_yolu, img_size, batch_size)
+    if yukleyici == 'shard':
+        from tfrecord_shards import veri_cesitlendirme_shard
+
+        return veri_cesitlendirme_shard(veri_yolu, img_size=img_size, batch_size=batch_size)
+    
+    from tensorflow.keras.preprocessing.image import ImageDataGenerator
+    from input_pipeline import manifest_listesi
+    from dataset_cache import DosyaDizisi
     
     # Klasör kontrolü
     if not os.path.exists(veri_yolu) or not os.listdir(veri_yolu):
         raise ValueError(f"'{veri_yolu}' klasörü boş veya mevcut değil!")
     
-    print(f"Bulunan sınıflar: {os.listdir(veri_yolu)}")
+    siniflar, egitim, dogrulama, test = manifest_listesi(veri_yolu)
+    print(f"Bulunan sınıflar: {siniflar}")
     
     train_datagen = ImageDataGenerator(
         rotation_range=20,
@@ -58,99 +97,60 @@ def veri_cesitlendirme():
         height_shift_range=0.2,
         horizontal_flip=True,
         fill_mode='nearest',
-        validation_split=0.15,
         rescale=1./255
     )
-    
-    print("Eğitim verisi yükleniyor...")
-    train_generator = train_datagen.flow_from_directory(
-        veri_yolu,
-        target_size=(224, 224),
-        batch_size=32,
-        class_mode='categorical',
-        subset='training',
-        shuffle=True
-    )
-    
-    print("Doğrulama verisi yükleniyor...")
-    validation_generator = train_datagen.flow_from_directory(
-        veri_yolu,
-        target_size=(224, 224),
-        batch_size=32,
-        class_mode='categorical',
-        subset='validation',
-        shuffle=True
-    )
-    
+    # Doğrulama ve test artırılmaz
     test_datagen = ImageDataGenerator(rescale=1./255)
     
-    if not os.path.exists(test_yolu):
-        print(f"'{test_yolu}' klasörü bulunamadı. Önce veriyi_ayir() fonksiyonunu çalıştırın.")
-        return None, None, None
-        
-    print("Test verisi yükleniyor...")
-    test_generator = test_datagen.flow_from_directory(
-        test_yolu,
-        target_size=(224, 224),
-        batch_size=32,
-        class_mode='categorical',
-        shuffle=False
-    )
+    print(f"Eğitim: {len(egitim[0])}, doğrulama: {len(dogrulama[0])}, test: {len(test[0])} resim")
+    train_generator = DosyaDizisi(*egitim, len(siniflar), train_datagen, img_size, batch_size, shuffle=True)
+    validation_generator = DosyaDizisi(*dogrulama, len(siniflar), test_datagen, img_size, batch_size, shuffle=False)
+    test_generator = DosyaDizisi(*test, len(siniflar), test_datagen, img_size, batch_size, shuffle=False)
     
     return train_generator, validation_generator, test_generator
 
-def veriyi_ayir():
-    # Her sınıf için test verilerini ayır
-    siniflar = ['kedi', 'kopek', 'araba', 'ev', 'agac', 
-                'insan', 'kus', 'cicek', 'telefon', 'bilgisayar']
-    
-    for sinif in siniflar:
-        kaynak_klasor = f'veri_seti/{sinif}'
-        hedef_klasor = f'test_veri_seti/{sinif}'
-        
-        if not os.path.exists(hedef_klasor):
-            os.makedirs(hedef_klasor)
-        
-        # Sınıftaki tüm dosyaları listele
-        dosyalar = os.listdir(kaynak_klasor)
-        # %15'ini test için ayır
-        test_dosya_sayisi = int(len(dosyalar) * 0.15)
-        test_dosyalari = np.random.choice(dosyalar, test_dosya_sayisi, replace=False)
-        
-        # Test dosyalarını taşı
-        for dosya in test_dosyalari:
-            kaynak = os.path.join(kaynak_klasor, dosya)
-            hedef = os.path.join(hedef_klasor, dosya)
-            os.rename(kaynak, hedef)
+def veriyi_ayir(veri_yolu='veri_seti'):
+    """
+    veri_yolu'ndaki resimleri dosya taşımadan eğitim/doğrulama/test bölümlerine
+    ata (split_manifest). Yalnızca henüz atanmamış dosyalar hash'lenir, önceki
+    atamalar değişmez. Yükleyiciler de okumadan önce manifesti günceller.
+    """
+    from split_manifest import BolmeManifestosu
 
-if __name__ == "__main__":
-    from scraper import veri_topla
-    
-    # Önce veriyi topla
-    print("Veri toplama başlıyor...")
-    veri_topla(hedef_sayi=500)
-    
-    # Sonra veri setini hazırla
-    print("\nVeri seti hazırlanıyor...")
-    X_train, X_test, y_train, y_test, sinif_sayisi = veri_seti_hazirla()
-    
-    print("\nVeri seti hazır!")
-    print(f"Eğitim seti boyutu: {X_train.shape}")
-    print(f"Test seti boyutu: {X_test.shape}")
-    print(f"Sınıf sayısı: {sinif_sayisi}")
-    
-    # Veri çeşitlendirme ve bölme
-    train_gen, val_gen, test_gen = veri_cesitlendirme()
+    siniflar = [sinif for sinif in SINIFLAR if os.path.isdir(os.path.join(veri_yolu, sinif))]
+    manifesto = BolmeManifestosu(veri_yolu)
+    yeni = manifesto.guncelle(siniflar)
+    print(f"{yeni} yeni resim atandı. Bölümler: {manifesto.sayilar()}")
+    if os.path.isdir('test_veri_seti'):
+        print("test_veri_seti/ eski (dosya taşıyan) ayırmadan kalmış ve artık okunmuyor; "
+              "içindeki resimleri veri_seti/ altına geri taşırsanız manifeste eklenirler.")
+
+def model_egit(yukleyici='keras', se_asamalari=None, se_ratio=16, hizli_mod='kapali',
+               ozellik_onbellegi=False, artirma_sayisi=4, epochs=20, ince_ayar_epochs=15,
+               weights='imagenet', model_yolu='final_senet_model.h5'):
+    """
+    SE-ResNet'i iki aşamada eğit (donuk omurga + fine-tuning), test et ve
+    kaydet. se_asamalari verilmezse SE 4. ve 5. aşamalara, özellik önbelleği
+    ile yalnızca 5. aşamaya eklenir (önbellek conv4 çıktısını tutar).
+    """
+    import tensorflow as tf
+    from model import model_olustur, hizli_egitim_ayarla, model_derle
+    from sunucu import sinif_isimleri, siniflari_kaydet
+
+    if se_asamalari is None:
+        se_asamalari = (5,) if ozellik_onbellegi else (4, 5)
+
+    # Veri çeşitlendirme ve bölme (üç yükleyici de sınıfları ada göre sıralar)
+    train_gen, val_gen, test_gen = veri_cesitlendirme(yukleyici=yukleyici)
+    siniflar = sinif_isimleri('veri_seti')
     
-    # Modeli oluştur
-    model = model_olustur()
+    # Modeli oluştur (hassasiyet politikası katmanlar oluşturulmadan önce ayarlanmalı)
+    hizli_egitim_ayarla(hizli_mod)
+    hizli = hizli_mod != 'kapali'
+    model = model_olustur(weights=weights, se_asamalari=tuple(se_asamalari), ratio=se_ratio)
     
     # Modeli derle
-    model.compile(
-        optimizer=tf.keras.optimizers.Adam(1e-4),  # Başlangıç learning rate'i
-        loss='categorical_crossentropy',
-        metrics=['accuracy']
-    )
+    model_derle(model, 1e-4, hizli)  # Başlangıç learning rate'i
     
     # Model checkpoint ve learning rate scheduling ekle
     callbacks = [
@@ -175,12 +175,24 @@ if __name__ == "__main__":
     
     # İlk eğitim
     print("İlk eğitim başlıyor...")
-    history = model.fit(
-        train_gen,
-        validation_data=val_gen,
-        epochs=20,
-        callbacks=callbacks
-    )
+    if ozellik_onbellegi:
+        from feature_cache import OzellikOnbellegi
+
+        # Omurga donuk: yalnızca SE ve sınıflandırma başı önbellekteki özelliklerle eğitilir.
+        # ModelCheckpoint tüm modeli beklediği için bu aşamada kullanılmaz.
+        history = OzellikOnbellegi(model, artirma_sayisi=artirma_sayisi).egit(
+            epochs=epochs,
+            ogrenme_orani=1e-4,
+            callbacks=callbacks[:2],
+            hizli=hizli
+        )
+    else:
+        history = model.fit(
+            train_gen,
+            validation_data=val_gen,
+            epochs=epochs,
+            callbacks=callbacks
+        )
     
     # Fine-tuning
     print("\nFine-tuning başlıyor...")
@@ -190,17 +202,13 @@ if __name__ == "__main__":
         layer.trainable = True
     
     # Daha düşük learning rate ile yeniden derle
-    model.compile(
-        optimizer=tf.keras.optimizers.Adam(1e-5),
-        loss='categorical_crossentropy',
-        metrics=['accuracy']
-    )
+    model_derle(model, 1e-5, hizli)
     
     # Fine-tuning eğitimi
     history_fine = model.fit(
         train_gen,
         validation_data=val_gen,
-        epochs=15,
+        epochs=ince_ayar_epochs,
         callbacks=callbacks
     )
     
@@ -211,4 +219,346 @@ if __name__ == "__main__":
     print(f"Test doğruluğu: {test_sonuclari[1]:.4f}")
     
     # Modeli kaydet
-    model.save('final_senet_model.h5') 
\ No newline at end of file
+    model.save(model_yolu)
+    siniflari_kaydet(model_yolu, siniflar)
+    return model
+
+def dagitik_egit(shard_dizini='veri_seti_shards', batch_size=32, se_asamalari=None, se_ratio=16,
+                 hizli_mod='kapali', epochs=20, ince_ayar_epochs=15, weights='imagenet',
+                 yedek_dizini='dagitik_yedek', yedek_adimi=None, adim_siniri=None,
+                 model_yolu='final_senet_model.h5', rapor_yolu=None):
+    """
+    model_egit'in tf.distribute ile çok çalışanlı hali (küme TF_CONFIG'den
+    okunur). Veri shard'lardan (shard alt komutu) çalışanlara paylaştırılır,
+    batch_size replika başınadır ve iki aşamanın öğrenme oranları global
+    batch'e göre doğrusal ölçeklenir. Yarıda kalan eğitim aynı komutla son
+    epoch (veya yedek_adimi) kaydından devam eder.
+    """
+    from distributed import DagitikEgitim, ogrenme_orani_olcekle, strateji_olustur
+    from sunucu import siniflari_kaydet
+
+    # Strateji diğer TensorFlow işlemlerinden önce oluşturulmalı
+    strateji = strateji_olustur()
+    import tensorflow as tf
+    from model import model_olustur, hizli_egitim_ayarla, model_derle
+    from tfrecord_shards import indeks_oku
+
+    global_batch = batch_size * strateji.num_replicas_in_sync
+    ilk_oran = ogrenme_orani_olcekle(1e-4, global_batch)
+    ince_ayar_orani = ogrenme_orani_olcekle(1e-5, global_batch)
+    print(f"{strateji.num_replicas_in_sync} replika, global batch {global_batch}, "
+          f"öğrenme oranları {ilk_oran:g} / {ince_ayar_orani:g}")
+
+    # Modelin çıktı sütunları shard indeksindeki sınıf sırasındadır
+    siniflar = indeks_oku(shard_dizini)['siniflar']
+    # XLA dağıtık adımlarda kullanılmaz; yalnızca hassasiyet politikası ayarlanır
+    hizli_egitim_ayarla(hizli_mod)
+    with strateji.scope():
+        model = model_olustur(sinif_sayisi=len(siniflar), weights=weights,
+                              se_asamalari=(4, 5) if se_asamalari is None else tuple(se_asamalari),
+                              ratio=se_ratio)
+        model_derle(model, ilk_oran)
+    egitim = DagitikEgitim(strateji, model, shard_dizini, batch_size, yedek_dizini=yedek_dizini,
+                           yedek_adimi=yedek_adimi, adim_siniri=adim_siniri)
+
+    callbacks = [
+        tf.keras.callbacks.EarlyStopping(
+            monitor='val_loss',
+            patience=5,
+            restore_best_weights=True
+        ),
+        tf.keras.callbacks.ReduceLROnPlateau(
+            monitor='val_loss',
+            factor=0.2,
+            patience=3,
+            min_lr=ogrenme_orani_olcekle(1e-6, global_batch)
+        )
+    ]
+    # Dosyaları yalnızca baş çalışan yazar
+    if egitim.bas_calisan:
+        callbacks.append(tf.keras.callbacks.ModelCheckpoint(
+            'best_model.h5',
+            monitor='val_accuracy',
+            save_best_only=True,
+            mode='max'
+        ))
+
+    print("İlk eğitim başlıyor...")
+    egitim.egit('asama1', epochs, callbacks)
+
+    print("\nFine-tuning başlıyor...")
+    for layer in model.layers[-50:]:  # Son 50 katmanı çöz
+        layer.trainable = True
+    with strateji.scope():
+        model_derle(model, ince_ayar_orani)
+    egitim.egit('asama2', ince_ayar_epochs, callbacks)
+
+    print("\nTest sonuçları:")
+    test_kaybi, test_dogrulugu = egitim.degerlendir('test')
+    print(f"Test kaybı: {test_kaybi:.4f}")
+    print(f"Test doğruluğu: {test_dogrulugu:.4f}")
+
+    if egitim.bas_calisan:
+        model.save(model_yolu)
+        siniflari_kaydet(model_yolu, siniflar)
+        if rapor_yolu:
+            with open(rapor_yolu, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'calisan_sayisi': egitim.calisan_sayisi,
+                    'global_batch': global_batch,
+                    'ogrenme_oranlari': [ilk_oran, ince_ayar_orani],
+                    'adimlar': egitim.adimlar,
+                    'hiz': egitim.hiz_ozeti(),
+                    'olcumler': egitim.olcumler,
+                    'test': {'kayip': test_kaybi, 'dogruluk': test_dogrulugu}
+                }, f, ensure_ascii=False, indent=2)
+    egitim.yedekleri_sil()
+    return model
+
+def model_degerlendir(model_yolu='final_senet_model.h5', yukleyici='keras'):
+    """
+    Kaydedilmiş modeli veri_seti/'nin test bölümünde değerlendir; (kayıp,
+    doğruluk) döndür. Model yanında sınıf isimleri varsa çıktı sütunları test
+    etiketlerinin sırasına dizilir.
+    """
+    import tensorflow as tf
+    from sunucu import sinif_isimleri
+
+    _, _, test_gen = veri_cesitlendirme(yukleyici=yukleyici)
+    model = tf.keras.models.load_model(model_yolu, compile=False)
+    model_siniflari = sinif_isimleri('veri_seti', model_yolu)
+    veri_siniflari = sinif_isimleri('veri_seti')
+    if model_siniflari != veri_siniflari:
+        if sorted(model_siniflari) != veri_siniflari:
+            raise ValueError(f"Modelin sınıfları ({model_siniflari}) veri_seti/ sınıflarıyla "
+                             f"({veri_siniflari}) aynı değil!")
+        sira = [model_siniflari.index(sinif) for sinif in veri_siniflari]
+        model = tf.keras.Model(model.input, tf.keras.layers.Lambda(
+            lambda cikti: tf.gather(cikti, sira, axis=-1))(model.output))
+    model.compile(loss='categorical_crossentropy', metrics=['accuracy'])
+    test_sonuclari = model.evaluate(test_gen)
+    print(f"Test kaybı: {test_sonuclari[0]:.4f}")
+    print(f"Test doğruluğu: {test_sonuclari[1]:.4f}")
+    return test_sonuclari
+
+def veri_seti_ozeti(onbellek_dizini="dataset_cache"):
+    """Veri setini hazırla (gerekirse önbelleği oluştur) ve boyutlarını yazdır"""
+    X_train, X_test, y_train, y_test, sinif_sayisi = veri_seti_hazirla(onbellek_dizini=onbellek_dizini)
+    
+    print("\nVeri seti hazır!")
+    print(f"Eğitim seti boyutu: {X_train.shape}")
+    print(f"Test seti boyutu: {X_test.shape}")
+    print(f"Sınıf sayısı: {sinif_sayisi}")
+
+def onbellek_hazirla(base_dir="dataset", onbellek_dizini="dataset_cache", img_size=(224, 224)):
+    """Yalnızca uint8 memmap önbelleğini oluştur/güncelle (bölme ve etiket kodlaması yapılmaz)"""
+    from dataset_cache import onbellek_ac
+
+    X, y = onbellek_ac(base_dir, onbellek_dizini, SINIFLAR, img_size)
+    print(f"Önbellek hazır: {onbellek_dizini} ({len(y)} resim, {X.nbytes / 2**20:.0f} MB)")
+
+def shardlari_hazirla(kaynak='veri_seti', shard_dizini=None, hedef_mb=64, en_az_shard=8, zorla=False):
+    """kaynak'ı bölümlerine göre TFRecord shard'larına paketle (kaynak değişmediyse atlanır)"""
+    from tfrecord_shards import shardlari_yaz
+
+    shard_dizini = shard_dizini or f"{kaynak.rstrip('/')}_shards"
+    # Sınıflar, yükleyicinin (veri_cesitlendirme_shard) yazacağı gibi kaynak'taki tüm klasörlerdir
+    indeks = shardlari_yaz(kaynak, shard_dizini, hedef_mb=hedef_mb, en_az_shard=en_az_shard, zorla=zorla)
+    for bolum, shardlar in indeks['bolumler'].items():
+        print(f"{bolum}: {sum(s['sayi'] for s in shardlar)} resim, {len(shardlar)} shard, "
+              f"{sum(s['bayt'] for s in shardlar) / 2**20:.0f} MB")
+    print(f"Shard'lar hazır: {shard_dizini}")
+
+def _model_secenekleri():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--se-asamalari', type=int, nargs='*', default=None,
+                        help="SE bloğu eklenecek ResNet aşamaları (2-5; varsayılan: 4 5, "
+                             "--ozellik-onbellegi ile 5)")
+    parser.add_argument('--se-ratio', type=int, default=16, help="SE bloklarındaki daraltma oranı")
+    parser.add_argument('--hizli', choices=['kapali', 'float16', 'bfloat16'], default='kapali',
+                        help="karma hassasiyet + XLA ile hızlı eğitim modu")
+    parser.add_argument('--epochs', type=int, default=20, help="ilk aşama epoch sayısı")
+    parser.add_argument('--ince-ayar-epochs', type=int, default=15, help="fine-tuning epoch sayısı")
+    parser.add_argument('--agirliksiz', action='store_true',
+                        help="ImageNet ağırlıkları yerine rastgele başlat (ağ gerekmez)")
+    return parser
+
+def _egitim_secenekleri():
+    parser = argparse.ArgumentParser(add_help=False, parents=[_model_secenekleri()])
+    parser.add_argument('--yukleyici', choices=['keras', 'tfdata', 'shard'], default='keras',
+                        help="eğitim verisi yükleyicisi (varsayılan: keras ImageDataGenerator)")
+    parser.add_argument('--ozellik-onbellegi', action='store_true',
+                        help="ilk aşamada dondurulmuş omurga özelliklerini önbellekten kullan "
+                             "(SE yalnızca 5. aşamada olmalı)")
+    parser.add_argument('--artirma-sayisi', type=int, default=4,
+                        help="özellik önbelleği için resim başına artırma tohumu sayısı")
+    return parser
+
+def _toplama_secenekleri():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--hedef-sayi', type=int, default=500, help="her sınıf için hedef resim sayısı")
+    parser.add_argument('--filtre-modeli', choices=['resnet50', 'mobilenetv3', 'efficientnetb0'],
+                        default='resnet50', help="toplanan resimleri süzen ImageNet modeli")
+    parser.add_argument('--filtre-tflite', help="filtre modelinin TFLite hali (yoksa üretilir)")
+    parser.add_argument('--bellekte', action='store_true',
+                        help="indirilenleri temp_images'a yazmadan bellekte işle (yarıda kalırsa bunlar yeniden indirilir)")
+    parser.add_argument('--eszamanli-arama', type=int, default=8,
+                        help="tüm sınıflarda aynı anda çalışan arama sayısı (genel bütçe)")
+    parser.add_argument('--metrik-dosyasi', help="aşama süreleri ve sayaçların periyodik yazılacağı JSON satırları dosyası")
+    parser.add_argument('--metrik-araligi', type=float, default=10, help="metrik satırları arası saniye")
+    parser.add_argument('--metrik-portu', type=int, help="Prometheus metin biçiminde GET /metrics sunulacak port")
+    return parser
+
+def _alt_komut_kopyasi(parser):
+    """
+    Üst ayrıştırıcıda da bulunan seçeneklerin alt komuta verilecek kopyası.
+    Varsayılanlar bastırılır; yoksa alt komutun varsayılanı, alt komuttan
+    önce verilen değeri ezer ('--epochs 3 egit' -> epochs=20).
+    """
+    for action in parser._actions:
+        action.default = argparse.SUPPRESS
+    return parser
+
+def _egit(args):
+    return model_egit(
+        yukleyici=args.yukleyici,
+        se_asamalari=args.se_asamalari,
+        se_ratio=args.se_ratio,
+        hizli_mod=args.hizli,
+        ozellik_onbellegi=args.ozellik_onbellegi,
+        artirma_sayisi=args.artirma_sayisi,
+        epochs=args.epochs,
+        ince_ayar_epochs=args.ince_ayar_epochs,
+        weights=None if args.agirliksiz else 'imagenet'
+    )
+
+def _dagitik_argumanlari(args):
+    """Yerel başlatıcının çalışanlara geçireceği dagitik argümanları"""
+    argumanlar = ['--shard-dizini', args.shard_dizini, '--batch-size', str(args.batch_size),
+                  '--se-ratio', str(args.se_ratio), '--hizli', args.hizli, '--epochs', str(args.epochs),
+                  '--ince-ayar-epochs', str(args.ince_ayar_epochs), '--model', args.model]
+    if args.se_asamalari is not None:
+        argumanlar += ['--se-asamalari', *map(str, args.se_asamalari)]
+    if args.agirliksiz:
+        argumanlar.append('--agirliksiz')
+    if args.yedek_adimi:
+        argumanlar += ['--yedek-adimi', str(args.yedek_adimi)]
+    if args.adim_siniri:
+        argumanlar += ['--adim-siniri', str(args.adim_siniri)]
+    return argumanlar
+
+def _dagitik(args):
+    if not args.yerel_calisan and not args.olcekleme:
+        return dagitik_egit(
+            shard_dizini=args.shard_dizini,
+            batch_size=args.batch_size,
+            se_asamalari=args.se_asamalari,
+            se_ratio=args.se_ratio,
+            hizli_mod=args.hizli,
+            epochs=args.epochs,
+            ince_ayar_epochs=args.ince_ayar_epochs,
+            weights=None if args.agirliksiz else 'imagenet',
+            yedek_dizini=args.yedek_dizini,
+            yedek_adimi=args.yedek_adimi,
+            adim_siniri=args.adim_siniri,
+            model_yolu=args.model,
+            rapor_yolu=args.rapor
+        )
+
+    from distributed import olcekleme_raporu, yerel_baslat
+
+    # Shard'lar çalışanlar başlamadan bir kez hazırlanır
+    if os.path.isdir('veri_seti'):
+        shardlari_hazirla('veri_seti', args.shard_dizini)
+    argumanlar = _dagitik_argumanlari(args)
+    if args.olcekleme:
+        olcekleme_raporu(args.olcekleme, argumanlar, args.rapor or 'olcekleme_raporu.json')
+        return
+    argumanlar += ['--yedek-dizini', args.yedek_dizini]
+    if args.rapor:
+        argumanlar += ['--rapor', args.rapor]
+    sys.exit(yerel_baslat(args.yerel_calisan, argumanlar))
+
+def _topla(args):
+    # icrawler ve süreç havuzu yalnızca toplama için yüklenir
+    from scraper import veri_topla
+
+    print("Veri toplama başlıyor...")
+    veri_topla(hedef_sayi=args.hedef_sayi, filtre_modeli=args.filtre_modeli, filtre_tflite=args.filtre_tflite,
+               bellekte=args.bellekte, eszamanli_arama=args.eszamanli_arama, metrik_dosyasi=args.metrik_dosyasi,
+               metrik_araligi=args.metrik_araligi, metrik_portu=args.metrik_portu)
+
+def _hepsi(args):
+    """Alt komut verilmezse eski akış: topla -> hazırla -> eğit"""
+    # Önce veriyi topla
+    _topla(args)
+    
+    # Sonra veri setini hazırla
+    print("\nVeri seti hazırlanıyor...")
+    veri_seti_ozeti()
+    
+    _egit(args)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Veri toplama, hazırlama ve SE-ResNet eğitimi. Alt komut verilmezse "
+                    "topla -> hazırla -> eğit akışının tamamı çalışır.",
+        parents=[_egitim_secenekleri(), _toplama_secenekleri()]
+    )
+    parser.set_defaults(islem=_hepsi)
+    alt = parser.add_subparsers(dest='komut', metavar='komut')
+
+    p = alt.add_parser('topla', aliases=['collect'], parents=[_alt_komut_kopyasi(_toplama_secenekleri())],
+                       help="resimleri web'den topla ve dataset/ altına kaydet")
+    p.set_defaults(islem=_topla)
+
+    p = alt.add_parser('ayir', aliases=['split'],
+                       help="veri_seti/ resimlerini dosya taşımadan eğitim/doğrulama/test bölümlerine ata")
+    p.set_defaults(islem=lambda args: veriyi_ayir())
+
+    p = alt.add_parser('onbellek', aliases=['build-cache'], help="dataset/ için uint8 memmap önbelleğini oluştur")
+    p.add_argument('--onbellek-dizini', default='dataset_cache')
+    p.set_defaults(islem=lambda args: onbellek_hazirla(onbellek_dizini=args.onbellek_dizini))
+
+    p = alt.add_parser('shard', aliases=['export-shards'],
+                       help="veri_seti/ bölümlerini çok çalışanlı eğitim için TFRecord shard'larına paketle")
+    p.add_argument('--kaynak', default='veri_seti')
+    p.add_argument('--cikti', help="shard klasörü (varsayılan: <kaynak>_shards)")
+    p.add_argument('--hedef-mb', type=float, default=64, help="shard başına hedef boyut")
+    p.add_argument('--en-az-shard', type=int, default=8,
+                   help="bölüm başına en az shard sayısı (en fazla çalışan sayısı kadar dağıtılabilir)")
+    p.add_argument('--zorla', action='store_true', help="kaynak değişmemiş olsa da yeniden yaz")
+    p.set_defaults(islem=lambda args: shardlari_hazirla(args.kaynak, args.cikti, args.hedef_mb, args.en_az_shard,
+                                                        args.zorla))
+
+    p = alt.add_parser('egit', aliases=['train'], parents=[_alt_komut_kopyasi(_egitim_secenekleri())],
+                       help="SE-ResNet modelini eğit ve kaydet")
+    p.set_defaults(islem=_egit)
+
+    p = alt.add_parser('dagitik', aliases=['train-distributed'],
+                       parents=[_alt_komut_kopyasi(_model_secenekleri())],
+                       help="shard'lardan çok çalışanlı eğitim (MultiWorkerMirroredStrategy); küme TF_CONFIG'den "
+                            "okunur, --yerel-calisan ile aynı makinede başlatılır")
+    p.add_argument('--batch-size', type=int, default=32, help="replika başına batch (global batch = x replika sayısı)")
+    p.add_argument('--shard-dizini', default='veri_seti_shards')
+    p.add_argument('--yedek-dizini', default='dagitik_yedek',
+                   help="kaldığı yerden devam için aşama kayıtları (tüm çalışanların ortak klasörü)")
+    p.add_argument('--yedek-adimi', type=int, help="epoch sonlarına ek olarak her bu kadar adımda kaydet")
+    p.add_argument('--adim-siniri', type=int, help="epoch başına en fazla adım (kısa ölçümler için)")
+    p.add_argument('--model', default='final_senet_model.h5')
+    p.add_argument('--rapor', help="hız ve test sonuçlarının yazılacağı JSON dosyası")
+    p.add_argument('--yerel-calisan', type=int, help="bu makinede bu kadar çalışan süreci başlat")
+    p.add_argument('--olcekleme', type=int, nargs='+', metavar='N',
+                   help="1 ve verilen çalışan sayılarıyla yerel eğitip ölçekleme verimini raporla")
+    p.set_defaults(islem=_dagitik)
+
+    p = alt.add_parser('degerlendir', aliases=['evaluate'], help="kaydedilmiş modeli test setinde değerlendir")
+    p.add_argument('--model', default='final_senet_model.h5')
+    p.add_argument('--yukleyici', choices=['keras', 'tfdata', 'shard'], default=argparse.SUPPRESS)
+    p.set_defaults(islem=lambda args: model_degerlendir(args.model, args.yukleyici))
+
+    args = parser.parse_args(argv)
+    args.islem(args)
+
+if __name__ == "__main__":
+    main()